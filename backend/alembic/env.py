@@ -64,6 +64,15 @@ def run_migrations_online() -> None:
 
     """
 
+    # digital_twin.utils.migrations passes the connection holding its lock
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     from digital_twin.database import engine
     connectable = engine
 
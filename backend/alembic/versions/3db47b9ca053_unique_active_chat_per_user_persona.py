@@ -0,0 +1,50 @@
+"""unique active chat per user persona
+
+Revision ID: 3db47b9ca053
+Revises: e48109b8cfe5
+Create Date: 2026-10-19 13:41:08.204417
+
+Replaces ix_chats_user_id_persona_id_is_active with a partial unique index
+over the active chats, which chat turns upsert against. Duplicated active
+chats left by the old get-or-create race are deactivated first, keeping the
+newest one.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3db47b9ca053'
+down_revision: Union[str, Sequence[str], None] = 'e48109b8cfe5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        UPDATE chats SET is_active = false
+        WHERE is_active = true AND id NOT IN (
+            SELECT max(id) FROM chats WHERE is_active = true GROUP BY user_id, persona_id
+        )
+        """
+    )
+    op.drop_index('ix_chats_user_id_persona_id_is_active', table_name='chats')
+    op.create_index(
+        'uq_chats_user_id_persona_id_active',
+        'chats',
+        ['user_id', 'persona_id'],
+        unique=True,
+        postgresql_where=sa.text('is_active'),
+        sqlite_where=sa.text('is_active = 1'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_chats_user_id_persona_id_active', table_name='chats')
+    op.create_index('ix_chats_user_id_persona_id_is_active', 'chats', ['user_id', 'persona_id', 'is_active'], unique=False)
@@ -0,0 +1,39 @@
+"""add version and updated_at to personas and children
+
+Revision ID: 4bede9342238
+Revises: 3db47b9ca053
+Create Date: 2026-10-19 14:26:51.773012
+
+Row versions for optimistic locking and ETags. Batch mode is needed because
+SQLite cannot ADD COLUMN with a CURRENT_TIMESTAMP default.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4bede9342238'
+down_revision: Union[str, Sequence[str], None] = '3db47b9ca053'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ['personas', 'educations', 'hobbies', 'occupations']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(VERSIONED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
+            batch_op.drop_column('version')
@@ -0,0 +1,28 @@
+"""add personas nationality index
+
+Revision ID: 5a7c3e91b2d4
+Revises: c1f4e2a9d7b3
+Create Date: 2026-10-19 18:41:12.690214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7c3e91b2d4'
+down_revision: Union[str, Sequence[str], None] = 'c1f4e2a9d7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_personas_nationality_id', 'personas', ['nationality', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_personas_nationality_id', table_name='personas')
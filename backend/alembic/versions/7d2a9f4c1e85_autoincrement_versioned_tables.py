@@ -0,0 +1,44 @@
+"""autoincrement versioned tables on sqlite
+
+Revision ID: 7d2a9f4c1e85
+Revises: 5a7c3e91b2d4
+Create Date: 2026-10-19 21:12:40.318527
+
+SQLite reuses the rowid of a deleted newest row, so a new row could take its
+id and version and leave the ETag fingerprint unchanged. AUTOINCREMENT never
+reuses ids; the tables are rebuilt with it, keeping their rows and ids.
+Postgres sequences never reuse ids, nothing changes there.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a9f4c1e85'
+down_revision: Union[str, Sequence[str], None] = '5a7c3e91b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ['personas', 'educations', 'hobbies', 'occupations']
+
+
+def rebuild(autoincrement: bool) -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(
+            table, recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}
+        ):
+            pass
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rebuild(autoincrement=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    rebuild(autoincrement=False)
@@ -0,0 +1,69 @@
+"""add chat_messages full-text search
+
+Revision ID: 8edaf9b215e8
+Revises: 4bede9342238
+Create Date: 2026-10-19 16:02:37.550913
+
+Postgres gets a tsvector column kept up to date by a trigger and a GIN index
+over it; SQLite an external-content FTS5 table with sync triggers. Existing
+messages are indexed by the migration.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8edaf9b215e8'
+down_revision: Union[str, Sequence[str], None] = '4bede9342238'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE chat_messages ADD COLUMN search_vector tsvector")
+        op.execute("UPDATE chat_messages SET search_vector = to_tsvector('pg_catalog.english', content)")
+        op.execute("CREATE INDEX ix_chat_messages_search_vector ON chat_messages USING gin (search_vector)")
+        op.execute(
+            "CREATE TRIGGER chat_messages_search_vector_update "
+            "BEFORE INSERT OR UPDATE OF content ON chat_messages FOR EACH ROW "
+            "EXECUTE FUNCTION tsvector_update_trigger(search_vector, 'pg_catalog.english', content)"
+        )
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE chat_messages_fts USING fts5("
+            "content, content='chat_messages', content_rowid='id')"
+        )
+        op.execute("INSERT INTO chat_messages_fts(chat_messages_fts) VALUES ('rebuild')")
+        op.execute(
+            "CREATE TRIGGER chat_messages_fts_insert AFTER INSERT ON chat_messages BEGIN "
+            "INSERT INTO chat_messages_fts(rowid, content) VALUES (new.id, new.content); END"
+        )
+        op.execute(
+            "CREATE TRIGGER chat_messages_fts_delete AFTER DELETE ON chat_messages BEGIN "
+            "INSERT INTO chat_messages_fts(chat_messages_fts, rowid, content) "
+            "VALUES ('delete', old.id, old.content); END"
+        )
+        op.execute(
+            "CREATE TRIGGER chat_messages_fts_update AFTER UPDATE OF content ON chat_messages BEGIN "
+            "INSERT INTO chat_messages_fts(chat_messages_fts, rowid, content) "
+            "VALUES ('delete', old.id, old.content); "
+            "INSERT INTO chat_messages_fts(rowid, content) VALUES (new.id, new.content); END"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP TRIGGER chat_messages_search_vector_update ON chat_messages")
+        op.drop_index('ix_chat_messages_search_vector', table_name='chat_messages')
+        op.drop_column('chat_messages', 'search_vector')
+    else:
+        op.execute("DROP TRIGGER chat_messages_fts_update")
+        op.execute("DROP TRIGGER chat_messages_fts_delete")
+        op.execute("DROP TRIGGER chat_messages_fts_insert")
+        op.execute("DROP TABLE chat_messages_fts")
@@ -0,0 +1,28 @@
+"""add chat_messages keyset index
+
+Revision ID: b05b5db65f7e
+Revises: 61b58bc0333b
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b05b5db65f7e'
+down_revision: Union[str, Sequence[str], None] = '61b58bc0333b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_chat_messages_chat_id_id', 'chat_messages', ['chat_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_messages_chat_id_id', table_name='chat_messages')
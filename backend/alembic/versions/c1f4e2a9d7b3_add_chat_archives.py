@@ -0,0 +1,47 @@
+"""add chat archives
+
+Revision ID: c1f4e2a9d7b3
+Revises: 8edaf9b215e8
+Create Date: 2026-10-19 17:24:51.103926
+
+Pointer table for chat messages moved to Parquet by the archival job, and
+the id up to which each chat's history is archived.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1f4e2a9d7b3'
+down_revision: Union[str, Sequence[str], None] = '8edaf9b215e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chat_archives',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('chat_id', sa.Integer(), nullable=False),
+    sa.Column('first_message_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=False),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.Column('path', sa.String(length=255), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['chat_id'], ['chats.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_chat_archives_chat_id'), 'chat_archives', ['chat_id'], unique=False)
+    with op.batch_alter_table('chats') as batch_op:
+        batch_op.add_column(sa.Column('archived_until_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('chats') as batch_op:
+        batch_op.drop_column('archived_until_id')
+    op.drop_index(op.f('ix_chat_archives_chat_id'), table_name='chat_archives')
+    op.drop_table('chat_archives')
@@ -0,0 +1,41 @@
+"""add hot path indexes
+
+Revision ID: e48109b8cfe5
+Revises: b05b5db65f7e
+Create Date: 2026-10-19 11:02:17.540913
+
+Indexes the lookups run on every request: the active chat of a
+(user, persona) pair, users by email (now unique, duplicated emails must be
+cleaned up before upgrading) and the persona_id foreign keys of the child
+tables. chat_messages.chat_id is already covered by ix_chat_messages_chat_id_id.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e48109b8cfe5'
+down_revision: Union[str, Sequence[str], None] = 'b05b5db65f7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_chats_user_id_persona_id_is_active', 'chats', ['user_id', 'persona_id', 'is_active'], unique=False)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_educations_persona_id', 'educations', ['persona_id'], unique=False)
+    op.create_index('ix_hobbies_persona_id', 'hobbies', ['persona_id'], unique=False)
+    op.create_index('ix_occupations_persona_id', 'occupations', ['persona_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_occupations_persona_id', table_name='occupations')
+    op.drop_index('ix_hobbies_persona_id', table_name='hobbies')
+    op.drop_index('ix_educations_persona_id', table_name='educations')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_index('ix_chats_user_id_persona_id_is_active', table_name='chats')
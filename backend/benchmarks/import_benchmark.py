@@ -0,0 +1,63 @@
+"""
+Cold import time of the application.
+
+Imports the module in fresh interpreters under ``python -X importtime`` and
+reports the best and median total, plus the slowest packages it pulls in
+(cumulative time of top-level packages, from the best run), e.g.
+
+    uv run python benchmarks/import_benchmark.py --runs 5 --top 15
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def import_times(module: str) -> dict[str, tuple[int, int, int]]:
+    """
+    Imports ``module`` in a new interpreter. Returns, per imported module,
+    (self us, cumulative us, nesting depth) as reported by -X importtime.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        times[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold import time of a module.")
+    parser.add_argument("--module", default="digital_twin")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = [run[args.module][1] / 1000 for run in runs]
+    best = runs[totals.index(min(totals))]
+
+    print(f"import {args.module}: best {min(totals):.0f} ms, median {statistics.median(totals):.0f} ms ({args.runs} runs)")
+    print(f"{len(best)} modules imported\n")
+
+    # Top-level packages by cumulative time, where the cost actually lands
+    packages = {}
+    for name, (_, cumulative, _) in best.items():
+        root = name.split(".")[0]
+        if root == name or root not in best:
+            packages[root] = max(packages.get(root, 0), cumulative)
+    for name, cumulative in sorted(packages.items(), key=lambda p: p[1], reverse=True)[: args.top]:
+        print(f"{cumulative / 1000:10.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
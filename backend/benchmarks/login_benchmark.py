@@ -0,0 +1,126 @@
+"""
+Login throughput versus the latency of other endpoints.
+
+Runs concurrent logins against the app in-process while a probe keeps
+requesting the persona list, once per hashing mode: "inline" hashes on the
+event loop (the previous behaviour), 0 workers on the threadpool, N workers
+on the process pool. Uses a temporary SQLite file, e.g.
+
+    uv run python benchmarks/login_benchmark.py --workers inline 0 2 4 --logins 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from digital_twin import app
+from digital_twin.config import settings
+from digital_twin.database import build_async_engine, get_async_db
+from digital_twin.models import Base, Persona, User
+from digital_twin.utils import security
+from digital_twin.utils.hashing import PasswordHashPool, build_hasher
+
+EMAIL = "bench@bench.io"
+PASSWORD = "Password2025"
+
+
+class InlinePool(PasswordHashPool):
+    """Hashes on the event loop, as the handlers did before the process pool."""
+
+    async def _run(self, fn, *args):
+        return fn(*args)
+
+
+def seed(url: str, params: tuple[int, int, int]):
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(
+            Persona(name=f"Persona {i}", birthdate=date(1990, 1, 1), gender="Other", nationality="Portuguese")
+            for i in range(20)
+        )
+        db.add(User(name="Bench", birthdate=date(1990, 1, 1), email=EMAIL, password=build_hasher(*params).hash(PASSWORD)))
+        db.commit()
+    engine.dispose()
+
+
+async def run_mode(client: httpx.AsyncClient, logins: int, duration: float) -> tuple[float, list[float]]:
+    deadline = time.perf_counter() + duration
+    completed = 0
+    probe_latencies = []
+
+    async def login_loop():
+        nonlocal completed
+        while time.perf_counter() < deadline:
+            response = await client.post("/api/v1/users/login", json={"email": EMAIL, "password": PASSWORD})
+            response.raise_for_status()
+            completed += 1
+
+    async def probe_loop():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            (await client.get("/api/v1/personas/")).raise_for_status()
+            probe_latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(login_loop() for _ in range(logins)), probe_loop())
+    return completed / duration, probe_latencies
+
+
+async def main_async(args):
+    # Login issues a JWT, fall back to a throwaway key outside a configured env
+    settings.SECRET_KEY = settings.SECRET_KEY or "login-benchmark-secret-key-0123456789"
+    settings.ALGORITHM = settings.ALGORITHM or "HS256"
+    params = (settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        seed(url, params)
+        engine = build_async_engine(url)
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        transport = httpx.ASGITransport(app=app)
+
+        print(f"{'mode':<10} {'logins/s':>9} {'probe p50':>10} {'probe p95':>10}")
+        for mode in args.workers:
+            workers = 0 if mode == "inline" else int(mode)
+            pool_class = InlinePool if mode == "inline" else PasswordHashPool
+            pool = pool_class(workers, args.logins, *params)
+            security.password_pool = pool
+            await pool.start()
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                    throughput, latencies = await run_mode(client, args.logins, args.duration)
+            finally:
+                pool.shutdown()
+
+            p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+            print(f"{mode:<10} {throughput:>9.1f} {statistics.median(latencies):>8.1f}ms {p95:>8.1f}ms")
+
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", nargs="+", default=["inline", "0", "2"], help='"inline" or a worker count')
+    parser.add_argument("--logins", type=int, default=8, help="Concurrent login loops")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per mode")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Serialization time and bytes on the wire of a large chat history.
+
+Compares FastAPI's default path (validate, jsonable_encoder, json.dumps)
+with PydanticJSONResponse, and the body size uncompressed and gzipped at a
+few levels, e.g.
+
+    uv run python benchmarks/serialization_benchmark.py --messages 5000 --runs 20
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from digital_twin.schemas.chat_message import ChatMessage
+from digital_twin.utils.responses import PydanticJSONResponse
+
+WORDS = (
+    "the a persona career study work travel music book family friend city weekend "
+    "project team learn plan today maybe really think about because when where which "
+    "coffee running football painting engineer lisbon porto university remember"
+).split()
+
+
+def chat_history(messages: int) -> list[SimpleNamespace]:
+    """
+    ORM-like rows, short user questions and longer assistant answers of
+    random words, so gzip ratios are not those of repeated text.
+    """
+    rng = random.Random(0)
+    start = datetime(2025, 1, 1)
+    return [
+        SimpleNamespace(
+            id=i,
+            role="User" if i % 2 else "Assistant",
+            content=" ".join(rng.choices(WORDS, k=15 if i % 2 else 90)),
+            created_at=start + timedelta(seconds=i),
+        )
+        for i in range(1, messages + 1)
+    ]
+
+
+def default_encoding(rows: list) -> bytes:
+    """What FastAPI does with a response_model and the default JSONResponse."""
+    adapter = TypeAdapter(list[ChatMessage])
+    value = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+    return json.dumps(
+        jsonable_encoder(value), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def pydantic_encoding(rows: list) -> bytes:
+    return PydanticJSONResponse(rows, list[ChatMessage]).body
+
+
+def timed(function, rows: list, runs: int) -> tuple[float, bytes]:
+    """Median milliseconds per call, and the body of the last one."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        body = function(rows)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chat history serialization.")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = chat_history(args.messages)
+    print(f"{args.messages} messages, median of {args.runs} runs\n")
+
+    for name, function in (("default", default_encoding), ("pydantic", pydantic_encoding)):
+        ms, body = timed(function, rows, args.runs)
+        print(f"{name:>10}: {ms:8.2f} ms  {len(body):>10,} bytes")
+
+    print()
+    for level in (1, 6, 9):
+        start = time.perf_counter()
+        compressed = gzip.compress(body, compresslevel=level)
+        ms = (time.perf_counter() - start) * 1000
+        print(
+            f"{'gzip -' + str(level):>10}: {ms:8.2f} ms  {len(compressed):>10,} bytes"
+            f"  ({len(compressed) / len(body):.1%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
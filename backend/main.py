@@ -1,5 +1,4 @@
-from digital_twin import main
+from digital_twin.server import dev
 
 if __name__ == "__main__":
-    main()
-
+    dev()
@@ -2,14 +2,23 @@ from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any
 
-import alembic.command
-from alembic.config import Config
-from fastapi import APIRouter, FastAPI
+from fastapi import APIRouter, FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from sqlalchemy import text
+from sqlalchemy.orm.exc import StaleDataError
 
 from digital_twin.config import settings
-from digital_twin.database import engine
+from digital_twin.database import (
+    ReadYourWritesMiddleware,
+    async_engine,
+    engine,
+    pool_status,
+    replica_async_engine,
+    replica_enabled,
+)
 from digital_twin.routers import (
     educations,
     hobbies,
@@ -17,13 +26,21 @@ from digital_twin.routers import (
     personas,
     users,
 )
+from digital_twin.utils.lakehouse_export import exporter
+from digital_twin.utils.migrations import migrate_on_startup
+from digital_twin.utils.security import password_pool
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    alembic_cfg = Config("./alembic.ini")
-    alembic.command.upgrade(alembic_cfg, "head")
+    await run_in_threadpool(migrate_on_startup, engine)
+    await password_pool.start()
     yield
+    password_pool.shutdown()
+    await run_in_threadpool(exporter.close)
+    await async_engine.dispose()
+    if replica_async_engine is not None:
+        await replica_async_engine.dispose()
 
 
 def create_app() -> FastAPI:
@@ -48,18 +65,48 @@ router.include_router(personas.router)
 router.include_router(users.router)
 app.include_router(router)
 
+
+@app.exception_handler(StaleDataError)
+async def concurrent_modification(request: Request, exc: StaleDataError):
+    """
+    A versioned row changed or was deleted between this request reading and
+    writing it (optimistic locking), so the write was not applied.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "The resource was modified concurrently, reload it and retry"},
+    )
+
 origins = [
     "http://localhost",
     "http://localhost:8080",
     "https://digital-twin-frontend.onrender.com",
 ]
 
+if settings.GZIP_MIN_SIZE:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.GZIP_MIN_SIZE,
+        compresslevel=settings.GZIP_COMPRESS_LEVEL,
+    )
+
+# Without a replica every read is from the primary already
+if replica_enabled():
+    app.add_middleware(ReadYourWritesMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "ETag",
+        "X-Archived-Not-Searched",
+        "X-Next-Cursor",
+        "X-Next-Offset",
+        "X-Total-Count",
+    ],
 )
 
 @app.get("/db")
@@ -87,7 +134,15 @@ def health_check() -> dict[str, Any]:
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 
-def main():
-    import uvicorn
-
-    uvicorn.run("digital_twin:app", host="0.0.0.0", port=8000, reload=True)
+@app.get("/metrics")
+def metrics() -> dict[str, Any]:
+    return {
+        "db_pool": pool_status(engine),
+        "db_async_pool": pool_status(async_engine.sync_engine),
+        "db_replica_pool": (
+            pool_status(replica_async_engine.sync_engine) if replica_async_engine is not None else None
+        ),
+        "password_hashing": password_pool.stats(),
+        "lakehouse_export": exporter.stats(),
+        "timestamp": datetime.now().isoformat(),
+    }
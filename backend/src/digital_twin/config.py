@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,12 +18,100 @@ class Settings(BaseSettings):
 
     API_V1_STR: str = "/api/v1"
 
+    # Production server (digital-twin). Every worker process has its own
+    # DB and password hashing pools, so N workers hold up to
+    # N * (DB_POOL_SIZE + DB_MAX_OVERFLOW) Postgres connections (15 each by
+    # default) and N * PASSWORD_HASH_WORKERS Argon2 processes. 0 workers
+    # uses one per CPU available to the process, at most SERVER_MAX_WORKERS.
+    # A concurrency limit of 0 means unlimited
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 2
+    SERVER_MAX_WORKERS: int = 4
+    SERVER_BACKLOG: int = 2048
+    SERVER_LIMIT_CONCURRENCY: int = 0
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    # In-flight requests, LLM calls included, get this long to finish on shutdown
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 60
+
     DATABASE_URL: str = "sqlite:///:memory:"
+    # Upgrade the schema on startup; turn off where migrations run as a
+    # separate deploy step
+    AUTO_MIGRATE: bool = True
+    # Optional replica for read-only endpoints; reads stick to the primary
+    # for READ_YOUR_WRITES_SECONDS after a client writes
+    READ_REPLICA_URL: str = ""
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Connection pool tuning (ignored by in-memory SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Postgres session settings, 0 disables the statement timeout
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_APPLICATION_NAME: str = "digital-twin"
+
+    # Chat history keyset pagination
+    CHAT_HISTORY_PAGE_SIZE: int = 50
+    CHAT_HISTORY_MAX_PAGE_SIZE: int = 200
+    CHAT_SEARCH_PAGE_SIZE: int = 20
+    CHAT_SEARCH_MAX_PAGE_SIZE: int = 100
+
+    # Archival of cold chat messages to Parquet: every message of inactive
+    # chats, and messages older than CHAT_ARCHIVE_AFTER_DAYS of active ones
+    CHAT_ARCHIVE_PATH: str = "./lakehouse_data/chat_archive"
+    CHAT_ARCHIVE_AFTER_DAYS: int = 90
+    CHAT_ARCHIVE_BATCH_SIZE: int = 5000
+
+    # Persona list pagination
+    PERSONA_PAGE_SIZE: int = 50
+    PERSONA_MAX_PAGE_SIZE: int = 200
+
+    # Items accepted by the education/occupation/hobby bulk and sync endpoints
+    CHILD_BULK_MAX_ITEMS: int = 500
+    # Personas inserted per transaction by the bulk import
+    PERSONA_IMPORT_CHUNK_SIZE: int = 500
+    # Largest import body the API reads (it is parsed in memory), 16 MiB
+    PERSONA_IMPORT_MAX_BYTES: int = 16 * 1024 * 1024
+    # Cache-Control max-age of ETag-validated reads, 0 revalidates every time
+    HTTP_CACHE_MAX_AGE: int = 0
+    # Responses of at least this many bytes are gzipped, 0 disables compression
+    GZIP_MIN_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 6
+    # Lakehouse event export: events are queued and written in batches by a
+    # background thread. A full queue drops new events, or with the "block"
+    # policy makes the request wait up to LAKEHOUSE_EXPORT_BLOCK_SECONDS first
+    LAKEHOUSE_EXPORT_PATH: str = "./lakehouse_data"
+    LAKEHOUSE_EXPORT_QUEUE_SIZE: int = 10_000
+    LAKEHOUSE_EXPORT_BATCH_SIZE: int = 500
+    LAKEHOUSE_EXPORT_FLUSH_SECONDS: float = 1.0
+    LAKEHOUSE_EXPORT_POLICY: Literal["drop", "block"] = "drop"
+    LAKEHOUSE_EXPORT_BLOCK_SECONDS: float = 0.05
+    # "json" lines, or "parquet" segments rolled every LAKEHOUSE_SEGMENT_ROWS
+    # events or LAKEHOUSE_SEGMENT_SECONDS, per table, day and event prefix
+    LAKEHOUSE_EXPORT_FORMAT: Literal["json", "parquet"] = "json"
+    LAKEHOUSE_SEGMENT_ROWS: int = 50_000
+    LAKEHOUSE_SEGMENT_SECONDS: float = 300.0
+    # Rows fetched per server-side cursor batch by the streaming exports
+    EXPORT_BATCH_SIZE: int = 500
 
     SECRET_KEY: str = ""
     ALGORITHM: str = ""
     GOOGLE_API_KEY: str = ""
     JWT_EXPIRE_MINUTES: int = 30
+    # Authenticated-user cache, a TTL of 0 disables it. The API has no user
+    # update or delete, so a user changed or removed in the database keeps
+    # authenticating as before for up to this long in each worker
+    AUTH_CACHE_TTL_SECONDS: float = 10.0
+    AUTH_CACHE_MAX_SIZE: int = 1024
+    # Argon2 runs on its own process pool, 0 workers runs it on the threadpool
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
 
     OPENWEATHER_API_KEY: str = ""
 
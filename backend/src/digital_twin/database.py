@@ -1,17 +1,265 @@
+import math
+import threading
+import time
+from typing import Annotated, Any
 
-from sqlalchemy import create_engine
+from fastapi import Depends, Request, Response
+from sqlalchemy import URL, Engine, create_engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from digital_twin.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+
+class PoolMetrics:
+    """Thread-safe counters describing how long callers wait for a connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_avg_ms": round(self.wait_total * 1000 / attempts, 3) if attempts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records the time spent waiting for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # Keep the counters when the engine is disposed and the pool rebuilt
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredAsyncAdaptedQueuePool(MeteredQueuePool, AsyncAdaptedQueuePool):
+    """Metered pool for asyncio engines."""
+
+
+# Async drivers used for each sync backend in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def async_database_url(url: str) -> URL:
+    """Translate a sync database URL to its asyncio driver equivalent."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def _is_memory_sqlite(url: str | URL) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str | URL, is_async: bool = False) -> dict[str, Any]:
+    """Build the ``create_engine`` keyword arguments for ``url`` from settings."""
+    if _is_memory_sqlite(url):
+        # In-memory SQLite lives inside a single connection, pooling does not apply
+        return {}
+
+    options: dict[str, Any] = {
+        "poolclass": MeteredAsyncAdaptedQueuePool if is_async else MeteredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    if make_url(url).get_backend_name() == "postgresql" and is_async:
+        # asyncpg takes session settings as a dict instead of libpq options
+        server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        options["connect_args"] = {"server_settings": server_settings}
+    elif make_url(url).get_backend_name() == "postgresql":
+        connect_args: dict[str, Any] = {"application_name": settings.DB_APPLICATION_NAME}
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        options["connect_args"] = connect_args
+
+    return options
+
+
+def build_engine(url: str, **overrides: Any) -> Engine:
+    """Create an engine for ``url``, ``overrides`` take precedence over settings."""
+    return create_engine(url, **(engine_options(url) | overrides))
+
+
+def build_async_engine(url: str, **overrides: Any) -> AsyncEngine:
+    """Create an asyncio engine for the sync ``url``, using its async driver."""
+    async_url = async_database_url(url)
+    return create_async_engine(async_url, **(engine_options(async_url, is_async=True) | overrides))
+
+
+def pool_status(engine: Engine) -> dict[str, Any]:
+    """Live view of the engine's connection pool."""
+    pool = engine.pool
+    if not isinstance(pool, MeteredQueuePool):
+        return {"pool": type(pool).__name__, "status": pool.status()}
+
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        **pool.metrics.snapshot(),
+    }
+
+
+engine = build_engine(settings.DATABASE_URL)
 
 Session = sessionmaker(bind=engine)
 
 
+async_engine = build_async_engine(settings.DATABASE_URL)
+
+# Objects stay usable after commit, attribute refreshes would need an await
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
 def get_db():
     db = Session()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+replica_async_engine = (
+    build_async_engine(settings.READ_REPLICA_URL) if settings.READ_REPLICA_URL else None
+)
+ReplicaSessionLocal = (
+    async_sessionmaker(bind=replica_async_engine, expire_on_commit=False)
+    if replica_async_engine is not None
+    else None
+)
+
+# Set on responses to writes; while valid, the client's reads go to the primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+# Request header forcing reads to the primary, e.g. right after a write from
+# a client that does not keep cookies
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+
+def replica_enabled() -> bool:
+    return ReplicaSessionLocal is not None
+
+
+def reads_from_primary(request: Request) -> bool:
+    if request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true"):
+        return True
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pins a client's reads to the primary for READ_YOUR_WRITES_SECONDS after
+    a successful write, with READ_PRIMARY_COOKIE. Only installed when a
+    replica is configured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append("set-cookie", read_primary_cookie())
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def read_primary_cookie() -> str:
+    window = settings.READ_YOUR_WRITES_SECONDS
+    response = Response()
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        str(time.time() + window),
+        max_age=math.ceil(window),
+        httponly=True,
+        # The frontend is on another site, whose credentialed requests
+        # only carry SameSite=None cookies, and those must be Secure
+        samesite="none",
+        secure=True,
+    )
+    return response.headers["set-cookie"]
+
+
+async def get_read_db(
+    request: Request, primary: Annotated[AsyncSession, Depends(get_async_db)]
+):
+    """
+    Session for read-only endpoints: the replica when one is configured,
+    unless the client wrote recently or asked for the primary. The primary
+    session does not connect unless it is used.
+    """
+    if not replica_enabled() or reads_from_primary(request):
+        yield primary
+        return
+
+    async with ReplicaSessionLocal() as db:
+        yield db
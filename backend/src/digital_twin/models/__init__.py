@@ -4,6 +4,7 @@ SQLAlchemy models.
 
 from .base import Base
 from .chat import Chat
+from .chat_archive import ChatArchive
 from .chat_message import ChatMessage
 from .education import Education
 from .hobby import Hobby
@@ -12,4 +13,4 @@ from .occupation import Occupation
 from .persona import Persona
 from .user import User
 
-__all__ = ["Base", "Persona", "Education", "Occupation", "Hobby", "User", "Chat", "ChatMessage", "Table"]
\ No newline at end of file
+__all__ = ["Base", "Persona", "Education", "Occupation", "Hobby", "User", "Chat", "ChatMessage", "ChatArchive", "Table"]
\ No newline at end of file
@@ -1,7 +1,30 @@
-from sqlalchemy.orm import DeclarativeBase
+from datetime import datetime
+
+from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
+from sqlalchemy.sql import func
 
 
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models."""
 
     pass
+
+
+class Versioned:
+    """
+    Row version and last update time. The version is bumped by every ORM
+    UPDATE (optimistic locking) and feeds the HTTP ETags. Versioned tables are
+    AUTOINCREMENT on SQLite, whose rowids would otherwise reuse the id of a
+    deleted newest row and let a new row pass for it in an ETag.
+    """
+
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
+    updated_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict:  # noqa: N805
+        # eager_defaults reads updated_at back with RETURNING, as it cannot be
+        # lazy-loaded from an AsyncSession
+        return {"version_id_col": cls.version, "eager_defaults": True}
@@ -5,7 +5,7 @@ Chat SQLAlchemy model.
 from datetime import datetime
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -19,10 +19,24 @@ class Chat(Base):
     """SQLAlchemy model for the Chat entity."""
 
     __tablename__ = "chats"
+    __table_args__ = (
+        # At most one active chat per (user, persona); chat turns look it up
+        # and upsert against it
+        Index(
+            "uq_chats_user_id_persona_id_active",
+            "user_id",
+            "persona_id",
+            unique=True,
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+    # Highest message id moved to the Parquet archive, see ChatArchive
+    archived_until_id: Mapped[int | None] = mapped_column(nullable=True)
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     persona_id: Mapped[int] = mapped_column(ForeignKey("personas.id"))
@@ -0,0 +1,32 @@
+"""
+ChatArchive SQLAlchemy model.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from digital_twin.models import Base
+
+
+class ChatArchive(Base):
+    """
+    Pointer to a Parquet file holding a contiguous range of a chat's
+    messages, moved out of chat_messages by the archival job.
+    """
+
+    __tablename__ = "chat_archives"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    chat_id: Mapped[int] = mapped_column(ForeignKey("chats.id"), index=True)
+    first_message_id: Mapped[int] = mapped_column(nullable=False)
+    last_message_id: Mapped[int] = mapped_column(nullable=False)
+    message_count: Mapped[int] = mapped_column(nullable=False)
+    # Relative to settings.CHAT_ARCHIVE_PATH
+    path: Mapped[str] = mapped_column(String(255), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ChatArchive(id={self.id}, chat_id={self.chat_id}, messages={self.first_message_id}..{self.last_message_id})>"
@@ -5,7 +5,7 @@ ChatMessage SQLAlchemy model.
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, ForeignKey, Index, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -19,6 +19,10 @@ class ChatMessage(Base):
     """SQLAlchemy model for the ChatMessage entity."""
 
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Keyset pagination of a chat's history walks this index by id
+        Index("ix_chat_messages_chat_id_id", "chat_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     role: Mapped[str] = mapped_column(nullable=False)
@@ -31,3 +35,42 @@ class ChatMessage(Base):
 
     def __repr__(self):
         return f"<ChatMessage(id={self.id}, role='{self.role}', content='{self.content}, created_at={self.created_at}')>"
+
+
+# Full-text search over message content, kept in sync by triggers: Postgres
+# stores a tsvector column behind a GIN index, SQLite an external-content
+# FTS5 table. The search_vector column is not mapped, only queried.
+SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE chat_messages ADD COLUMN search_vector tsvector",
+        "CREATE INDEX ix_chat_messages_search_vector ON chat_messages USING gin (search_vector)",
+        "CREATE TRIGGER chat_messages_search_vector_update "
+        "BEFORE INSERT OR UPDATE OF content ON chat_messages FOR EACH ROW "
+        "EXECUTE FUNCTION tsvector_update_trigger(search_vector, 'pg_catalog.english', content)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE chat_messages_fts USING fts5("
+        "content, content='chat_messages', content_rowid='id')",
+        "CREATE TRIGGER chat_messages_fts_insert AFTER INSERT ON chat_messages BEGIN "
+        "INSERT INTO chat_messages_fts(rowid, content) VALUES (new.id, new.content); END",
+        "CREATE TRIGGER chat_messages_fts_delete AFTER DELETE ON chat_messages BEGIN "
+        "INSERT INTO chat_messages_fts(chat_messages_fts, rowid, content) "
+        "VALUES ('delete', old.id, old.content); END",
+        "CREATE TRIGGER chat_messages_fts_update AFTER UPDATE OF content ON chat_messages BEGIN "
+        "INSERT INTO chat_messages_fts(chat_messages_fts, rowid, content) "
+        "VALUES ('delete', old.id, old.content); "
+        "INSERT INTO chat_messages_fts(rowid, content) VALUES (new.id, new.content); END",
+    ],
+}
+
+for dialect, statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(
+            ChatMessage.__table__, "after_create", DDL(statement).execute_if(dialect=dialect)
+        )
+# The FTS5 table outlives chat_messages otherwise
+event.listen(
+    ChatMessage.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS chat_messages_fts").execute_if(dialect="sqlite"),
+)
@@ -9,15 +9,17 @@ from sqlalchemy import Date, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from digital_twin.models import Base
+from digital_twin.models.base import Versioned
 
 if TYPE_CHECKING:
     from digital_twin.models import Persona
 
 
-class Education(Base):
+class Education(Versioned, Base):
     """SQLAlchemy model for the Education entity."""
 
     __tablename__ = "educations"
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     level: Mapped[str] = mapped_column(nullable=False)
@@ -28,7 +30,7 @@ class Education(Base):
     is_graduated: Mapped[bool] = mapped_column(nullable=False)
     grade: Mapped[float] = mapped_column()
 
-    persona_id: Mapped[int] = mapped_column(ForeignKey("personas.id"))
+    persona_id: Mapped[int] = mapped_column(ForeignKey("personas.id"), index=True)
 
     persona: Mapped["Persona"] = relationship(back_populates="educations")
 
@@ -6,22 +6,24 @@ from sqlalchemy import ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from digital_twin.models import Base
+from digital_twin.models.base import Versioned
 
 if TYPE_CHECKING:
     from digital_twin.models import Persona
 
 
-class Hobby(Base):
+class Hobby(Versioned, Base):
     """SQLAlchemy model representing a hobby."""
 
     __tablename__ = "hobbies"
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     type: Mapped[str] = mapped_column(String(100), nullable=False)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     freq: Mapped[str] = mapped_column(String(100), nullable=False)
 
-    persona_id: Mapped[int] = mapped_column(ForeignKey("personas.id"))
+    persona_id: Mapped[int] = mapped_column(ForeignKey("personas.id"), index=True)
 
     persona: Mapped["Persona"] = relationship(back_populates="hobbies")
 
@@ -9,15 +9,17 @@ from sqlalchemy import Date, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from digital_twin.models import Base
+from digital_twin.models.base import Versioned
 
 if TYPE_CHECKING:
     from digital_twin.models import Persona
 
 
-class Occupation(Base):
+class Occupation(Versioned, Base):
     """SQLAlchemy model for the Occupation entity."""
 
     __tablename__ = "occupations"
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     position: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -25,7 +27,7 @@ class Occupation(Base):
     date_started: Mapped[date] = mapped_column(Date, nullable=False)
     date_finished: Mapped[date | None] = mapped_column(Date, nullable=True)
 
-    persona_id: Mapped[int] = mapped_column(ForeignKey("personas.id"))
+    persona_id: Mapped[int] = mapped_column(ForeignKey("personas.id"), index=True)
 
     persona: Mapped["Persona"] = relationship(back_populates="occupations")
 
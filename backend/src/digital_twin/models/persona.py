@@ -5,19 +5,25 @@ Persona SQLAlchemy model.
 from datetime import date
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from digital_twin.models import Base
+from digital_twin.models.base import Versioned
 
 if TYPE_CHECKING:
     from digital_twin.models import Chat, Education, Hobby, Occupation
 
 
-class Persona(Base):
+class Persona(Versioned, Base):
     """SQLAlchemy model for the Persona entity."""
 
     __tablename__ = "personas"
+    __table_args__ = (
+        # The nationality filter of the persona list walks this index by id
+        Index("ix_personas_nationality_id", "nationality", "id"),
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -1,21 +1,43 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from digital_twin.database import get_db
-from digital_twin.schemas.education import Education, EducationCreate, EducationUpdate
+from digital_twin.config import settings
+from digital_twin.database import get_async_db, get_read_db
+from digital_twin.schemas.education import (
+    Education,
+    EducationCreate,
+    EducationSync,
+    EducationUpdate,
+)
 from digital_twin.services.education import EducationService
+from digital_twin.services.persona import rows_fingerprint
+from digital_twin.utils.http_cache import (
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
 from digital_twin.utils.lakehouse_export import export_data
 
 router = APIRouter(prefix="/educations", tags=["education"])
 
 
 @router.post("/", response_model=Education)
-def create_education(
-    education: EducationCreate, db: Annotated[Session, Depends(get_db)]
+async def create_education(
+    education: EducationCreate, db: Annotated[AsyncSession, Depends(get_async_db)]
 ):
-    new_education = EducationService.create_education(db, education)
+    new_education = await EducationService.create_education(db, education)
 
     if new_education is None:
         export_data(
@@ -42,12 +64,103 @@ def create_education(
     return new_education
 
 
+@router.post("/bulk", response_model=list[Education])
+async def create_educations(
+    educations: Annotated[
+        list[EducationCreate], Body(min_length=1, max_length=settings.CHILD_BULK_MAX_ITEMS)
+    ],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    """Creates several educations, of one or more personas, in one transaction."""
+    new_educations = await EducationService.create_educations(db, educations)
+
+    if new_educations is None:
+        export_data(
+            "endpoints",
+            {
+                "event": "education_bulk_create",
+                "status": "error",
+                "description": "One of the personas does not exist",
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Persona id not found"
+        )
+
+    export_data(
+        "endpoints",
+        {
+            "event": "education_bulk_create",
+            "status": "success",
+            "items": len(new_educations),
+        },
+    )
+    return new_educations
+
+
+@router.put("/", response_model=list[Education])
+async def sync_educations(
+    persona: Annotated[int, Query(description="Persona ID")],
+    educations: Annotated[list[EducationSync], Body(max_length=settings.CHILD_BULK_MAX_ITEMS)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    """
+    Replaces the educations of a persona with the given set: items with an id
+    are updated, those without are created and the rest are deleted.
+    """
+    try:
+        synced = await EducationService.sync_educations(db, persona, educations)
+    except ValueError as e:
+        export_data(
+            "endpoints",
+            {
+                "event": "education_sync",
+                "status": "error",
+                "description": str(e),
+            },
+        )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if synced is None:
+        export_data(
+            "endpoints",
+            {
+                "event": "education_sync",
+                "status": "error",
+                "description": f"Persona with ID {persona} does not exist",
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Persona id not found"
+        )
+
+    export_data(
+        "endpoints",
+        {
+            "event": "education_sync",
+            "status": "success",
+            "persona_id": persona,
+            "items": len(synced),
+        },
+    )
+    return synced
+
+
 @router.get("/", response_model=list[Education])
-def get_educations_by_persona(
+async def get_educations_by_persona(
     persona: Annotated[int, Query(description="Persona ID")],
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
 ):
-    education = EducationService.get_educations_by_persona(db, persona)
+    # Empty lists are never answered with 304, so a missing persona still gets its 404
+    if request.headers.get("if-none-match"):
+        fingerprint = await EducationService.get_fingerprint_by_persona(db, persona)
+        etag = make_etag(fingerprint)
+        if fingerprint[0] and etag_matches(request, etag):
+            return not_modified(etag)
+
+    education = await EducationService.get_educations_by_persona(db, persona)
 
     if education is None:
         export_data(
@@ -71,12 +184,13 @@ def get_educations_by_persona(
             "items": len(education),
         }
     )
+    set_cache_headers(response, make_etag(rows_fingerprint(education)))
     return education
 
 
 @router.get("/{id}", response_model=Education)
-def get_education(id: int, db: Annotated[Session, Depends(get_db)]):
-    education = EducationService.get_education(db, id)
+async def get_education(id: int, db: Annotated[AsyncSession, Depends(get_read_db)]):
+    education = await EducationService.get_education(db, id)
 
     if not education:
         export_data(
@@ -103,10 +217,10 @@ def get_education(id: int, db: Annotated[Session, Depends(get_db)]):
 
 
 @router.put("/{id}", response_model=Education)
-def update_education(
-    id: int, education_update: EducationUpdate, db: Annotated[Session, Depends(get_db)]
+async def update_education(
+    id: int, education_update: EducationUpdate, db: Annotated[AsyncSession, Depends(get_async_db)]
 ):
-    education = EducationService.update_education(db, id, education_update)
+    education = await EducationService.update_education(db, id, education_update)
 
     if not education:
         export_data(
@@ -133,8 +247,8 @@ def update_education(
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_education(id: int, db: Annotated[Session, Depends(get_db)]) -> None:
-    success = EducationService.delete_education(db, id)
+async def delete_education(id: int, db: Annotated[AsyncSession, Depends(get_async_db)]) -> None:
+    success = await EducationService.delete_education(db, id)
 
     if not success:
         export_data(
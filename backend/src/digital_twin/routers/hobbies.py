@@ -1,19 +1,36 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from digital_twin.database import get_db
-from digital_twin.schemas.hobby import Hobby, HobbyCreate, HobbyUpdate
+from digital_twin.config import settings
+from digital_twin.database import get_async_db, get_read_db
+from digital_twin.schemas.hobby import Hobby, HobbyCreate, HobbySync, HobbyUpdate
 from digital_twin.services.hobby import HobbyService
+from digital_twin.services.persona import rows_fingerprint
+from digital_twin.utils.http_cache import (
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
 from digital_twin.utils.lakehouse_export import export_data
 
 router = APIRouter(prefix="/hobbies", tags=["hobby"])
 
 
 @router.post("/", response_model=Hobby)
-def create_hobby(hobby: HobbyCreate, db: Annotated[Session, Depends(get_db)]):
-    new_hobby = HobbyService.create_hobby(db, hobby)
+async def create_hobby(hobby: HobbyCreate, db: Annotated[AsyncSession, Depends(get_async_db)]):
+    new_hobby = await HobbyService.create_hobby(db, hobby)
 
     if new_hobby is None:
         export_data(
@@ -40,12 +57,103 @@ def create_hobby(hobby: HobbyCreate, db: Annotated[Session, Depends(get_db)]):
     return new_hobby
 
 
+@router.post("/bulk", response_model=list[Hobby])
+async def create_hobbies(
+    hobbies: Annotated[
+        list[HobbyCreate], Body(min_length=1, max_length=settings.CHILD_BULK_MAX_ITEMS)
+    ],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    """Creates several hobbies, of one or more personas, in one transaction."""
+    new_hobbies = await HobbyService.create_hobbies(db, hobbies)
+
+    if new_hobbies is None:
+        export_data(
+            "endpoints",
+            {
+                "event": "hobby_bulk_create",
+                "status": "error",
+                "description": "One of the personas does not exist",
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Persona id not found"
+        )
+
+    export_data(
+        "endpoints",
+        {
+            "event": "hobby_bulk_create",
+            "status": "success",
+            "items": len(new_hobbies),
+        },
+    )
+    return new_hobbies
+
+
+@router.put("/", response_model=list[Hobby])
+async def sync_hobbies(
+    persona: Annotated[int, Query(description="Persona ID")],
+    hobbies: Annotated[list[HobbySync], Body(max_length=settings.CHILD_BULK_MAX_ITEMS)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    """
+    Replaces the hobbies of a persona with the given set: items with an id
+    are updated, those without are created and the rest are deleted.
+    """
+    try:
+        synced = await HobbyService.sync_hobbies(db, persona, hobbies)
+    except ValueError as e:
+        export_data(
+            "endpoints",
+            {
+                "event": "hobby_sync",
+                "status": "error",
+                "description": str(e),
+            },
+        )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if synced is None:
+        export_data(
+            "endpoints",
+            {
+                "event": "hobby_sync",
+                "status": "error",
+                "description": f"Persona with ID {persona} does not exist",
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Persona id not found"
+        )
+
+    export_data(
+        "endpoints",
+        {
+            "event": "hobby_sync",
+            "status": "success",
+            "persona_id": persona,
+            "items": len(synced),
+        },
+    )
+    return synced
+
+
 @router.get("/", response_model=list[Hobby])
-def get_hobbies(
+async def get_hobbies(
     persona: Annotated[int, Query(description="Persona ID")],
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
 ):
-    hobby = HobbyService.get_hobbies_by_persona(db, persona)
+    # Empty lists are never answered with 304, so a missing persona still gets its 404
+    if request.headers.get("if-none-match"):
+        fingerprint = await HobbyService.get_fingerprint_by_persona(db, persona)
+        etag = make_etag(fingerprint)
+        if fingerprint[0] and etag_matches(request, etag):
+            return not_modified(etag)
+
+    hobby = await HobbyService.get_hobbies_by_persona(db, persona)
 
     if hobby is None:
         export_data(
@@ -69,12 +177,13 @@ def get_hobbies(
             "items": len(hobby),
         }
     )
+    set_cache_headers(response, make_etag(rows_fingerprint(hobby)))
     return hobby
 
 
 @router.get("/{id}", response_model=Hobby)
-def get_hobby(id: int, db: Annotated[Session, Depends(get_db)]):
-    hobby = HobbyService.get_hobby(db, id)
+async def get_hobby(id: int, db: Annotated[AsyncSession, Depends(get_read_db)]):
+    hobby = await HobbyService.get_hobby(db, id)
 
     if not hobby:
         export_data(
@@ -101,10 +210,10 @@ def get_hobby(id: int, db: Annotated[Session, Depends(get_db)]):
 
 
 @router.put("/{id}", response_model=Hobby)
-def update_hobby(
-    id: int, hobby_update: HobbyUpdate, db: Annotated[Session, Depends(get_db)]
+async def update_hobby(
+    id: int, hobby_update: HobbyUpdate, db: Annotated[AsyncSession, Depends(get_async_db)]
 ):
-    hobby = HobbyService.update_hobby(db, id, hobby_update)
+    hobby = await HobbyService.update_hobby(db, id, hobby_update)
 
     if not hobby:
         export_data(
@@ -131,8 +240,8 @@ def update_hobby(
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_hobby(id: int, db: Annotated[Session, Depends(get_db)]) -> None:
-    success = HobbyService.delete_hobby(db, id)
+async def delete_hobby(id: int, db: Annotated[AsyncSession, Depends(get_async_db)]) -> None:
+    success = await HobbyService.delete_hobby(db, id)
 
     if not success:
         export_data(
@@ -1,25 +1,43 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from digital_twin.database import get_db
+from digital_twin.config import settings
+from digital_twin.database import get_async_db, get_read_db
 from digital_twin.schemas.occupation import (
     Occupation,
     OccupationCreate,
+    OccupationSync,
     OccupationUpdate,
 )
 from digital_twin.services.occupation import OccupationService
+from digital_twin.services.persona import rows_fingerprint
+from digital_twin.utils.http_cache import (
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
 from digital_twin.utils.lakehouse_export import export_data
 
 router = APIRouter(prefix="/occupations", tags=["occupation"])
 
 
 @router.post("/", response_model=Occupation)
-def create_occupation(
-    occupation: OccupationCreate, db: Annotated[Session, Depends(get_db)]
+async def create_occupation(
+    occupation: OccupationCreate, db: Annotated[AsyncSession, Depends(get_async_db)]
 ):
-    new_occupation = OccupationService.create_occupation(db, occupation)
+    new_occupation = await OccupationService.create_occupation(db, occupation)
 
     if new_occupation is None:
         export_data(
@@ -46,12 +64,103 @@ def create_occupation(
     return new_occupation
 
 
+@router.post("/bulk", response_model=list[Occupation])
+async def create_occupations(
+    occupations: Annotated[
+        list[OccupationCreate], Body(min_length=1, max_length=settings.CHILD_BULK_MAX_ITEMS)
+    ],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    """Creates several occupations, of one or more personas, in one transaction."""
+    new_occupations = await OccupationService.create_occupations(db, occupations)
+
+    if new_occupations is None:
+        export_data(
+            "endpoints",
+            {
+                "event": "occupation_bulk_create",
+                "status": "error",
+                "description": "One of the personas does not exist",
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Persona id not found"
+        )
+
+    export_data(
+        "endpoints",
+        {
+            "event": "occupation_bulk_create",
+            "status": "success",
+            "items": len(new_occupations),
+        },
+    )
+    return new_occupations
+
+
+@router.put("/", response_model=list[Occupation])
+async def sync_occupations(
+    persona: Annotated[int, Query(description="Persona ID")],
+    occupations: Annotated[list[OccupationSync], Body(max_length=settings.CHILD_BULK_MAX_ITEMS)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    """
+    Replaces the occupations of a persona with the given set: items with an id
+    are updated, those without are created and the rest are deleted.
+    """
+    try:
+        synced = await OccupationService.sync_occupations(db, persona, occupations)
+    except ValueError as e:
+        export_data(
+            "endpoints",
+            {
+                "event": "occupation_sync",
+                "status": "error",
+                "description": str(e),
+            },
+        )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if synced is None:
+        export_data(
+            "endpoints",
+            {
+                "event": "occupation_sync",
+                "status": "error",
+                "description": f"Persona with ID {persona} does not exist",
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Persona id not found"
+        )
+
+    export_data(
+        "endpoints",
+        {
+            "event": "occupation_sync",
+            "status": "success",
+            "persona_id": persona,
+            "items": len(synced),
+        },
+    )
+    return synced
+
+
 @router.get("/", response_model=list[Occupation])
-def get_occupations_by_persona(
+async def get_occupations_by_persona(
     persona: Annotated[int, Query(description="Persona ID")],
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
 ):
-    occupation = OccupationService.get_occupations_by_persona(db, persona)
+    # Empty lists are never answered with 304, so a missing persona still gets its 404
+    if request.headers.get("if-none-match"):
+        fingerprint = await OccupationService.get_fingerprint_by_persona(db, persona)
+        etag = make_etag(fingerprint)
+        if fingerprint[0] and etag_matches(request, etag):
+            return not_modified(etag)
+
+    occupation = await OccupationService.get_occupations_by_persona(db, persona)
 
     if occupation is None:
         export_data(
@@ -75,12 +184,13 @@ def get_occupations_by_persona(
             "items": len(occupation),
         }
     )
+    set_cache_headers(response, make_etag(rows_fingerprint(occupation)))
     return occupation
 
 
 @router.get("/{id}", response_model=Occupation)
-def get_occupation(id: int, db: Annotated[Session, Depends(get_db)]):
-    occupation = OccupationService.get_occupation(db, id)
+async def get_occupation(id: int, db: Annotated[AsyncSession, Depends(get_read_db)]):
+    occupation = await OccupationService.get_occupation(db, id)
 
     if not occupation:
         export_data(
@@ -107,12 +217,12 @@ def get_occupation(id: int, db: Annotated[Session, Depends(get_db)]):
 
 
 @router.put("/{id}", response_model=Occupation)
-def update_occupation(
+async def update_occupation(
     id: int,
     occupation_update: OccupationUpdate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ):
-    occupation = OccupationService.update_occupation(db, id, occupation_update)
+    occupation = await OccupationService.update_occupation(db, id, occupation_update)
 
     if not occupation:
         export_data(
@@ -139,8 +249,8 @@ def update_occupation(
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_occupation(id: int, db: Annotated[Session, Depends(get_db)]) -> None:
-    success = OccupationService.delete_occupation(db, id)
+async def delete_occupation(id: int, db: Annotated[AsyncSession, Depends(get_async_db)]) -> None:
+    success = await OccupationService.delete_occupation(db, id)
 
     if not success:
         export_data(
@@ -1,19 +1,93 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from digital_twin.database import get_db
-from digital_twin.schemas.persona import Persona, PersonaCreate, PersonaUpdate
-from digital_twin.services.persona import PersonaService
+from digital_twin.config import settings
+from digital_twin.database import get_async_db, get_read_db
+from digital_twin.schemas.persona import (
+    GenderEnum,
+    Persona,
+    PersonaCreate,
+    PersonaImportResult,
+    PersonaUpdate,
+)
+from digital_twin.services.export import EXPORT_MEDIA_TYPES, ExportService
+from digital_twin.services.persona import (
+    PERSONA_RELATIONSHIPS,
+    PersonaService,
+    persona_filters,
+    personas_fingerprint,
+)
+from digital_twin.services.persona_import import (
+    ImportValidationError,
+    PersonaImportService,
+)
+from digital_twin.utils.fields import parse_fields, sparse_schema
+from digital_twin.utils.http_cache import (
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
 from digital_twin.utils.lakehouse_export import export_data
+from digital_twin.utils.responses import PydanticJSONResponse
 
 router = APIRouter(prefix="/personas", tags=["persona"])
 
 
 @router.get("/", response_model=list[Persona])
-def get_all_personas(db: Annotated[Session, Depends(get_db)]):
-    personas = PersonaService.get_personas(db)
+async def get_all_personas(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    limit: Annotated[
+        int, Query(ge=1, le=settings.PERSONA_MAX_PAGE_SIZE, description="Page size")
+    ] = settings.PERSONA_PAGE_SIZE,
+    cursor: Annotated[
+        int | None, Query(description="Return personas after this persona ID")
+    ] = None,
+    nationality: Annotated[str | None, Query(description="Filter by nationality")] = None,
+    gender: Annotated[GenderEnum | None, Query(description="Filter by gender")] = None,
+    fields: Annotated[
+        str | None, Query(description="Comma-separated fields to return, e.g. id,name")
+    ] = None,
+):
+    selected = None
+    if fields is not None:
+        try:
+            selected = parse_fields(fields, Persona)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    filters = persona_filters(nationality, gender)
+    relationships = [r for r in PERSONA_RELATIONSHIPS if selected is None or r in selected]
+    columns = None
+    if selected is not None:
+        columns = [f for f in Persona.model_fields if f in selected and f not in PERSONA_RELATIONSHIPS]
+    # Different fieldsets of the same page are different representations
+    etag_key = tuple(sorted(selected)) if selected is not None else ()
+
+    # Revalidation costs one aggregate query instead of loading the page
+    if request.headers.get("if-none-match"):
+        fingerprint = await PersonaService.get_page_fingerprint(
+            db, limit, cursor, filters, relationships
+        )
+        etag = make_etag((etag_key, *fingerprint))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    total = await PersonaService.count_personas(db, filters)
+    personas = await PersonaService.get_personas(
+        db, limit, cursor, filters, columns=columns, relationships=relationships
+    )
+    etag = make_etag((etag_key, total, *personas_fingerprint(personas, relationships)))
+
+    headers = {"X-Total-Count": str(total)}
+    # A full page means there may be more after it
+    if len(personas) == limit:
+        headers["X-Next-Cursor"] = str(personas[-1].id)
+
     export_data(
         "endpoints",
         {
@@ -22,12 +96,50 @@ def get_all_personas(db: Annotated[Session, Depends(get_db)]):
             "items": len(personas),
         },
     )
-    return personas
+
+    schema = Persona if selected is None else sparse_schema(Persona, selected)
+    page = PydanticJSONResponse(personas, list[schema], headers=headers)
+    set_cache_headers(page, etag)
+    return page
+
+
+# Declared before /{id} so "export" is not parsed as a persona id
+@router.get("/export")
+async def export_personas(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    format: Annotated[Literal["ndjson", "csv"], Query(description="Export format")] = "ndjson",
+) -> StreamingResponse:
+    """Streams every persona with its children as NDJSON or CSV."""
+    export_data(
+        "endpoints",
+        {
+            "event": "personas_export",
+            "status": "success",
+            "format": format,
+        },
+    )
+    return StreamingResponse(
+        ExportService.stream_personas(db, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="personas.{format}"'},
+    )
 
 
 @router.get("/{id}", response_model=Persona)
-def get_persona(id: int, db: Annotated[Session, Depends(get_db)]):
-    persona = PersonaService.get_persona(db, id)
+async def get_persona(
+    id: int,
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+):
+    if request.headers.get("if-none-match"):
+        fingerprint = await PersonaService.get_fingerprint(db, id)
+        etag = make_etag(fingerprint)
+        # A missing persona has an all-zero fingerprint, it gets its 404
+        if fingerprint[0] and etag_matches(request, etag):
+            return not_modified(etag)
+
+    persona = await PersonaService.get_persona(db, id)
 
     if not persona:
         export_data(
@@ -50,12 +162,78 @@ def get_persona(id: int, db: Annotated[Session, Depends(get_db)]):
             "persona_id": id,
         },
     )
+    set_cache_headers(response, make_etag(personas_fingerprint([persona])))
     return persona
 
 
+@router.get("/{id}/bundle", response_model=Persona)
+async def get_persona_bundle(
+    id: int,
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    include: Annotated[
+        str | None,
+        Query(description="Comma-separated collections to return, all by default: educations,occupations,hobbies"),
+    ] = None,
+):
+    """
+    A persona with the requested collections in 1 + len(include) queries,
+    replacing the persona and per-collection list requests of a persona page.
+    """
+    relationships = list(PERSONA_RELATIONSHIPS)
+    if include is not None:
+        requested = {r.strip() for r in include.split(",") if r.strip()}
+        unknown = requested - set(PERSONA_RELATIONSHIPS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown collections: {', '.join(sorted(unknown))}",
+            )
+        relationships = [r for r in PERSONA_RELATIONSHIPS if r in requested]
+    children = [PERSONA_RELATIONSHIPS[r] for r in relationships]
+
+    if request.headers.get("if-none-match"):
+        fingerprint = await PersonaService.get_fingerprint(db, id, children=children)
+        etag = make_etag((tuple(relationships), *fingerprint))
+        if fingerprint[0] and etag_matches(request, etag):
+            return not_modified(etag)
+
+    persona = await PersonaService.get_persona(db, id, relationships)
+
+    if not persona:
+        export_data(
+            "endpoints",
+            {
+                "event": "persona_get_bundle",
+                "status": "error",
+                "description": f"Persona with ID {id} does not exist",
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Persona not found"
+        )
+
+    export_data(
+        "endpoints",
+        {
+            "event": "persona_get_bundle",
+            "status": "success",
+            "persona_id": id,
+            "include": relationships,
+        },
+    )
+    fields = frozenset(Persona.model_fields) - set(PERSONA_RELATIONSHIPS) | set(relationships)
+    bundle = PydanticJSONResponse(persona, sparse_schema(Persona, fields))
+    set_cache_headers(
+        bundle,
+        make_etag((tuple(relationships), *personas_fingerprint([persona], relationships))),
+    )
+    return bundle
+
+
 @router.post("/", response_model=Persona)
-def add_persona(new_persona: PersonaCreate, db: Annotated[Session, Depends(get_db)]):
-    persona = PersonaService.create_persona(db, new_persona)
+async def add_persona(new_persona: PersonaCreate, db: Annotated[AsyncSession, Depends(get_async_db)]):
+    persona = await PersonaService.create_persona(db, new_persona)
 
     if not persona:
         export_data(
@@ -81,11 +259,76 @@ def add_persona(new_persona: PersonaCreate, db: Annotated[Session, Depends(get_d
     return persona
 
 
+async def read_import_body(request: Request) -> bytes:
+    """Reads the body, stopping as soon as it exceeds PERSONA_IMPORT_MAX_BYTES."""
+    limit = settings.PERSONA_IMPORT_MAX_BYTES
+    too_large = HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Import bodies are limited to {limit} bytes, use the persona-import CLI.",
+    )
+
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > limit:
+        raise too_large
+
+    # Chunked bodies carry no length, count them while reading
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+
+@router.post("/import", response_model=PersonaImportResult)
+async def import_personas(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    chunk_size: Annotated[
+        int, Query(ge=1, le=10_000, description="Personas inserted per transaction")
+    ] = settings.PERSONA_IMPORT_CHUNK_SIZE,
+):
+    """
+    Imports personas with their educations, occupations and hobbies from a
+    JSON array or, with an ``application/x-ndjson`` body, one persona per line.
+    Bodies over PERSONA_IMPORT_MAX_BYTES are refused with 413; the CLI has no
+    such limit.
+    """
+    ndjson = request.headers.get("content-type", "").startswith("application/x-ndjson")
+
+    body = await read_import_body(request)
+    try:
+        personas = PersonaImportService.parse(body, ndjson=ndjson)
+    except ImportValidationError as e:
+        export_data(
+            "endpoints",
+            {
+                "event": "persona_import",
+                "status": "error",
+                "description": f"{len(e.errors)} validation errors",
+            },
+        )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.errors)
+
+    result = await PersonaImportService.import_personas(db, personas, chunk_size)
+
+    export_data(
+        "endpoints",
+        {
+            "event": "persona_import",
+            "status": "success",
+            "items": result.personas,
+            "rows_per_second": result.rows_per_second,
+        },
+    )
+    return result
+
+
 @router.put("/{id}", response_model=Persona)
-def update_persona(
-    id: int, update_persona: PersonaUpdate, db: Annotated[Session, Depends(get_db)]
+async def update_persona(
+    id: int, update_persona: PersonaUpdate, db: Annotated[AsyncSession, Depends(get_async_db)]
 ):
-    persona = PersonaService.update_persona(db, id, update_persona)
+    persona = await PersonaService.update_persona(db, id, update_persona)
 
     if not persona:
         export_data(
@@ -112,8 +355,8 @@ def update_persona(
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_persona(id: int, db: Annotated[Session, Depends(get_db)]):
-    success = PersonaService.delete_persona(db, id)
+async def delete_persona(id: int, db: Annotated[AsyncSession, Depends(get_async_db)]):
+    success = await PersonaService.delete_persona(db, id)
 
     if not success:
         export_data(
@@ -1,22 +1,31 @@
-from typing import Annotated
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from digital_twin.database import get_db
-from digital_twin.schemas.chat_message import ChatMessage, ChatMessageCreate
-from digital_twin.schemas.user import Token, User, UserCreate, UserLogin
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from digital_twin.config import settings
+from digital_twin.database import get_async_db, get_read_db
+from digital_twin.schemas.chat_message import (
+    ChatMessage,
+    ChatMessageCreate,
+    ChatMessageSearchResult,
+)
+from digital_twin.schemas.user import CurrentUser, Token, User, UserCreate, UserLogin
 from digital_twin.services.chat import ChatService
+from digital_twin.services.chat_archive import ChatArchiveService
+from digital_twin.services.export import EXPORT_MEDIA_TYPES, ExportService
 from digital_twin.services.user import UserService
 from digital_twin.utils.lakehouse_export import export_data
+from digital_twin.utils.responses import PydanticJSONResponse
 from digital_twin.utils.security import create_access_token, get_current_user
 
 router = APIRouter(prefix="/users", tags=["user"])
 
 
 @router.post("/register", status_code=status.HTTP_204_NO_CONTENT)
-def add_user(new_user: UserCreate, db: Annotated[Session, Depends(get_db)]):
-    success = UserService.add_user(db, new_user)
+async def add_user(new_user: UserCreate, db: Annotated[AsyncSession, Depends(get_async_db)]):
+    success = await UserService.add_user(db, new_user)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -25,8 +34,8 @@ def add_user(new_user: UserCreate, db: Annotated[Session, Depends(get_db)]):
 
 
 @router.post("/login", response_model=Token)
-def authenticate_user(user: UserLogin, db: Annotated[Session, Depends(get_db)]):
-    user = UserService.authenticate_user(db, user)
+async def authenticate_user(user: UserLogin, db: Annotated[AsyncSession, Depends(get_async_db)]):
+    user = await UserService.authenticate_user(db, user)
 
     if not user:
         raise HTTPException(
@@ -40,51 +49,151 @@ def authenticate_user(user: UserLogin, db: Annotated[Session, Depends(get_db)]):
 
 
 @router.get("/profile")
-def get_profile(current_user: Annotated[User, Depends(get_current_user)]) -> User:
-    return current_user
+async def get_profile(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> User:
+    user = await UserService.get_user(db, current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return user
+
+
+# Declared before /{id}/chats/{persona_id} so "export" and "search" are not
+# parsed as persona ids
+@router.get("/{id}/chats/export")
+async def export_chats(
+    id: int,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    format: Annotated[Literal["ndjson", "csv"], Query(description="Export format")] = "ndjson",
+) -> StreamingResponse:
+    """Streams every message of the user's chats as NDJSON or CSV."""
+    if current_user.id != id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Users can only export their own chats.",
+        )
+
+    export_data(
+        "chat",
+        {
+            "event": "chats_export",
+            "status": "success",
+            "user_id": id,
+            "format": format,
+        },
+    )
+    return StreamingResponse(
+        ExportService.stream_user_chats(db, id, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="chats-{id}.{format}"'},
+    )
+
+
+@router.get("/{id}/chats/search")
+async def search_chats(
+    id: int,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    q: Annotated[
+        str, Query(min_length=1, max_length=200, pattern=r"\S", description="Search terms")
+    ],
+    persona_id: Annotated[
+        int | None, Query(description="Only search the chat with this persona")
+    ] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=settings.CHAT_SEARCH_MAX_PAGE_SIZE, description="Page size")
+    ] = settings.CHAT_SEARCH_PAGE_SIZE,
+    offset: Annotated[int, Query(ge=0, description="Results to skip")] = 0,
+) -> list[ChatMessageSearchResult]:
+    """
+    Full-text search over the user's chat messages, best matches first.
+    Archived messages are not searched; X-Archived-Not-Searched counts them.
+    """
+    if current_user.id != id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Users can only search their own chats.",
+        )
+
+    results = await ChatService.search_user_messages(
+        id, q, db, persona_id=persona_id, limit=limit, offset=offset
+    )
+
+    # Relevance order has no stable key to page on, so pages are offsets
+    headers = {}
+    if len(results) == limit:
+        headers["X-Next-Offset"] = str(offset + limit)
+    # The full-text index only covers hot messages
+    archived = await ChatArchiveService.count_archived(db, id, persona_id)
+    if archived:
+        headers["X-Archived-Not-Searched"] = str(archived)
+
+    export_data(
+        "chat",
+        {
+            "event": "chats_search",
+            "status": "success",
+            "user_id": id,
+            "items": len(results),
+        },
+    )
+    return PydanticJSONResponse(results, list[ChatMessageSearchResult], headers=headers)
 
 
 @router.get("/{id}/chats/{persona_id}")
-def get_chats(
+async def get_chats(
     id: int,
     persona_id: int,
-    db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    before: Annotated[
+        int | None, Query(description="Return messages older than this message ID")
+    ] = None,
+    after: Annotated[
+        int | None, Query(description="Return only messages newer than this message ID")
+    ] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=settings.CHAT_HISTORY_MAX_PAGE_SIZE, description="Page size")
+    ] = settings.CHAT_HISTORY_PAGE_SIZE,
 ) -> list[ChatMessage] | None:
-    chat = ChatService.get_user_persona_chats(id, persona_id, db)
+    if before is not None and after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either 'before' or 'after', not both.",
+        )
+
+    chat = await ChatService.get_user_persona_chats(id, persona_id, db)
 
     if chat is None:
         return None
 
-    return ChatService.get_user_persona_chat_history(chat.id, db)
+    messages = await ChatService.get_user_persona_chat_history(
+        chat.id, db, before=before, after=after, limit=limit,
+        archived_until=chat.archived_until_id,
+    )
+
+    # A full page of older messages means there may be more behind it
+    headers = {}
+    if after is None and len(messages) == limit:
+        headers["X-Next-Cursor"] = str(messages[-1].id)
+
+    return PydanticJSONResponse(messages, list[ChatMessage], headers=headers)
 
 
 @router.post("/{id}/chats/{persona_id}")
-def add_chat_message(
+async def add_chat_message(
     id: int,
     persona_id: int,
     message: ChatMessageCreate,
-    db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ):
-    chat = ChatService.get_user_persona_chats(id, persona_id, db)
-
-    if chat is None:
-        chat = ChatService.create_chat_persona(id, persona_id, db)
-        if not chat:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create a new chat with the specified persona.",
-            )
-
-    new_message = ChatService.add_chat_persona_message(chat.id, message, db)
-    if not new_message:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to add the user's message to the chat.",
-        )
-
-    result = ChatService.generate_chat_response(new_message.content, persona_id, db)
+    # Ask the persona first so the whole turn is stored in one transaction
+    result = await ChatService.generate_chat_response(message.content, persona_id, db)
     if not result:
         export_data(
             "chat",
@@ -114,28 +223,27 @@ def add_chat_message(
         }
     )
 
-    assistant_message = ChatMessageCreate(role="Assistant", content=result["output"])
-    new_response = ChatService.add_chat_persona_message(chat.id, assistant_message, db)
+    new_response = await ChatService.record_chat_turn(id, persona_id, message, result["output"], db)
 
     if not new_response:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to store the assistant's response in the chat.",
+            detail="Failed to store the chat turn.",
         )
 
     return new_response
 
 @router.post("/{id}/multi-agent")
-def add_chat_message_multi_agent(
+async def add_chat_message_multi_agent(
     id: int,
     message: ChatMessageCreate,
-    db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ):
     """
     Handles chat interactions using the multi-agent supervisor workflow.
     """
-    result = ChatService.generate_chat_response_supervisor(message.content, db)
+    result = await ChatService.generate_chat_response_supervisor(message.content, db)
     if not result:
         export_data(
             "chat",
@@ -150,22 +258,6 @@ def add_chat_message_multi_agent(
             detail="Failed to generate a response using the multi-agent system.",
         )
     persona_id = result.get("persona_id")
-    chat = ChatService.get_user_persona_chats(id, persona_id, db)
-
-    if chat is None:
-        chat = ChatService.create_chat_persona(id, persona_id, db)
-        if not chat:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create a new chat with the specified persona.",
-            )
-
-    new_message = ChatService.add_chat_persona_message(chat.id, message, db)
-    if not new_message:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to add the user's message to the chat.",
-        )
 
     export_data(
         "chat",
@@ -178,13 +270,12 @@ def add_chat_message_multi_agent(
         }
     )
 
-    assistant_message = ChatMessageCreate(role="Assistant", content=result["output"])
-    new_response = ChatService.add_chat_persona_message(chat.id, assistant_message, db)
+    new_response = await ChatService.record_chat_turn(id, persona_id, message, result["output"], db)
 
     if not new_response:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to store the assistant's response from the supervisor workflow.",
+            detail="Failed to store the chat turn from the supervisor workflow.",
         )
     
     new_response.metadata = {
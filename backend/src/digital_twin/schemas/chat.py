@@ -47,3 +47,12 @@ class Chat(ChatBase):
             }
         },
     )
+
+
+class ChatArchiveResult(BaseModel):
+    """Chat archival run summary."""
+
+    chats: int
+    messages: int
+    files: int
+    seconds: float
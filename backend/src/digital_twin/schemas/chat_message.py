@@ -72,3 +72,12 @@ class ChatMessage(ChatMessageBase):
             },   
         },
     )
+
+
+class ChatMessageSearchResult(ChatMessage):
+    """Model for a chat message matched by a search."""
+
+    chat_id: int = Field(..., description="ID of the chat the message belongs to")
+    persona_id: int = Field(..., description="ID of the persona of the chat")
+    rank: float = Field(..., description="Relevance of the match, higher is better")
+    snippet: str = Field(..., description="Excerpt of the content with the matches in **bold**")
@@ -77,6 +77,12 @@ class EducationCreate(EducationBase):
     persona_id: int = Field(gt=0)
 
 
+class EducationSync(EducationBase):
+    """Education in the full set of a persona; without an id it is created."""
+
+    id: int | None = Field(None, gt=0, description="Existing education to keep")
+
+
 class EducationUpdate(BaseModel):
     """Model for updating an existing education."""
 
@@ -51,6 +51,12 @@ class HobbyCreate(HobbyBase):
     persona_id: int = Field(gt=0)
 
 
+class HobbySync(HobbyBase):
+    """Hobby in the full set of a persona; without an id it is created."""
+
+    id: int | None = Field(None, gt=0, description="Existing hobby to keep")
+
+
 class HobbyUpdate(BaseModel):
     """Model for updating an existing hobby."""
 
@@ -51,6 +51,12 @@ class OccupationCreate(OccupationBase):
     pass
 
 
+class OccupationSync(OccupationBase):
+    """Occupation in the full set of a persona; without an id it is created."""
+
+    id: int | None = Field(None, gt=0, description="Existing occupation to keep")
+
+
 class OccupationUpdate(BaseModel):
     """Model for updating an existing Occupation."""
 
@@ -5,6 +5,9 @@ from typing import Annotated, ClassVar
 from pydantic import AfterValidator, BaseModel, ConfigDict, Field
 
 from digital_twin.schemas import Education, Hobby, Occupation
+from digital_twin.schemas.education import EducationBase
+from digital_twin.schemas.hobby import HobbyBase
+from digital_twin.schemas.occupation import OccupationBase
 
 
 class GenderEnum(StrEnum):
@@ -35,6 +38,26 @@ class PersonaCreate(PersonaBase):
     pass
 
 
+class PersonaImport(PersonaBase):
+    """Persona with its children, as accepted by the bulk import."""
+
+    educations: list[EducationBase] = Field(default_factory=list)
+    occupations: list[OccupationBase] = Field(default_factory=list)
+    hobbies: list[HobbyBase] = Field(default_factory=list)
+
+
+class PersonaImportResult(BaseModel):
+    """Bulk import summary."""
+
+    personas: int
+    educations: int
+    occupations: int
+    hobbies: int
+    chunks: int
+    seconds: float
+    rows_per_second: float
+
+
 class PersonaUpdate(BaseModel):
     """Persona update schema."""
 
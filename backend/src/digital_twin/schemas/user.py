@@ -78,6 +78,13 @@ class User(UserBase):
         },
     )
 
+class CurrentUser(UserBase):
+    """Authenticated principal, without the user's chats."""
+
+    id: Annotated[int, Field(description="Unique User ID")]
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(from_attributes=True)
+
 class Token(BaseModel):
     """JWT token response."""
     access_token: str
@@ -0,0 +1,81 @@
+"""
+Server entry points: ``digital-twin`` for production, ``digital-twin-dev``
+for local development with auto-reload.
+"""
+
+import argparse
+import importlib.util
+import os
+from typing import Any
+
+import uvicorn
+
+from digital_twin.config import settings
+from digital_twin.database import engine
+from digital_twin.utils.migrations import migrate_on_startup
+
+APP = "digital_twin:app"
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, which in a container can be fewer than the host's."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def server_options(args: argparse.Namespace) -> dict[str, Any]:
+    """uvicorn.run keyword arguments for the production server."""
+    return {
+        "host": args.host,
+        "port": args.port,
+        "workers": args.workers or min(available_cpus(), settings.SERVER_MAX_WORKERS),
+        "backlog": args.backlog,
+        "limit_concurrency": args.limit_concurrency or None,
+        "timeout_keep_alive": args.keepalive,
+        "timeout_graceful_shutdown": args.graceful_shutdown,
+        # C event loop and HTTP parser, when installed (uvicorn[standard])
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+        "proxy_headers": True,
+    }
+
+
+def serve():
+    parser = argparse.ArgumentParser(description="Run the Digital Twin API.")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.SERVER_WORKERS,
+        help="0 uses one per available CPU, up to APP_SERVER_MAX_WORKERS",
+    )
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        default=settings.SERVER_LIMIT_CONCURRENCY,
+        help="Connections per worker before answering 503, 0 is unlimited",
+    )
+    parser.add_argument("--keepalive", type=int, default=settings.SERVER_KEEPALIVE_SECONDS)
+    parser.add_argument(
+        "--graceful-shutdown",
+        type=int,
+        default=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        help="Seconds in-flight requests get to finish on shutdown",
+    )
+    args = parser.parse_args()
+
+    # The supervisor has already imported the app, so configuration errors
+    # surface before any worker starts. Migrating once here spares every
+    # worker the revision check
+    migrate_on_startup(engine)
+    engine.dispose()
+    os.environ["APP_AUTO_MIGRATE"] = "false"
+
+    uvicorn.run(APP, **server_options(args))
+
+
+def dev():
+    uvicorn.run(APP, host=settings.SERVER_HOST, port=settings.SERVER_PORT, reload=True)
@@ -1,69 +1,239 @@
 from typing import Any
 
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import column, func, insert, literal_column, select, table, true
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from digital_twin.config import settings
 from digital_twin.models.chat import Chat
 from digital_twin.models.chat_message import ChatMessage
-from digital_twin.schemas.chat_message import ChatMessageCreate
-from digital_twin.services.agent_executor import get_agent_executor
-from digital_twin.services.multi_agent_supervisor_pattern import (
-    create_supervisor_workflow,
-)
+from digital_twin.schemas.chat_message import ChatMessageCreate, ChatMessageRole
+from digital_twin.services.chat_archive import ChatArchiveService
 from digital_twin.services.persona import PersonaService
 from digital_twin.utils.persona_format import (
     dump_persona,
 )
 
+# INSERT ... ON CONFLICT constructs of the supported backends
+UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# Search snippet highlighting, plain text so clients can render it safely
+SNIPPET_START, SNIPPET_STOP = "**", "**"
+
+
+def _postgres_search(query, text: str):
+    """Matches the GIN-indexed tsvector (see models.chat_message.SEARCH_DDL)."""
+    vector = literal_column("chat_messages.search_vector")
+    tsquery = func.websearch_to_tsquery("pg_catalog.english", text)
+    snippet = func.ts_headline(
+        "pg_catalog.english",
+        ChatMessage.content,
+        tsquery,
+        f"StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, MaxFragments=2",
+    )
+    rank = func.ts_rank_cd(vector, tsquery)
+    return query.add_columns(rank, snippet).where(vector.op("@@")(tsquery)), rank
+
+
+def _sqlite_search(query, text: str):
+    """Matches the FTS5 table (see models.chat_message.SEARCH_DDL)."""
+    fts_table = table("chat_messages_fts", column("rowid"))
+    # The table name itself stands for its hidden column in MATCH and bm25()
+    fts = literal_column("chat_messages_fts")
+    # Quote every term so user input is never parsed as FTS5 query syntax
+    terms = " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+    snippet = func.snippet(fts, 0, SNIPPET_START, SNIPPET_STOP, "…", 16)
+    # bm25 is lower for better matches
+    rank = -func.bm25(fts)
+    query = (
+        query.add_columns(rank, snippet)
+        .join_from(ChatMessage, fts_table, fts_table.c.rowid == ChatMessage.id)
+        .where(fts.op("MATCH")(terms))
+    )
+    return query, rank
+
+
+# langchain, langgraph and the Gemini client take seconds to import. They are
+# loaded on the first question rather than at startup, in the threadpool like
+# the agents themselves, so the import does not stall the event loop
+
+
+def _invoke_agent(persona_data: dict[str, Any]) -> dict[str, Any]:
+    from digital_twin.services.agent_executor import get_agent_executor
+
+    return get_agent_executor().invoke(persona_data)
+
+
+def _supervisor_workflow(personas: list):
+    from digital_twin.services.multi_agent_supervisor_pattern import (
+        create_supervisor_workflow,
+    )
+
+    return create_supervisor_workflow(personas)
+
+
+SEARCHES = {"postgresql": _postgres_search, "sqlite": _sqlite_search}
+
 
 class ChatService:
     """Chat abstraction layer between ORM and API endpoints."""
 
     @staticmethod
-    def get_user_persona_chats(id: int, persona_id: int, db: Session) -> Chat | None:
-        return (
-            db.query(Chat)
-            .filter(Chat.user_id == id, Chat.persona_id == persona_id, Chat.is_active)
-            .first()
+    async def get_user_persona_chats(
+        id: int, persona_id: int, db: AsyncSession
+    ) -> Chat | None:
+        result = await db.execute(
+            select(Chat).filter(
+                Chat.user_id == id, Chat.persona_id == persona_id, Chat.is_active
+            )
         )
+        return result.scalars().first()
 
     @staticmethod
-    def get_user_persona_chat_history(chat_id: int, db: Session) -> list[ChatMessage]:
-        return db.query(ChatMessage).filter(ChatMessage.chat_id == chat_id).all()
+    async def get_user_persona_chat_history(
+        chat_id: int,
+        db: AsyncSession,
+        before: int | None = None,
+        after: int | None = None,
+        limit: int = settings.CHAT_HISTORY_PAGE_SIZE,
+        archived_until: int | None = None,
+    ) -> list[ChatMessage]:
+        """
+        Returns one page of a chat's messages, newest first.
+
+        ``before`` pages back through older messages. ``after`` returns the
+        messages newer than the given id, starting from the oldest of them so
+        a client polling for new messages never skips any.
+
+        ``archived_until`` is the chat's Chat.archived_until_id: pages reaching
+        past it continue into the Parquet archive, which holds every older id.
+        """
+        archived = []
+        if after is not None and archived_until is not None and after < archived_until:
+            archived = await ChatArchiveService.get_archived_history(
+                db, chat_id, after=after, limit=limit
+            )
+            if len(archived) == limit:
+                archived.reverse()
+                return archived
+
+        query = select(ChatMessage).filter(ChatMessage.chat_id == chat_id)
+
+        if after is not None:
+            query = query.filter(ChatMessage.id > after).order_by(ChatMessage.id.asc())
+        else:
+            if before is not None:
+                query = query.filter(ChatMessage.id < before)
+            query = query.order_by(ChatMessage.id.desc())
+
+        result = await db.execute(query.limit(limit - len(archived)))
+        messages = archived + list(result.scalars())
+
+        if after is not None:
+            messages.reverse()
+        elif archived_until is not None and len(messages) < limit:
+            # The hot rows ran out, the rest of the page is archived
+            messages += await ChatArchiveService.get_archived_history(
+                db, chat_id, before=before, limit=limit - len(messages)
+            )
+        return messages
 
     @staticmethod
-    def create_chat_persona(id: int, persona_id: int, db: Session) -> Chat | None:
-        new_chat = Chat(user_id=id, persona_id=persona_id)
+    async def search_user_messages(
+        id: int,
+        text: str,
+        db: AsyncSession,
+        persona_id: int | None = None,
+        limit: int = settings.CHAT_SEARCH_PAGE_SIZE,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """
+        Full-text search over the messages of a user's chats, best matches
+        first. Each result carries its chat, persona, rank and a snippet.
+        """
+        if not text.split():
+            return []
 
-        try:
-            db.add(new_chat)
-        except IntegrityError:
-            return None
-        db.commit()
-        db.refresh(new_chat)
+        query = select(ChatMessage, Chat.persona_id).join(Chat).where(Chat.user_id == id)
+        if persona_id is not None:
+            query = query.where(Chat.persona_id == persona_id)
 
-        return new_chat
+        query, rank = SEARCHES[db.get_bind().dialect.name](query, text)
+        result = await db.execute(
+            query.order_by(rank.desc(), ChatMessage.id.desc()).limit(limit).offset(offset)
+        )
+
+        return [
+            {
+                "id": message.id,
+                "role": message.role,
+                "content": message.content,
+                "created_at": message.created_at,
+                "chat_id": message.chat_id,
+                "persona_id": message_persona_id,
+                "rank": message_rank,
+                "snippet": snippet,
+            }
+            for message, message_persona_id, message_rank, snippet in result
+        ]
 
     @staticmethod
-    def add_chat_persona_message(
-        chat_id: int, message: ChatMessageCreate, db: Session
+    async def record_chat_turn(
+        id: int,
+        persona_id: int,
+        message: ChatMessageCreate,
+        answer: str,
+        db: AsyncSession,
     ) -> ChatMessage | None:
-        new_message = ChatMessage(**message.model_dump(), chat_id=chat_id)
+        """
+        Stores a question and its answer in one transaction: the user's active
+        chat with the persona is looked up, or inserted against its partial
+        unique index so concurrent first turns cannot create two active chats,
+        and both messages go in a single INSERT ... RETURNING. Returns the answer.
+        """
+        upsert = UPSERTS[db.get_bind().dialect.name]
+        active_chat = select(Chat.id).where(
+            Chat.user_id == id, Chat.persona_id == persona_id, Chat.is_active == true()
+        )
 
         try:
-            db.add(new_message)
+            # Most turns continue a chat, which then is only read, not rewritten
+            chat_id = await db.scalar(active_chat)
+            if chat_id is None:
+                chat_id = await db.scalar(
+                    upsert(Chat)
+                    .values(user_id=id, persona_id=persona_id, is_active=True)
+                    .on_conflict_do_nothing(
+                        index_elements=[Chat.user_id, Chat.persona_id],
+                        index_where=Chat.is_active == true(),
+                    )
+                    .returning(Chat.id)
+                )
+            if chat_id is None:
+                # A concurrent first turn inserted the chat in the meantime
+                chat_id = await db.scalar(active_chat)
+            messages = await db.scalars(
+                insert(ChatMessage).returning(ChatMessage, sort_by_parameter_order=True),
+                [
+                    message.model_dump() | {"chat_id": chat_id},
+                    {"role": ChatMessageRole.ASSISTANT, "content": answer, "chat_id": chat_id},
+                ],
+            )
+            answer_message = messages.all()[-1]
+            await db.commit()
         except IntegrityError:
+            await db.rollback()
             return None
-        db.commit()
-        db.refresh(new_message)
 
-        return new_message
+        return answer_message
 
     @staticmethod
-    def generate_chat_response(
-        question: str, persona_id: int, db: Session
+    async def generate_chat_response(
+        question: str, persona_id: int, db: AsyncSession
     ) -> dict[str, Any] | None:
-        persona = PersonaService.get_persona(db, persona_id)
+        persona = await PersonaService.get_persona(db, persona_id)
 
         if not persona:
             return None
@@ -71,21 +241,20 @@ class ChatService:
         persona_data = dump_persona(persona)
         persona_data["input"] = question
 
-        executor = get_agent_executor()
-
-        result = executor.invoke(persona_data)
+        # The agent and its tools are blocking, keep them off the event loop
+        result = await run_in_threadpool(_invoke_agent, persona_data)
 
         return result
-    
+
     @staticmethod
-    def generate_chat_response_supervisor(
-        question: str, db: Session
+    async def generate_chat_response_supervisor(
+        question: str, db: AsyncSession
     ) -> dict[str, Any] | None:
         """
         Uses the multi-agent supervisor pattern to generate a collective response.
         """
-
-        workflow = create_supervisor_workflow(db)
+        personas = await PersonaService.get_personas(db)
+        workflow = await run_in_threadpool(_supervisor_workflow, personas)
 
         state = {
             "user_question": question,
@@ -97,7 +266,7 @@ class ChatService:
         }
 
         try:
-            result = workflow.invoke(state)
+            result = await run_in_threadpool(workflow.invoke, state)
         except Exception as e:
             print(f"[Supervisor Error] {e}")
             return None
@@ -108,4 +277,3 @@ class ChatService:
             "persona": result.get("chosen_persona",""),
             "persona_id": result.get("chosen_persona_id","")
         }
-
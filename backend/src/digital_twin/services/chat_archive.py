@@ -0,0 +1,247 @@
+"""
+Tiered storage for chat messages.
+
+Messages of inactive chats, and messages of active chats older than
+CHAT_ARCHIVE_AFTER_DAYS, are moved to Parquet files through the
+LakehouseManager, one file per contiguous id range of a chat. A ChatArchive
+row points at each file and Chat.archived_until_id marks where the hot
+history ends, so the history endpoint knows when to read archived pages
+with DuckDB.
+
+Run it periodically from the command line, e.g.
+
+    uv run chat-archive --older-than-days 90
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import (
+    DateTime,
+    cast,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    type_coerce,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from digital_twin.config import settings
+from digital_twin.database import AsyncSessionLocal, async_engine
+from digital_twin.models import Chat, ChatArchive, ChatMessage
+from digital_twin.schemas.chat import ChatArchiveResult
+
+if TYPE_CHECKING:
+    from digital_twin.utils.lakehouse_manager import LakehouseManager
+
+ARCHIVE_COLUMNS = (
+    ChatMessage.id,
+    ChatMessage.chat_id,
+    ChatMessage.role,
+    ChatMessage.content,
+    ChatMessage.created_at,
+)
+
+
+@lru_cache(maxsize=1)
+def _lakehouse(path: str) -> "LakehouseManager":
+    # duckdb and pandas are only needed once archived history is touched
+    from digital_twin.utils.lakehouse_manager import LakehouseManager
+
+    return LakehouseManager(path)
+
+
+def lakehouse() -> "LakehouseManager":
+    """LakehouseManager over the configured archive path."""
+    return _lakehouse(settings.CHAT_ARCHIVE_PATH)
+
+
+# Run on the threadpool: the first call imports duckdb and pandas, which
+# must not block the event loop
+def _write_archive(records: list[dict], path: str) -> None:
+    lakehouse().write_parquet(records, path)
+
+
+def _query_archive(paths: list[str], query: str, params: list) -> list[dict]:
+    return lakehouse().query_parquet(paths, query, params)
+
+
+class ChatArchiveService:
+    """Moves cold chat messages to Parquet and reads them back."""
+
+    @staticmethod
+    async def archive_messages(
+        db: AsyncSession,
+        older_than: datetime,
+        batch_size: int = settings.CHAT_ARCHIVE_BATCH_SIZE,
+    ) -> ChatArchiveResult:
+        """
+        Archives the messages of inactive chats and those created before
+        ``older_than``. Each batch is written to Parquet before the pointer
+        is stored and the rows deleted in one transaction, so a failure
+        leaves at worst an unreferenced file behind.
+        """
+        start = time.perf_counter()
+        # Ids grow with created_at, so the cold messages of a chat are the
+        # ones up to the newest cold id
+        cold = await db.execute(
+            select(ChatMessage.chat_id, func.max(ChatMessage.id))
+            .join(Chat)
+            .where(or_(Chat.is_active.is_(False), ChatMessage.created_at < older_than))
+            .group_by(ChatMessage.chat_id)
+            .order_by(ChatMessage.chat_id)
+        )
+
+        chats = messages = files = 0
+        for chat_id, last_id in cold.all():
+            chats += 1
+            while True:
+                result = await db.execute(
+                    select(*ARCHIVE_COLUMNS)
+                    .where(ChatMessage.chat_id == chat_id, ChatMessage.id <= last_id)
+                    .order_by(ChatMessage.id)
+                    .limit(batch_size)
+                )
+                records = [row._asdict() for row in result]
+                if not records:
+                    break
+
+                first, last = records[0]["id"], records[-1]["id"]
+                path = f"chat_id={chat_id}/{first:012d}-{last:012d}.parquet"
+                await run_in_threadpool(_write_archive, records, path)
+
+                await db.execute(
+                    insert(ChatArchive).values(
+                        chat_id=chat_id,
+                        first_message_id=first,
+                        last_message_id=last,
+                        message_count=len(records),
+                        path=path,
+                    )
+                )
+                await db.execute(
+                    delete(ChatMessage).where(
+                        ChatMessage.chat_id == chat_id, ChatMessage.id.between(first, last)
+                    )
+                )
+                await db.execute(
+                    update(Chat).where(Chat.id == chat_id).values(archived_until_id=last)
+                )
+                await db.commit()
+
+                messages += len(records)
+                files += 1
+
+        return ChatArchiveResult(
+            chats=chats,
+            messages=messages,
+            files=files,
+            seconds=round(time.perf_counter() - start, 3),
+        )
+
+    @staticmethod
+    async def get_archived_history(
+        db: AsyncSession,
+        chat_id: int,
+        before: int | None = None,
+        after: int | None = None,
+        limit: int = settings.CHAT_HISTORY_PAGE_SIZE,
+    ) -> list[ChatMessage]:
+        """
+        Archived counterpart of ChatService.get_user_persona_chat_history:
+        newest first below ``before``, or oldest first above ``after``. The
+        messages are detached ChatMessage instances.
+        """
+        query = select(ChatArchive.path).where(ChatArchive.chat_id == chat_id)
+        if before is not None:
+            query = query.where(ChatArchive.first_message_id < before)
+        if after is not None:
+            query = query.where(ChatArchive.last_message_id > after)
+        paths = list(await db.scalars(query))
+        if not paths:
+            return []
+
+        if after is not None:
+            sql, bound = "id > ? ORDER BY id ASC", after
+        else:
+            sql, bound = "id < ? ORDER BY id DESC", before if before is not None else 2**63 - 1
+        rows = await run_in_threadpool(
+            _query_archive,
+            paths,
+            f"SELECT id, chat_id, role, content, created_at FROM read_parquet(?) WHERE {sql} LIMIT ?",
+            [bound, limit],
+        )
+        return [ChatMessage(**row) for row in rows]
+
+    @staticmethod
+    async def count_archived(db: AsyncSession, user_id: int, persona_id: int | None = None) -> int:
+        """Archived messages of the user's chats (with the persona)."""
+        query = (
+            select(func.coalesce(func.sum(ChatArchive.message_count), 0))
+            .join(Chat, Chat.id == ChatArchive.chat_id)
+            .where(Chat.user_id == user_id)
+        )
+        if persona_id is not None:
+            query = query.where(Chat.persona_id == persona_id)
+        return await db.scalar(query)
+
+    @staticmethod
+    async def read_archive(path: str) -> list[dict]:
+        """Messages of one archive file, by id."""
+        return await run_in_threadpool(
+            _query_archive,
+            [path],
+            "SELECT id, chat_id, role, content, created_at FROM read_parquet(?) ORDER BY id",
+            [],
+        )
+
+
+async def database_now(db: AsyncSession) -> datetime:
+    """
+    Current time on the clock behind created_at's now() default: naive UTC
+    on SQLite, naive in the session time zone on Postgres.
+    """
+    now = func.now()
+    if db.get_bind().dialect.name != "sqlite":
+        now = cast(now, DateTime)
+    return await db.scalar(select(type_coerce(now, DateTime)))
+
+
+async def _archive(older_than_days: int, batch_size: int) -> ChatArchiveResult:
+    try:
+        async with AsyncSessionLocal() as db:
+            older_than = await database_now(db) - timedelta(days=older_than_days)
+            return await ChatArchiveService.archive_messages(db, older_than, batch_size)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive cold chat messages to Parquet.")
+    parser.add_argument("--older-than-days", type=int, default=settings.CHAT_ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.CHAT_ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    result = asyncio.run(_archive(args.older_than_days, args.batch_size))
+
+    # Make the archive discoverable through the lakehouse catalog
+    lakehouse().register_table(
+        schema_name="digital_twin",
+        table_name="chat_messages_archive",
+        location=str(lakehouse().storage_path.resolve()),
+        schema_def={"id": "int", "chat_id": "int", "role": "str", "content": "str", "created_at": "datetime"},
+        partitions=["chat_id"],
+    )
+    print(result.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from digital_twin.models.education import Education
-from digital_twin.schemas.education import EducationCreate, EducationUpdate
+from digital_twin.schemas.education import (
+    EducationCreate,
+    EducationSync,
+    EducationUpdate,
+)
 from digital_twin.services.persona import PersonaService
 
 
@@ -10,46 +14,75 @@ class EducationService:
     """Hobby abstraction layer between ORM and API endpoints."""
 
     @staticmethod
-    def create_education(db: Session, education: EducationCreate) -> Education | None:
+    async def create_education(
+        db: AsyncSession, education: EducationCreate
+    ) -> Education | None:
         new_education = Education(**education.model_dump())
 
         try:
             db.add(new_education)
-            db.commit()
-            db.refresh(new_education)
+            await db.commit()
+            await db.refresh(new_education)
 
             return new_education
         except IntegrityError:
+            await db.rollback()
             return None
 
     @staticmethod
-    def get_education(db: Session, id: int) -> Education | None:
-        return db.query(Education).filter(Education.id == id).first()
+    async def create_educations(
+        db: AsyncSession, educations: list[EducationCreate]
+    ) -> list[Education] | None:
+        return await PersonaService.create_children(
+            db, Education, [education.model_dump() for education in educations]
+        )
 
     @staticmethod
-    def get_educations_by_persona(db: Session, persona_id: int) -> list[Education] | None:
-        if not PersonaService.get_persona(db, persona_id):
-            return None
-        return db.query(Education).filter(Education.persona_id == persona_id).all()
+    async def sync_educations(
+        db: AsyncSession, persona_id: int, educations: list[EducationSync]
+    ) -> list[Education] | None:
+        return await PersonaService.sync_children(
+            db, persona_id, Education, [education.model_dump() for education in educations]
+        )
+
+    @staticmethod
+    async def get_education(db: AsyncSession, id: int) -> Education | None:
+        return await db.get(Education, id)
+
+    @staticmethod
+    async def get_educations_by_persona(
+        db: AsyncSession, persona_id: int
+    ) -> list[Education] | None:
+        return await PersonaService.get_persona_children(
+            db, persona_id, Education, Education.id
+        )
+
+    @staticmethod
+    async def get_fingerprint_by_persona(db: AsyncSession, persona_id: int) -> tuple[int, ...]:
+        """Fingerprint of the persona's educations, without loading them."""
+        return await PersonaService.get_fingerprint(
+            db, persona_id, children=(Education,), include_persona=False
+        )
 
     @staticmethod
-    def update_education(db: Session, id: int, update: EducationUpdate) -> Education | None:
-        education = db.query(Education).filter(Education.id == id).first()
+    async def update_education(
+        db: AsyncSession, id: int, update: EducationUpdate
+    ) -> Education | None:
+        education = await db.get(Education, id)
         if education:
             for k, v in update.model_dump(exclude_unset=True).items():
                 setattr(education, k, v)
-            db.commit()
-            db.refresh(education)
+            await db.commit()
+            await db.refresh(education)
 
         return education
 
     @staticmethod
-    def delete_education(db: Session, id: int) -> bool:
-        education = db.query(Education).filter(Education.id == id).first()
+    async def delete_education(db: AsyncSession, id: int) -> bool:
+        education = await db.get(Education, id)
         if not education:
             return False
 
-        db.delete(education)
-        db.commit()
+        await db.delete(education)
+        await db.commit()
         return True
-
@@ -0,0 +1,141 @@
+"""
+Streaming exports.
+
+Rows are read through server-side cursors in batches of ``batch_size`` and
+serialized one batch at a time, so memory use does not grow with the table.
+"""
+
+import csv
+import io
+import json
+from itertools import groupby
+from typing import AsyncIterator, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from digital_twin.config import settings
+from digital_twin.models import Chat, ChatArchive, ChatMessage, Persona
+from digital_twin.schemas.persona import Persona as PersonaSchema
+from digital_twin.services.chat_archive import ChatArchiveService
+from digital_twin.services.persona import PERSONA_CHILDREN
+
+PERSONA_CSV_COLUMNS = ["id", "name", "birthdate", "gender", "nationality", "educations", "occupations", "hobbies"]
+CHAT_CSV_COLUMNS = ["chat_id", "persona_id", "is_active", "message_id", "role", "content", "created_at"]
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _csv_chunk(rows: Iterable[Iterable], header: list[str] | None = None) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _chat_chunk(rows: list[dict], format: str) -> str:
+    if format == "csv":
+        return _csv_chunk([row[c] for c in CHAT_CSV_COLUMNS] for row in rows)
+    return "".join(
+        json.dumps(row | {"created_at": row["created_at"].isoformat()}) + "\n" for row in rows
+    )
+
+
+class ExportService:
+    """Streaming export layer between ORM and API endpoints."""
+
+    @staticmethod
+    async def stream_personas(
+        db: AsyncSession, format: str = "ndjson", batch_size: int = settings.EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[str]:
+        """Personas with their children; in CSV the children are JSON-encoded columns."""
+        result = await db.stream(
+            select(Persona)
+            .options(*PERSONA_CHILDREN)
+            .order_by(Persona.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        if format == "csv":
+            yield _csv_chunk([], header=PERSONA_CSV_COLUMNS)
+
+        async for partition in result.scalars().partitions():
+            personas = [PersonaSchema.model_validate(p).model_dump(mode="json") for p in partition]
+            if format == "csv":
+                yield _csv_chunk(
+                    [p[c] if not isinstance(p[c], list) else json.dumps(p[c]) for c in PERSONA_CSV_COLUMNS]
+                    for p in personas
+                )
+            else:
+                yield "".join(json.dumps(p) + "\n" for p in personas)
+
+    @staticmethod
+    async def stream_user_chats(
+        db: AsyncSession,
+        user_id: int,
+        format: str = "ndjson",
+        batch_size: int = settings.EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[str]:
+        """
+        Every message of the user's chats, one row per message, by chat and
+        id. The archived messages of a chat, older than its hot ones, are read
+        back from Parquet one archive file at a time.
+        """
+        archives = await db.execute(
+            select(ChatArchive.chat_id, Chat.persona_id, Chat.is_active, ChatArchive.path)
+            .join(Chat, Chat.id == ChatArchive.chat_id)
+            .where(Chat.user_id == user_id)
+            .order_by(ChatArchive.chat_id, ChatArchive.first_message_id)
+        )
+        pending = archives.all()
+
+        async def archived(until_chat_id: int | None = None) -> AsyncIterator[str]:
+            """Archived messages of the pending chats up to ``until_chat_id``."""
+            while pending and (until_chat_id is None or pending[0].chat_id <= until_chat_id):
+                archive = pending.pop(0)
+                messages = await ChatArchiveService.read_archive(archive.path)
+                yield _chat_chunk(
+                    [
+                        {
+                            "chat_id": archive.chat_id,
+                            "persona_id": archive.persona_id,
+                            "is_active": archive.is_active,
+                            "message_id": m["id"],
+                            "role": m["role"],
+                            "content": m["content"],
+                            "created_at": m["created_at"],
+                        }
+                        for m in messages
+                    ],
+                    format,
+                )
+
+        result = await db.stream(
+            select(
+                Chat.id.label("chat_id"),
+                Chat.persona_id,
+                Chat.is_active,
+                ChatMessage.id.label("message_id"),
+                ChatMessage.role,
+                ChatMessage.content,
+                ChatMessage.created_at,
+            )
+            .join(ChatMessage, ChatMessage.chat_id == Chat.id)
+            .where(Chat.user_id == user_id)
+            .order_by(Chat.id, ChatMessage.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        if format == "csv":
+            yield _csv_chunk([], header=CHAT_CSV_COLUMNS)
+
+        async for partition in result.partitions():
+            # A batch may span chats, whose archived messages go between them
+            for chat_id, rows in groupby(partition, key=lambda row: row.chat_id):
+                async for chunk in archived(chat_id):
+                    yield chunk
+                yield _chat_chunk([row._asdict() for row in rows], format)
+        async for chunk in archived():
+            yield chunk
@@ -1,8 +1,8 @@
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from digital_twin.models.hobby import Hobby
-from digital_twin.schemas.hobby import HobbyCreate, HobbyUpdate
+from digital_twin.schemas.hobby import HobbyCreate, HobbySync, HobbyUpdate
 from digital_twin.services.persona import PersonaService
 
 
@@ -10,45 +10,70 @@ class HobbyService:
     """Hobby abstraction layer between ORM and API endpoints."""
 
     @staticmethod
-    def create_hobby(db: Session, hobby: HobbyCreate) -> Hobby | None:
+    async def create_hobby(db: AsyncSession, hobby: HobbyCreate) -> Hobby | None:
         new_hobby = Hobby(**hobby.model_dump())
         try:
             db.add(new_hobby)
-            db.commit()
-            db.refresh(new_hobby)
-            
+            await db.commit()
+            await db.refresh(new_hobby)
+
             return new_hobby
         except IntegrityError:
+            await db.rollback()
             return None
 
     @staticmethod
-    def get_hobby(db: Session, hobby_id: int) -> Hobby | None:
-        return db.query(Hobby).filter(Hobby.id == hobby_id).first()
+    async def create_hobbies(
+        db: AsyncSession, hobbies: list[HobbyCreate]
+    ) -> list[Hobby] | None:
+        return await PersonaService.create_children(
+            db, Hobby, [hobby.model_dump() for hobby in hobbies]
+        )
 
     @staticmethod
-    def get_hobbies_by_persona(db: Session, persona_id: int) -> list[Hobby] | None:
-        if not PersonaService.get_persona(db, persona_id):
-            return None
-        return db.query(Hobby).filter(Hobby.persona_id == persona_id).order_by(Hobby.id).all()
+    async def sync_hobbies(
+        db: AsyncSession, persona_id: int, hobbies: list[HobbySync]
+    ) -> list[Hobby] | None:
+        return await PersonaService.sync_children(
+            db, persona_id, Hobby, [hobby.model_dump() for hobby in hobbies]
+        )
 
     @staticmethod
-    def update_hobby(db: Session, id: int, update: HobbyUpdate) -> Hobby | None:
-        hobby = db.query(Hobby).filter(Hobby.id == id).first()
+    async def get_hobby(db: AsyncSession, hobby_id: int) -> Hobby | None:
+        return await db.get(Hobby, hobby_id)
+
+    @staticmethod
+    async def get_hobbies_by_persona(
+        db: AsyncSession, persona_id: int
+    ) -> list[Hobby] | None:
+        return await PersonaService.get_persona_children(
+            db, persona_id, Hobby, Hobby.id
+        )
+
+    @staticmethod
+    async def get_fingerprint_by_persona(db: AsyncSession, persona_id: int) -> tuple[int, ...]:
+        """Fingerprint of the persona's hobbies, without loading them."""
+        return await PersonaService.get_fingerprint(
+            db, persona_id, children=(Hobby,), include_persona=False
+        )
+
+    @staticmethod
+    async def update_hobby(db: AsyncSession, id: int, update: HobbyUpdate) -> Hobby | None:
+        hobby = await db.get(Hobby, id)
         if hobby:
             for k, v in update.model_dump(exclude_unset=True).items():
                 setattr(hobby, k, v)
-            db.commit()
-            db.refresh(hobby)
+            await db.commit()
+            await db.refresh(hobby)
 
         return hobby
 
     @staticmethod
-    def delete_hobby(db: Session, id: int) -> bool:
-        hobby = db.query(Hobby).filter(Hobby.id == id).first()
+    async def delete_hobby(db: AsyncSession, id: int) -> bool:
+        hobby = await db.get(Hobby, id)
         if not hobby:
             return False
 
-        db.delete(hobby)
-        db.commit()
+        await db.delete(hobby)
+        await db.commit()
         return True
-
@@ -6,10 +6,9 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import add_messages
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
 
 from digital_twin.config import settings
-from digital_twin.services.persona import PersonaService
+from digital_twin.models.persona import Persona
 from digital_twin.utils.toolkit import search_tool, travel_recommendation, weather_tool
 
 agent_tools = [search_tool, weather_tool, travel_recommendation]
@@ -136,26 +135,36 @@ def supervisor_agent_factory(agents: Dict[str, callable], persona_map: Dict[str,
     return supervisor_agent
 
 
-def create_supervisor_workflow(db: Session):
-    workflow = StateGraph(SupervisorState)
-
-    personas_from_db = PersonaService.get_personas(db)
+def build_persona_roster(personas: list[Persona]) -> tuple[List[Dict], Dict[str, int]]:
+    """
+    Flattens personas into the dicts the persona agents use.
 
+    The personas must come with their educations, occupations and hobbies
+    already loaded (see PersonaService.get_personas), no queries run here.
+    """
     persona_dicts = []
     persona_map = {}  # nome → id
-    for p in personas_from_db:
+    for p in personas:
         persona_dicts.append({
             "id": p.id,
             "name": p.name,
             "birthdate": p.birthdate.strftime("%Y-%m-%d") if p.birthdate else "Unknown",
             "gender": p.gender or "Not specified",
             "nationality": p.nationality or "Not specified",
-            "educations": [e.level for e in p.educations] if hasattr(p, "educations") else [],
-            "occupations": [o.name for o in p.occupations] if hasattr(p, "occupations") else [],
-            "hobbies": [h.name for h in p.hobbies] if hasattr(p, "hobbies") else [],
+            "educations": [e.level for e in p.educations],
+            "occupations": [o.position for o in p.occupations],
+            "hobbies": [h.name for h in p.hobbies],
         })
         persona_map[p.name] = p.id
 
+    return persona_dicts, persona_map
+
+
+def create_supervisor_workflow(personas_from_db: list[Persona]):
+    workflow = StateGraph(SupervisorState)
+
+    persona_dicts, persona_map = build_persona_roster(personas_from_db)
+
     llm = create_llm()
     agents = {p["name"]: create_persona_agent(p,llm) for p in persona_dicts}
 
@@ -1,10 +1,14 @@
 from datetime import date, datetime
 
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from digital_twin.models.occupation import Occupation
-from digital_twin.schemas.occupation import OccupationCreate, OccupationUpdate
+from digital_twin.schemas.occupation import (
+    OccupationCreate,
+    OccupationSync,
+    OccupationUpdate,
+)
 from digital_twin.services.persona import PersonaService
 
 
@@ -21,52 +25,75 @@ class OccupationService:
     """Occupation abstraction layer between ORM and API endpoints."""
 
     @staticmethod
-    def create_occupation(db: Session, occupation: OccupationCreate) -> Occupation | None:
+    async def create_occupation(
+        db: AsyncSession, occupation: OccupationCreate
+    ) -> Occupation | None:
         new_occupation = Occupation(**occupation.model_dump())
         try:
             db.add(new_occupation)
-            db.commit()
-            db.refresh(new_occupation)  
+            await db.commit()
+            await db.refresh(new_occupation)
 
             return new_occupation
         except IntegrityError:
+            await db.rollback()
             return None
 
 
     @staticmethod
-    def get_occupation(db: Session, id: int) -> Occupation | None:
-        return db.query(Occupation).filter(Occupation.id == id).first()
+    async def create_occupations(
+        db: AsyncSession, occupations: list[OccupationCreate]
+    ) -> list[Occupation] | None:
+        return await PersonaService.create_children(
+            db, Occupation, [occupation.model_dump() for occupation in occupations]
+        )
 
     @staticmethod
-    def get_occupations_by_persona(db: Session, persona_id: int) -> list[Occupation] | None:
-        if not PersonaService.get_persona(db, persona_id):
-            return None
-        return (
-            db.query(Occupation)
-            .filter(Occupation.persona_id == persona_id)
-            .order_by(Occupation.date_started)
-            .all()
+    async def sync_occupations(
+        db: AsyncSession, persona_id: int, occupations: list[OccupationSync]
+    ) -> list[Occupation] | None:
+        return await PersonaService.sync_children(
+            db, persona_id, Occupation, [occupation.model_dump() for occupation in occupations]
+        )
+
+    @staticmethod
+    async def get_occupation(db: AsyncSession, id: int) -> Occupation | None:
+        return await db.get(Occupation, id)
+
+    @staticmethod
+    async def get_occupations_by_persona(
+        db: AsyncSession, persona_id: int
+    ) -> list[Occupation] | None:
+        return await PersonaService.get_persona_children(
+            db, persona_id, Occupation, Occupation.date_started
+        )
+
+    @staticmethod
+    async def get_fingerprint_by_persona(db: AsyncSession, persona_id: int) -> tuple[int, ...]:
+        """Fingerprint of the persona's occupations, without loading them."""
+        return await PersonaService.get_fingerprint(
+            db, persona_id, children=(Occupation,), include_persona=False
         )
 
     @staticmethod
-    def update_occupation(
-        db: Session, id: int, update: OccupationUpdate
+    async def update_occupation(
+        db: AsyncSession, id: int, update: OccupationUpdate
     ) -> Occupation | None:
-        occupation = db.query(Occupation).filter(Occupation.id == id).first()
+        occupation = await db.get(Occupation, id)
         if occupation:
             for k, v in update.model_dump(exclude_unset=True).items():
                 setattr(occupation, k, v)
-            db.commit()
-            db.refresh(occupation)
+            await db.commit()
+            await db.refresh(occupation)
 
         return occupation
 
     @staticmethod
-    def delete_occupation(db: Session, id: int) -> bool:
-        occupation = db.query(Occupation).filter(Occupation.id == id).first()
+    async def delete_occupation(db: AsyncSession, id: int) -> bool:
+        occupation = await db.get(Occupation, id)
         if not occupation:
             return False
 
-        db.delete(occupation)
-        db.commit()
+        await db.delete(occupation)
+        await db.commit()
         return True
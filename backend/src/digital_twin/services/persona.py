@@ -1,59 +1,319 @@
+from sqlalchemy import BigInteger, cast, delete, func, insert, literal, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 
+from digital_twin.models import Education, Hobby, Occupation
 from digital_twin.models.persona import Persona
 from digital_twin.schemas.persona import PersonaCreate, PersonaUpdate
 
+# One extra SELECT ... WHERE persona_id IN (...) per collection, however many
+# personas are loaded, and no cartesian product between the collections.
+PERSONA_CHILDREN = (
+    selectinload(Persona.educations),
+    selectinload(Persona.occupations),
+    selectinload(Persona.hobbies),
+)
+
+
+# Order of the child tables in a fingerprint
+CHILD_MODELS = (Education, Occupation, Hobby)
+
+# Persona collections by name, in CHILD_MODELS order
+PERSONA_RELATIONSHIPS = {
+    "educations": Education,
+    "occupations": Occupation,
+    "hobbies": Hobby,
+}
+
+
+# Row checksums are taken modulo this prime, so every step of their
+# arithmetic stays within a 64-bit integer in SQL
+CHECKSUM_MODULUS = 2_147_483_647
+
+
+def row_checksum(id: int, version: int, persona_id: int) -> int:
+    """Mixes a row's id, version and persona; _checksum_column in Python."""
+    mixed = (id * 1_000_003 + version * 7_919 + persona_id * 104_729) % CHECKSUM_MODULUS
+    return mixed * mixed % CHECKSUM_MODULUS
+
+
+def _checksum_column(model):
+    persona_id = getattr(model, "persona_id", None)
+    mixed = (
+        cast(model.id, BigInteger) * 1_000_003
+        + cast(model.version, BigInteger) * 7_919
+        + (cast(persona_id, BigInteger) if persona_id is not None else literal(0)) * 104_729
+    ) % CHECKSUM_MODULUS
+    return mixed * mixed % CHECKSUM_MODULUS
+
+
+def _fingerprint_columns(model, *where) -> list:
+    return [
+        select(func.count()).select_from(model).where(*where).scalar_subquery(),
+        select(func.coalesce(func.max(model.id), 0)).where(*where).scalar_subquery(),
+        select(func.coalesce(func.sum(model.version), 0)).where(*where).scalar_subquery(),
+        # Postgres sums bigints as numeric, which would not repr like an int
+        select(cast(func.coalesce(func.sum(_checksum_column(model)), 0), BigInteger))
+        .where(*where)
+        .scalar_subquery(),
+    ]
+
+
+def rows_fingerprint(*groups) -> tuple[int, ...]:
+    """
+    Count, highest id, sum of versions and sum of row checksums of each group
+    of rows. The checksums tell apart groups that swapped rows for others
+    with the same count, highest id and versions, e.g. a child deleted and
+    another moved in. It matches PersonaService.get_fingerprint for the same
+    rows.
+    """
+    return tuple(
+        value
+        for rows in groups
+        for value in (
+            len(rows),
+            max((r.id for r in rows), default=0),
+            sum(r.version for r in rows),
+            sum(row_checksum(r.id, r.version, getattr(r, "persona_id", 0)) for r in rows),
+        )
+    )
+
+
+def personas_fingerprint(
+    personas: list[Persona], relationships=tuple(PERSONA_RELATIONSHIPS)
+) -> tuple[int, ...]:
+    """rows_fingerprint of loaded personas and the given collections."""
+    return rows_fingerprint(
+        personas,
+        *([child for p in personas for child in getattr(p, rel)] for rel in relationships),
+    )
+
+
+def persona_filters(nationality: str | None = None, gender: str | None = None) -> list:
+    """WHERE clauses of the persona list filters."""
+    where = []
+    if nationality is not None:
+        where.append(Persona.nationality == nationality)
+    if gender is not None:
+        where.append(Persona.gender == gender)
+    return where
+
 
 class PersonaService:
     """Persona abstraction layer between ORM and API endpoints."""
 
     @staticmethod
-    def create_persona(db: Session, persona: PersonaCreate) -> Persona | None:
+    async def create_persona(db: AsyncSession, persona: PersonaCreate) -> Persona | None:
         new_persona = Persona(**persona.model_dump())
         try:
             db.add(new_persona)
         except IntegrityError:
             return None
-        db.commit()
-        db.refresh(new_persona)
-        return new_persona
-
-    @staticmethod
-    def get_persona(db: Session, id: int) -> Persona | None:
-        return (
-            db.query(Persona)
-            .options(
-                joinedload(Persona.educations),
-                joinedload(Persona.occupations),
-                joinedload(Persona.hobbies),
-            )
+        await db.commit()
+        # Reload with the (empty) collections so the response can serialize them
+        return await PersonaService.get_persona(db, new_persona.id)
+
+    @staticmethod
+    async def get_persona(
+        db: AsyncSession, id: int, relationships=tuple(PERSONA_RELATIONSHIPS)
+    ) -> Persona | None:
+        """Loads a persona with the given collections, one query each."""
+        result = await db.execute(
+            select(Persona)
+            .options(*(selectinload(getattr(Persona, r)) for r in relationships))
             .filter(Persona.id == id)
-            .first()
         )
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_personas(
+        db: AsyncSession,
+        limit: int | None = None,
+        cursor: int | None = None,
+        filters=(),
+        columns: list[str] | None = None,
+        relationships=tuple(PERSONA_RELATIONSHIPS),
+    ) -> list[Persona]:
+        """
+        Loads personas by id, with one query per collection. Without a limit
+        it is the full roster. ``cursor`` starts after that persona id,
+        ``columns`` loads only those attributes (plus id and version) and
+        ``relationships`` selects the collections.
+        """
+        query = select(Persona).where(*filters).order_by(Persona.id)
+        if cursor is not None:
+            query = query.where(Persona.id > cursor)
+        if limit is not None:
+            query = query.limit(limit)
+        if columns is not None:
+            query = query.options(
+                load_only(*(getattr(Persona, c) for c in columns), Persona.version)
+            )
+        query = query.options(*(selectinload(getattr(Persona, r)) for r in relationships))
+
+        result = await db.execute(query)
+        return list(result.scalars())
+
+    @staticmethod
+    async def count_personas(db: AsyncSession, filters=()) -> int:
+        return await db.scalar(select(func.count()).select_from(Persona).where(*filters))
+
+    @staticmethod
+    async def get_page_fingerprint(
+        db: AsyncSession,
+        limit: int,
+        cursor: int | None = None,
+        filters=(),
+        relationships=tuple(PERSONA_RELATIONSHIPS),
+    ) -> tuple[int, ...]:
+        """
+        Persona count matching ``filters``, followed by the fingerprint of one
+        page of them and their collections, in one query. Matches the count
+        plus personas_fingerprint of the same page loaded by get_personas.
+        """
+        page = select(Persona.id).where(*filters).order_by(Persona.id).limit(limit)
+        if cursor is not None:
+            page = page.where(Persona.id > cursor)
+
+        columns = [select(func.count()).select_from(Persona).where(*filters).scalar_subquery()]
+        columns += _fingerprint_columns(Persona, Persona.id.in_(page))
+        for relationship in relationships:
+            model = PERSONA_RELATIONSHIPS[relationship]
+            columns += _fingerprint_columns(model, model.persona_id.in_(page))
+
+        result = await db.execute(select(*columns))
+        return tuple(result.one())
+
+    @staticmethod
+    async def get_fingerprint(
+        db: AsyncSession,
+        persona_id: int | None = None,
+        children=CHILD_MODELS,
+        include_persona: bool = True,
+    ) -> tuple[int, ...]:
+        """
+        Fingerprint of the persona(s) and their children in one query, without
+        loading them; see rows_fingerprint.
+        """
+        columns = []
+        if include_persona:
+            where = (Persona.id == persona_id,) if persona_id is not None else ()
+            columns += _fingerprint_columns(Persona, *where)
+        for model in children:
+            if persona_id is not None:
+                columns += _fingerprint_columns(model, model.persona_id == persona_id)
+            else:
+                columns += _fingerprint_columns(model, model.persona_id.is_not(None))
+
+        result = await db.execute(select(*columns))
+        return tuple(result.one())
+
+    @staticmethod
+    async def get_persona_children(db: AsyncSession, persona_id: int, model, *order_by):
+        """
+        Loads one child collection of a persona in a single query. The outer
+        join keeps the persona row when it has no children, so ``None`` means
+        the persona does not exist and ``[]`` that it has no rows.
+        """
+        result = await db.execute(
+            select(Persona.id, model)
+            .outerjoin(model, model.persona_id == Persona.id)
+            .where(Persona.id == persona_id)
+            .order_by(*order_by)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+        return [child for _, child in rows if child is not None]
 
     @staticmethod
-    def get_personas(db: Session) -> list[Persona]:
-        return db.query(Persona).order_by(Persona.id).all()
+    async def create_children(db: AsyncSession, model, items: list[dict]) -> list | None:
+        """
+        Inserts child rows of any personas in one transaction. Returns
+        ``None``, inserting nothing, when one of the personas does not exist.
+        """
+        persona_ids = {item["persona_id"] for item in items}
+        found = await db.scalars(select(Persona.id).where(Persona.id.in_(persona_ids)))
+        if set(found) != persona_ids:
+            return None
+
+        try:
+            result = await db.scalars(
+                insert(model).returning(model, sort_by_parameter_order=True), items
+            )
+            children = result.all()
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return None
+        return children
+
+    @staticmethod
+    async def sync_children(db: AsyncSession, persona_id: int, model, items: list[dict]) -> list | None:
+        """
+        Makes ``items`` the full child collection of a persona in one
+        transaction: items with an id update that row, only where a field
+        changed, items without one are inserted and rows not listed are
+        deleted. Returns the collection by id, or ``None`` when the persona
+        does not exist. Raises ValueError on ids the persona does not own.
+        """
+        current = await PersonaService.get_persona_children(db, persona_id, model, model.id)
+        if current is None:
+            return None
+
+        by_id = {child.id: child for child in current}
+        ids = [item["id"] for item in items if item.get("id") is not None]
+        unknown = set(ids) - set(by_id)
+        if unknown:
+            raise ValueError(f"Unknown ids for persona {persona_id}: {sorted(unknown)}")
+        if len(ids) != len(set(ids)):
+            raise ValueError("Duplicate ids")
+
+        kept, new = [], []
+        for item in items:
+            values = {k: v for k, v in item.items() if k != "id"}
+            child = by_id.get(item.get("id"))
+            if child is None:
+                new.append(values | {"persona_id": persona_id})
+                continue
+            for k, v in values.items():
+                if getattr(child, k) != v:
+                    setattr(child, k, v)
+            kept.append(child)
+
+        removed = set(by_id) - set(ids)
+        if removed:
+            await db.execute(delete(model).where(model.id.in_(removed)))
+        # Flushes the updates before the insert, one statement for all new rows
+        created = []
+        if new:
+            result = await db.scalars(
+                insert(model).returning(model, sort_by_parameter_order=True), new
+            )
+            created = result.all()
+        await db.commit()
+        return sorted(kept + created, key=lambda child: child.id)
 
     @staticmethod
-    def update_persona(db: Session, id: int, update: PersonaUpdate) -> Persona | None:
-        persona = db.query(Persona).filter(Persona.id == id).first()
+    async def update_persona(
+        db: AsyncSession, id: int, update: PersonaUpdate
+    ) -> Persona | None:
+        persona = await PersonaService.get_persona(db, id)
         if not persona:
             return None
 
         for k, v in update.model_dump(exclude_unset=True).items():
             setattr(persona, k, v)
 
-        db.commit()
-        db.refresh(persona)
+        await db.commit()
         return persona
 
     @staticmethod
-    def delete_persona(db: Session, id: int) -> bool:
-        persona = db.query(Persona).filter(Persona.id == id).first()
+    async def delete_persona(db: AsyncSession, id: int) -> bool:
+        persona = await db.get(Persona, id)
         if not persona:
             return False
-        db.delete(persona)
-        db.commit()
+        await db.delete(persona)
+        await db.commit()
         return True
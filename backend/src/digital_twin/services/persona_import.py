@@ -0,0 +1,158 @@
+"""
+Bulk persona import.
+
+Personas and their nested educations, occupations and hobbies are validated
+up front and inserted chunk by chunk: one multi-row INSERT ... RETURNING for
+the personas and one executemany per child table, committed once per chunk.
+
+Also usable from the command line, e.g.
+
+    uv run persona-import personas.ndjson --chunk-size 1000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from digital_twin.config import settings
+from digital_twin.database import AsyncSessionLocal, async_engine
+from digital_twin.models import Education, Hobby, Occupation, Persona
+from digital_twin.schemas.persona import PersonaBase, PersonaImport, PersonaImportResult
+
+PERSONA_FIELDS = set(PersonaBase.model_fields)
+CHILD_TABLES = (
+    ("educations", Education),
+    ("occupations", Occupation),
+    ("hobbies", Hobby),
+)
+
+persona_list_adapter = TypeAdapter(list[PersonaImport])
+
+
+class ImportValidationError(Exception):
+    """Raised with every validation error found in an import payload."""
+
+    def __init__(self, errors: list[dict]):
+        super().__init__(f"{len(errors)} invalid personas")
+        self.errors = errors
+
+
+class PersonaImportService:
+    """Bulk persona import layer between ORM and API endpoints."""
+
+    @staticmethod
+    def parse(payload: bytes | str, ndjson: bool = False) -> list[PersonaImport]:
+        """
+        Validates a JSON array or NDJSON payload in a single pass, collecting
+        the errors of every record instead of stopping at the first one.
+        """
+        if not ndjson:
+            try:
+                return persona_list_adapter.validate_json(payload)
+            except ValidationError as e:
+                raise ImportValidationError(e.errors(include_url=False, include_context=False, include_input=False))
+
+        if isinstance(payload, bytes):
+            try:
+                payload = payload.decode()
+            except UnicodeDecodeError as e:
+                raise ImportValidationError(
+                    [{"type": "utf8", "loc": (), "msg": f"Invalid UTF-8 at byte {e.start}: {e.reason}"}]
+                )
+
+        personas, errors = [], []
+        lines = payload.splitlines()
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                personas.append(PersonaImport.model_validate_json(line))
+            except ValidationError as e:
+                errors.extend(
+                    {**error, "line": number}
+                    for error in e.errors(include_url=False, include_context=False, include_input=False)
+                )
+        if errors:
+            raise ImportValidationError(errors)
+        return personas
+
+    @staticmethod
+    async def import_personas(
+        db: AsyncSession,
+        personas: list[PersonaImport],
+        chunk_size: int = settings.PERSONA_IMPORT_CHUNK_SIZE,
+    ) -> PersonaImportResult:
+        counts = {"personas": 0} | {name: 0 for name, _ in CHILD_TABLES}
+        chunks = 0
+        start = time.perf_counter()
+
+        for offset in range(0, len(personas), chunk_size):
+            chunk = personas[offset:offset + chunk_size]
+            result = await db.execute(
+                insert(Persona).returning(Persona.id, sort_by_parameter_order=True),
+                [persona.model_dump(include=PERSONA_FIELDS) for persona in chunk],
+            )
+            persona_ids = result.scalars().all()
+
+            for name, model in CHILD_TABLES:
+                rows = [
+                    child.model_dump() | {"persona_id": persona_id}
+                    for persona_id, persona in zip(persona_ids, chunk)
+                    for child in getattr(persona, name)
+                ]
+                if rows:
+                    await db.execute(insert(model), rows)
+                counts[name] += len(rows)
+
+            await db.commit()
+            counts["personas"] += len(chunk)
+            chunks += 1
+
+        seconds = time.perf_counter() - start
+        rows = sum(counts.values())
+        return PersonaImportResult(
+            **counts,
+            chunks=chunks,
+            seconds=round(seconds, 3),
+            rows_per_second=round(rows / seconds, 1) if seconds else 0.0,
+        )
+
+
+async def _import_file(path: str, chunk_size: int) -> PersonaImportResult:
+    if path == "-":
+        payload = sys.stdin.buffer.read()
+    else:
+        payload = Path(path).read_bytes()
+    ndjson = path.endswith((".ndjson", ".jsonl"))
+
+    personas = PersonaImportService.parse(payload, ndjson=ndjson)
+    try:
+        async with AsyncSessionLocal() as db:
+            return await PersonaImportService.import_personas(db, personas, chunk_size)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import personas from JSON or NDJSON.")
+    parser.add_argument("path", help="JSON array, or .ndjson/.jsonl file; '-' reads a JSON array from stdin")
+    parser.add_argument("--chunk-size", type=int, default=settings.PERSONA_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    try:
+        result = asyncio.run(_import_file(args.path, args.chunk_size))
+    except ImportValidationError as e:
+        print(json.dumps(e.errors, indent=2, default=str), file=sys.stderr)
+        sys.exit(1)
+    print(result.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
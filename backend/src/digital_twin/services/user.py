@@ -1,6 +1,9 @@
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from digital_twin.models.chat import Chat
 from digital_twin.models.user import User
 from digital_twin.schemas.user import UserCreate, UserLogin
 from digital_twin.utils.security import hash_password, verify_password
@@ -10,53 +13,46 @@ class UserService:
     """User abstraction layer between ORM and API endpoints."""
 
     @staticmethod
-    def add_user(db: Session, user: UserCreate) -> User | None:
-        user.password = hash_password(user.password)
-
-        new_user = User(**user.model_dump())
-
-        if UserService.get_user_email(db, new_user.email):
+    async def add_user(db: AsyncSession, user: UserCreate) -> User | None:
+        if await UserService.get_user_email(db, user.email):
             return None
         else:
+            # Only pay for the hash once the email is known to be free
+            user.password = await hash_password(user.password)
+            new_user = User(**user.model_dump())
             try:
                 db.add(new_user)
             except IntegrityError:
                 return None
-            db.commit()
-            db.refresh(new_user)
+            await db.commit()
+            await db.refresh(new_user)
             return new_user
 
     @staticmethod
-    def authenticate_user(db: Session, user: UserLogin) -> User | bool:
-        new_user = UserService.get_user_email(db, user.email)
+    async def authenticate_user(db: AsyncSession, user: UserLogin) -> User | bool:
+        new_user = await UserService.get_user_email(db, user.email)
 
-        if not new_user or not verify_password(user.password, new_user.password):
+        if not new_user or not await verify_password(user.password, new_user.password):
             return False
 
         return new_user
 
     @staticmethod
-    def get_user_email(db: Session, email: str) -> User | None:
-        return (
-            db.query(User)
-            .options(
-                joinedload(User.chats),
-            )
-            .filter(User.email == email)
-            .first()
-        )
+    async def get_user_email(db: AsyncSession, email: str) -> User | None:
+        result = await db.execute(select(User).filter(User.email == email))
+        return result.scalars().first()
 
     @staticmethod
-    def get_user(db: Session, id: int) -> User | None:
-        return (
-            db.query(User)
-            .options(
-                joinedload(User.chats),
-            )
+    async def get_user(db: AsyncSession, id: int) -> User | None:
+        """Loads a user with its chats and their messages, as the profile returns them."""
+        result = await db.execute(
+            select(User)
+            .options(selectinload(User.chats).selectinload(Chat.messages))
             .filter(User.id == id)
-            .first()
         )
+        return result.scalars().first()
 
     @staticmethod
-    def get_users(db: Session) -> list[User]:
-        return db.query(User).order_by(User.id).all()
+    async def get_users(db: AsyncSession) -> list[User]:
+        result = await db.execute(select(User).order_by(User.id))
+        return list(result.scalars())
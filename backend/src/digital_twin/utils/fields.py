@@ -0,0 +1,33 @@
+"""
+Sparse fieldsets (``?fields=id,name``) for list endpoints.
+"""
+
+from functools import lru_cache
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+
+def parse_fields(fields: str, schema: type[BaseModel]) -> frozenset[str]:
+    """
+    Field names requested in a comma-separated ``fields`` parameter, always
+    including ``id``. Raises ValueError on names the schema does not have.
+    """
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return frozenset(requested | {"id"})
+
+
+@lru_cache(maxsize=128)
+def sparse_schema(schema: type[BaseModel], fields: frozenset[str]) -> type[BaseModel]:
+    """Copy of ``schema`` with only ``fields``, reading only those attributes."""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (info.annotation, info)
+            for name, info in schema.model_fields.items()
+            if name in fields
+        },
+    )
@@ -0,0 +1,142 @@
+"""
+Argon2 password hashing on a dedicated, bounded process pool.
+
+Argon2 is deliberately CPU- and memory-heavy; running it in worker processes
+keeps a burst of logins from starving the event loop and the threadpool
+that serve every other endpoint.
+
+Workers must not import digital_twin, which builds the engines and the whole
+app. Jobs are therefore bound methods of a pwdlib hasher, which unpickle by
+importing pwdlib and argon2 alone, and workers are spawned without re-running
+the parent's __main__ (the digital-twin console script imports the app).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable
+
+from fastapi.concurrency import run_in_threadpool
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+
+def build_hasher(time_cost: int, memory_cost: int, parallelism: int) -> PasswordHash:
+    return PasswordHash(
+        (Argon2Hasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism),)
+    )
+
+
+@contextmanager
+def _bare_main():
+    """Processes spawned meanwhile skip re-running the parent's __main__."""
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class PoolBusyError(Exception):
+    """Raised when the pool already holds its maximum of pending jobs."""
+
+
+class PasswordHashPool:
+    """
+    Runs hashing jobs on ``workers`` processes, rejecting new jobs once
+    ``max_pending`` are queued or running. With ``workers=0`` jobs run on
+    the threadpool instead (development and tests).
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_pending: int,
+        time_cost: int,
+        memory_cost: int,
+        parallelism: int,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        # A few hundred bytes to pickle with each job, nothing next to Argon2
+        self._hasher = build_hasher(time_cost, memory_cost, parallelism)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers do not inherit the server's threads and locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        # The executor spawns its workers on demand, from submit
+        with _bare_main():
+            return self._get_executor().submit(fn, *args)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PoolBusyError(f"{self.pending} password hashing jobs pending")
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+
+        start = time.perf_counter()
+        try:
+            if self.workers == 0:
+                return await run_in_threadpool(fn, *args)
+            return await asyncio.wrap_future(self._submit(fn, *args))
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+                self.total_seconds += time.perf_counter() - start
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._hasher.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self._hasher.verify, password, hashed_password)
+
+    async def start(self) -> None:
+        """Starts the workers up front so the first login does not pay for it."""
+        if self.workers == 0:
+            return
+        await asyncio.gather(
+            *(asyncio.wrap_future(self._submit(os.getpid)) for _ in range(self.workers))
+        )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_ms": round(self.total_seconds / self.completed * 1000, 3) if self.completed else 0.0,
+        }
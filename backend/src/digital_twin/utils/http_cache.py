@@ -0,0 +1,41 @@
+"""
+ETag and conditional GET helpers.
+"""
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+from digital_twin.config import settings
+
+
+def make_etag(fingerprint: tuple) -> str:
+    """
+    Weak ETag for a resource fingerprint (row counts, ids and versions). It
+    identifies the data, not the bytes, which differ when the body is gzipped.
+    """
+    return 'W/"' + hashlib.sha256(repr(fingerprint).encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = (
+        f"private, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate"
+    )
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag)
+    return response
@@ -1,18 +1,288 @@
+"""
+Export of API and chat events to the lakehouse.
+
+export_data only queues the event. A background thread writes the queued
+events in batches, once LAKEHOUSE_EXPORT_BATCH_SIZE are waiting or every
+LAKEHOUSE_EXPORT_FLUSH_SECONDS, to files of their own process, so workers
+never append to the same file:
+
+- "json" appends JSON lines to ``<table>/<date>-<pid>.json``, converted to
+  Parquet later by LakehouseManager.convert_json_to_partitioned_parquet.
+- "parquet" keeps the events of each table, day and event prefix in memory
+  and writes them as a Parquet segment, already partitioned like the
+  conversion's output (``<table>/date=<date>/event_prefix=<prefix>/``),
+  once LAKEHOUSE_SEGMENT_ROWS are buffered or the oldest is
+  LAKEHOUSE_SEGMENT_SECONDS old. Segments are written aside and renamed,
+  so readers only see complete files, and LakehouseManager.compact_segments
+  merges them.
+
+The queue is bounded. When it is full the event is dropped, or with the
+"block" policy the caller first waits up to LAKEHOUSE_EXPORT_BLOCK_SECONDS
+for room (on the event loop, so keep it short).
+"""
+
+import atexit
 import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
 from datetime import date
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
+
+from digital_twin.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Queue markers: write what is queued now, or write it and stop
+_FLUSH = object()
+_STOP = object()
+
+
+def event_prefix(event: Any) -> str:
+    """Partition of an event, the first word of its name as in the conversion."""
+    return event.split("_")[0] if isinstance(event, str) else "unknown"
+
+
+def arrow_table(rows: list[dict[str, Any]]):
+    """
+    Columns of every key found in the rows. Columns mixing types the Arrow
+    inference rejects are stored as JSON strings.
+    """
+    import pyarrow as pa
+
+    names = dict.fromkeys(name for row in rows for name in row)
+    columns = {}
+    for name in names:
+        values = [row.get(name) for row in rows]
+        try:
+            columns[name] = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            columns[name] = pa.array(
+                [None if v is None else json.dumps(v, default=str) for v in values]
+            )
+    return pa.table(columns)
+
+
+class LakehouseExporter:
+    """Bounded in-memory queue of events written by one thread per process."""
+
+    def __init__(
+        self,
+        base_path: Path,
+        queue_size: int,
+        batch_size: int,
+        flush_seconds: float,
+        policy: Literal["drop", "block"] = "drop",
+        block_seconds: float = 0.0,
+        format: Literal["json", "parquet"] = "json",
+        segment_rows: int = 50_000,
+        segment_seconds: float = 300.0,
+    ):
+        self.base_path = Path(base_path)
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.policy = policy
+        self.block_seconds = block_seconds
+        self.format = format
+        self.segment_rows = segment_rows
+        self.segment_seconds = segment_seconds
+
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+        # Process that started the writer; a forked worker starts its own
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+        self._directories: set[Path] = set()
+        # Open segments by (table, day, event prefix): rows and when the first arrived
+        self._segments: dict[tuple[str, date, str], tuple[list[dict], float]] = {}
+        self._segment_sequence = 0
+
+        self.peak_depth = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.segments = 0
+
+    def _ensure_started(self) -> queue.Queue:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue(self.queue_size)
+                    self._thread = threading.Thread(
+                        target=self._run, args=(self._queue,), name="lakehouse-export", daemon=True
+                    )
+                    self._thread.start()
+                    self._pid = os.getpid()
+        return self._queue
+
+    def export(self, table: str, data: dict[str, Any]) -> bool:
+        """Queues one event. Returns False when it was dropped."""
+        events = self._ensure_started()
+        try:
+            if self.policy == "block":
+                events.put((table, date.today(), data), timeout=self.block_seconds)
+            else:
+                events.put_nowait((table, date.today(), data))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+        self.peak_depth = max(self.peak_depth, events.qsize())
+        return True
+
+    def _run(self, events: queue.Queue) -> None:
+        while True:
+            # Wakes up every flush interval even when idle, so segments roll on time
+            batch = []
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size and not (batch and batch[-1] in (_FLUSH, _STOP)):
+                try:
+                    batch.append(events.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+            marker = batch[-1] if batch and batch[-1] in (_FLUSH, _STOP) else None
+            try:
+                self._write(
+                    [item for item in batch if item not in (_FLUSH, _STOP)], final=marker is not None
+                )
+            except Exception:
+                # The writer must outlive a bad batch, or flush and close would wait forever
+                logger.exception("Could not export a batch of %d events", len(batch))
+            finally:
+                for _ in batch:
+                    events.task_done()
+            if marker is _STOP:
+                return
+
+    def _write(self, batch: list[tuple[str, date, dict[str, Any]]], final: bool = False) -> None:
+        if self.format == "parquet":
+            self._write_segments(batch, final)
+        else:
+            self._write_lines(batch)
+
+    def _write_lines(self, batch: list[tuple[str, date, dict[str, Any]]]) -> None:
+        """Appends the batch with one open and write per file."""
+        if not batch:
+            return
+
+        lines = defaultdict(list)
+        for table, day, data in batch:
+            lines[table, day].append(json.dumps(data, default=str) + "\n")
+
+        for (table, day), table_lines in lines.items():
+            directory = self.base_path / table
+            try:
+                if directory not in self._directories:
+                    directory.mkdir(parents=True, exist_ok=True)
+                    self._directories.add(directory)
+                with (directory / f"{day.isoformat()}-{os.getpid()}.json").open("a") as fp:
+                    fp.write("".join(table_lines))
+            except OSError:
+                logger.exception("Could not export %d %s events", len(table_lines), table)
+                with self._lock:
+                    self.dropped += len(table_lines)
+                continue
+            with self._lock:
+                self.written += len(table_lines)
+        self.flushes += 1
+
+    def _write_segments(self, batch: list[tuple[str, date, dict[str, Any]]], final: bool) -> None:
+        """
+        Buffers the batch in its segments and writes those that are full or
+        old enough, or all of them when ``final``.
+        """
+        now = time.monotonic()
+        for table, day, data in batch:
+            key = (table, day, event_prefix(data.get("event")))
+            rows = self._segments.setdefault(key, ([], now))[0]
+            rows.append(data)
+            if len(rows) >= self.segment_rows:
+                del self._segments[key]
+                self._write_segment(*key, rows)
+
+        for key, (rows, opened) in list(self._segments.items()):
+            if final or now - opened >= self.segment_seconds:
+                del self._segments[key]
+                self._write_segment(*key, rows)
+
+    def _write_segment(self, table: str, day: date, prefix: str, rows: list[dict[str, Any]]) -> None:
+        import pyarrow.parquet as pq
+
+        directory = self.base_path / table / f"date={day.isoformat()}" / f"event_prefix={prefix}"
+        self._segment_sequence += 1
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{self._segment_sequence}.parquet"
+        path = directory / name
+        staging = directory / f".{name}.tmp"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            pq.write_table(arrow_table(rows), staging)
+            os.replace(staging, path)
+        except Exception:
+            logger.exception("Could not write a segment of %d %s events", len(rows), table)
+            staging.unlink(missing_ok=True)
+            with self._lock:
+                self.dropped += len(rows)
+            return
+        with self._lock:
+            self.written += len(rows)
+            self.segments += 1
+
+    def flush(self) -> None:
+        """Blocks until every event queued so far is written, closing open segments."""
+        if self._pid == os.getpid():
+            self._queue.put(_FLUSH)
+            self._queue.join()
+
+    def close(self) -> None:
+        """Writes the queued events and stops the writer, e.g. on shutdown."""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            events, thread, self._pid = self._queue, self._thread, None
+        events.put(_STOP)
+        thread.join()
+
+    def stats(self) -> dict[str, Any]:
+        running = self._pid == os.getpid()
+        return {
+            "policy": self.policy,
+            "queue_size": self.queue_size,
+            "depth": self._queue.qsize() if running else 0,
+            "peak_depth": self.peak_depth,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "format": self.format,
+            "segments": self.segments,
+            "buffered": sum(len(rows) for rows, _ in list(self._segments.values())),
+        }
+
+
+exporter = LakehouseExporter(
+    settings.LAKEHOUSE_EXPORT_PATH,
+    queue_size=settings.LAKEHOUSE_EXPORT_QUEUE_SIZE,
+    batch_size=settings.LAKEHOUSE_EXPORT_BATCH_SIZE,
+    flush_seconds=settings.LAKEHOUSE_EXPORT_FLUSH_SECONDS,
+    policy=settings.LAKEHOUSE_EXPORT_POLICY,
+    block_seconds=settings.LAKEHOUSE_EXPORT_BLOCK_SECONDS,
+    format=settings.LAKEHOUSE_EXPORT_FORMAT,
+    segment_rows=settings.LAKEHOUSE_SEGMENT_ROWS,
+    segment_seconds=settings.LAKEHOUSE_SEGMENT_SECONDS,
+)
+# Scripts exporting events have no lifespan to close it
+atexit.register(exporter.close)
 
-base_path = Path("./lakehouse_data")
-base_path.mkdir(exist_ok=True)
 
 def export_data(table: str, data: dict[str, Any]):
     # Stamp time if not done
     if not data.get("timestamp", None):
         data["timestamp"] = date.today().isoformat()
 
-    # Get json file and write data
-    file = base_path / table / f"{date.today().isoformat()}.json"
-    file.parent.mkdir(exist_ok=True)
-    with file.open("a") as fp:
-        fp.write(f"{json.dumps(data)}\n")
+    exporter.export(table, data)
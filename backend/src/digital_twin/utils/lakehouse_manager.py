@@ -10,6 +10,7 @@ import duckdb
 import pandas as pd
 from sqlalchemy import text
 
+from digital_twin.config import settings
 from digital_twin.database import engine
 
 storage_base_path = "/app/lakehouse_data"
@@ -169,6 +170,79 @@ class LakehouseManager:
         return parquet_path
 
 
+    def compact_segments(self, source_folder, target_folder, table_name) -> list[Path]:
+        """
+        Merges the Parquet segments written by the exporter (LAKEHOUSE_EXPORT_FORMAT
+        "parquet") into one file per date and event_prefix partition, together
+        with the file of an earlier compaction, and deletes what it merged.
+        Segments are already partitioned, so nothing is parsed again.
+
+        A crash between writing a compacted file and deleting its inputs
+        leaves those rows twice; segments written meanwhile wait for the next run.
+        """
+        source = Path(source_folder)
+        target = Path(target_folder) / table_name
+        partitions = sorted({p.parent for p in source.glob("date=*/event_prefix=*/*.parquet")})
+
+        compacted = []
+        for partition in partitions:
+            directory = target / partition.relative_to(source)
+            directory.mkdir(parents=True, exist_ok=True)
+            inputs = sorted(directory.glob("*.parquet")) + sorted(partition.glob("*.parquet"))
+
+            path = directory / f"part-{uuid.uuid4().hex}.parquet"
+            staging = directory / f".{path.name}.tmp"
+            con = self.duckdb_conn.cursor()
+            try:
+                # Segments of different events may not have the same columns
+                con.execute(
+                    f"COPY (SELECT * FROM read_parquet(?, union_by_name = true, hive_partitioning = false)) "
+                    f"TO '{staging}' (FORMAT PARQUET)",
+                    [[str(p) for p in inputs]],
+                )
+            finally:
+                con.close()
+            os.replace(staging, path)
+            for p in inputs:
+                p.unlink()
+            compacted.append(path)
+
+        print(f"Compacted {len(partitions)} partitions of {table_name} into {target}")
+        return compacted
+
+    def write_parquet(self, records: list[dict], relative_path: str) -> Path:
+        """
+        Writes records to a Parquet file under the storage path. The file is
+        written aside and renamed, so readers never see a partial file.
+        """
+        path = self.storage_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f".{path.name}.tmp")
+
+        con = self.duckdb_conn.cursor()
+        try:
+            con.register("records", pd.DataFrame.from_records(records))
+            con.execute(f"COPY records TO '{staging}' (FORMAT PARQUET)")
+        finally:
+            con.close()
+        os.replace(staging, path)
+        return path
+
+    def query_parquet(self, relative_paths: list[str], query: str, params: list | None = None) -> list[dict]:
+        """
+        Runs a DuckDB query over Parquet files under the storage path, bound
+        as the first parameter (``read_parquet(?)``). Returns rows as dicts.
+        """
+        paths = [str(self.storage_path / p) for p in relative_paths]
+        # Cursors are DuckDB's per-thread connections to the same database
+        con = self.duckdb_conn.cursor()
+        try:
+            result = con.execute(query, [paths, *(params or [])])
+            columns = [c[0] for c in result.description]
+            return [dict(zip(columns, row)) for row in result.fetchall()]
+        finally:
+            con.close()
+
     def update_metadata(self, table_name, path, columns):
         # Update Postgres metadata table
         with self.metadata_engine.connect() as conn:
@@ -180,13 +254,19 @@ class LakehouseManager:
 def main():
     manager = LakehouseManager(storage_base_path)
 
-    manager.convert_json_to_partitioned_parquet(
+    # Parquet segments only need merging, JSON lines a full conversion
+    if settings.LAKEHOUSE_EXPORT_FORMAT == "parquet":
+        convert = manager.compact_segments
+    else:
+        convert = manager.convert_json_to_partitioned_parquet
+
+    convert(
         "/app/lakehouse_data/chat",
         "/app/lakehouse_data/parquet_data",
         "chat_history"
     )
 
-    manager.convert_json_to_partitioned_parquet(
+    convert(
         "/app/lakehouse_data/endpoints",
         "/app/lakehouse_data/parquet_data",
         "endpoint_logs"
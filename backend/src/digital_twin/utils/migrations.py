@@ -0,0 +1,78 @@
+"""
+Alembic upgrade on application startup.
+
+Every worker checks the database revision against the migration scripts and
+only upgrades when they differ. On Postgres the upgrade runs under an
+advisory lock, so with several workers booting at once one migrates and the
+others wait for it, then find the database at head.
+"""
+
+import logging
+
+import alembic.command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Connection, Engine, text
+
+from digital_twin.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key of the pg_advisory_lock held while migrating
+MIGRATION_LOCK_ID = 0x6469_6774_7769_6E
+
+ALEMBIC_INI = "./alembic.ini"
+
+
+def is_at_head(connection: Connection, script: ScriptDirectory) -> bool:
+    """Whether the database revision matches the head(s) of the migration scripts."""
+    current = MigrationContext.configure(connection).get_current_heads()
+    return set(current) == set(script.get_heads())
+
+
+def upgrade_to_head(engine: Engine, config: Config | None = None) -> bool:
+    """
+    Upgrades the database to head unless it is already there. Returns
+    whether an upgrade ran.
+    """
+    config = config or Config(ALEMBIC_INI)
+    script = ScriptDirectory.from_config(config)
+
+    with engine.connect() as connection:
+        postgres = connection.dialect.name == "postgresql"
+        if is_at_head(connection, script):
+            return False
+
+        if postgres:
+            # Waiting for the lock or migrating may take longer than the
+            # request statement timeout
+            connection.exec_driver_sql("SET statement_timeout = 0")
+            connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            connection.commit()
+        try:
+            # Another worker may have migrated while this one waited
+            if postgres and is_at_head(connection, script):
+                return False
+            connection.commit()
+
+            # env.py migrates on this connection, so under the lock
+            config.attributes["connection"] = connection
+            alembic.command.upgrade(config, "head")
+            connection.commit()
+            logger.info("Database upgraded to %s", ", ".join(script.get_heads()))
+            return True
+        finally:
+            if postgres:
+                connection.rollback()
+                connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+                connection.exec_driver_sql("RESET statement_timeout")
+                connection.commit()
+
+
+def migrate_on_startup(engine: Engine) -> bool:
+    """upgrade_to_head, unless APP_AUTO_MIGRATE is off."""
+    if not settings.AUTO_MIGRATE:
+        logger.info("Skipping migrations, APP_AUTO_MIGRATE is off")
+        return False
+    return upgrade_to_head(engine)
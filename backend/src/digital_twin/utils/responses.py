@@ -0,0 +1,46 @@
+"""
+Fast JSON responses for large payloads (persona pages, chat histories).
+
+FastAPI validates a route's result against its response model, turns it into
+plain Python objects with ``jsonable_encoder`` and only then encodes them with
+``json.dumps``. Routes that return a PydanticJSONResponse instead validate and
+serialize the rows in Pydantic's Rust core, straight to bytes. The route keeps
+its response model or return annotation for the OpenAPI schema.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+
+@lru_cache(maxsize=256)
+def type_adapter(schema: Any) -> TypeAdapter:
+    """Building a TypeAdapter compiles its validator and serializer, so reuse them."""
+    return TypeAdapter(schema)
+
+
+class PydanticJSONResponse(Response):
+    """
+    JSON response of ``content`` (ORM rows, dicts or models) as ``schema``,
+    e.g. ``PydanticJSONResponse(messages, list[ChatMessage])``.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        schema: Any,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        self.schema = schema
+        super().__init__(content, status_code, headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        adapter = type_adapter(self.schema)
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
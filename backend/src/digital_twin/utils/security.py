@@ -4,21 +4,43 @@ from typing import Annotated
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from pwdlib import PasswordHash
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from digital_twin.config import settings
-from digital_twin.database import get_db
+from digital_twin.database import get_async_db
 from digital_twin.models.user import User
-from digital_twin.schemas.user import TokenData
+from digital_twin.schemas.user import CurrentUser, TokenData
+from digital_twin.utils.cache import TTLCache
+from digital_twin.utils.hashing import PasswordHashPool, PoolBusyError
 
-password_hash = PasswordHash.recommended()
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
 
-def verify_password(plain_password: str, hashed_password: str):
-    return password_hash.verify(plain_password, hashed_password)
+def pool_busy_exception() -> HTTPException:
+    """A new exception per raise, as raising one instance mutates its traceback."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests. Try again shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await password_pool.verify(plain_password, hashed_password)
+    except PoolBusyError:
+        raise pool_busy_exception()
 
-def hash_password(password: str):
-    return password_hash.hash(password)
+async def hash_password(password: str) -> str:
+    try:
+        return await password_pool.hash(password)
+    except PoolBusyError:
+        raise pool_busy_exception()
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
@@ -32,27 +54,62 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
-def get_current_user(
+# Short-lived caches so authenticated requests skip the JWT decode and the
+# user lookup; both are per process.
+token_cache = TTLCache(settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+principal_cache = TTLCache(settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+def decode_token_subject(token: str) -> str | None:
+    """Returns the token's subject (the user's email), or None if invalid."""
+    email = token_cache.get(token)
+    if email is not None:
+        return email
+
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except jwt.InvalidTokenError:
+        return None
+
+    token_data = TokenData(email=payload.get("sub"))
+    if token_data.email is None:
+        return None
+
+    # Never keep a token cached past its own expiry
+    expires_in = payload.get("exp", 0) - datetime.now(timezone.utc).timestamp()
+    token_cache.set(token, token_data.email, ttl=expires_in)
+    return token_data.email
+
+
+def invalidate_user(email: str) -> None:
+    """
+    Drops a cached principal after the user changed. Only this process's
+    cache, other workers catch up within AUTH_CACHE_TTL_SECONDS.
+    """
+    principal_cache.pop(email)
+
+
+async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[Session, Depends(get_db)]
-) -> User:
+    db: Annotated[AsyncSession, Depends(get_async_db)]
+) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
-    except jwt.InvalidTokenError:
+    email = decode_token_subject(token)
+    if email is None:
         raise credentials_exception
-    
-    user = db.query(User).filter(User.email == token_data.email).first()
 
-    if user is None:
-        raise credentials_exception
-    return user
+    current_user = principal_cache.get(email)
+    if current_user is None:
+        result = await db.execute(select(User).filter(User.email == email))
+        user = result.scalars().first()
+
+        if user is None:
+            raise credentials_exception
+        current_user = CurrentUser.model_validate(user)
+        principal_cache.set(email, current_user)
+
+    return current_user
@@ -1,7 +1,8 @@
 
+from functools import lru_cache
+
 import requests
 from langchain.tools import Tool, tool
-from langchain_community.tools import DuckDuckGoSearchRun
 
 from digital_twin.config import settings
 
@@ -12,9 +13,21 @@ WEATHER_API_KEY = settings.OPENWEATHER_API_KEY
 WEATHER_API_URL = "http://api.openweathermap.org/data/2.5/weather"
 
 
+@lru_cache(maxsize=1)
+def _search_engine():
+    # Built on first search, importing it pulls in the DuckDuckGo client
+    from langchain_community.tools import DuckDuckGoSearchRun
+
+    return DuckDuckGoSearchRun()
+
+
+def web_search(query: str) -> str:
+    return _search_engine().run(query)
+
+
 search_tool = Tool(
     name="WebSearch",
-    func=DuckDuckGoSearchRun().run,
+    func=web_search,
     description="""Search the internet for current information.
 
     Input: Search query as string (e.g., "Tesla stock price 2024", "GDP growth USA")
@@ -0,0 +1,139 @@
+"""
+Shared fixtures for tests that run against a real database.
+
+A temporary SQLite file is used unless TEST_DATABASE_URL points at another
+(disposable) database, e.g. a local Postgres.
+"""
+
+import os
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from digital_twin import app
+from digital_twin.config import settings
+from digital_twin.database import async_database_url, get_async_db
+from digital_twin.models import (
+    Base,
+    Chat,
+    ChatMessage,
+    Education,
+    Hobby,
+    Occupation,
+    Persona,
+    User,
+)
+from digital_twin.utils.security import (
+    create_access_token,
+    principal_cache,
+    token_cache,
+)
+
+SEED_USER_EMAIL = "user@test.io"
+
+
+def seed_database(
+    url: str, personas: int = 3, children: int = 2, messages: int = 10
+) -> None:
+    """
+    Creates the schema and seeds personas with children, one user and one
+    chat with ``messages`` messages (ids 1..messages) between the user and
+    the first persona.
+    """
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    with sessionmaker(bind=engine)() as db:
+        for i in range(personas):
+            persona = Persona(name=f"Persona {i}", birthdate=date(1990, 1, 1), gender="Other", nationality="Portuguese")
+            persona.educations = [
+                Education(level="Master", course="CS", school="ISEC", date_started=date(2010, 1, 1), is_graduated=False, grade=15)
+                for _ in range(children)
+            ]
+            persona.occupations = [
+                Occupation(position="Dev", workplace="Co", date_started=date(2015, 1, 1)) for _ in range(children)
+            ]
+            persona.hobbies = [Hobby(type="other", name="Chess", freq="often") for _ in range(children)]
+            db.add(persona)
+
+        db.add(User(name="User", birthdate=date(1990, 1, 1), email=SEED_USER_EMAIL, password="x"))
+        db.flush()
+        db.add(Chat(user_id=1, persona_id=1))
+        db.flush()
+        db.add_all(ChatMessage(chat_id=1, role="User", content=f"message {i}") for i in range(1, messages + 1))
+        db.commit()
+
+    engine.dispose()
+
+
+@contextmanager
+def capture_queries(engine):
+    """Collects every SQL statement sent through ``engine`` inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def database_url(tmp_path) -> str:
+    return os.environ.get("TEST_DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+
+
+@pytest.fixture
+def seeded_database(database_url) -> str:
+    seed_database(database_url)
+    return database_url
+
+
+@pytest.fixture
+def db_engine(seeded_database):
+    """
+    Async engine over the seeded database. NullPool keeps connections from
+    outliving the event loop of the request that opened them.
+    """
+    return create_async_engine(async_database_url(seeded_database), poolclass=NullPool)
+
+
+@pytest.fixture
+def api_client(db_engine):
+    """TestClient whose requests use the seeded database."""
+    session_factory = async_sessionmaker(bind=db_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_async_db, None)
+
+
+@pytest.fixture
+def auth_headers(monkeypatch) -> dict[str, str]:
+    monkeypatch.setattr(settings, "SECRET_KEY", "digital-twin-test-secret-key-0123456789")
+    monkeypatch.setattr(settings, "ALGORITHM", "HS256")
+    token_cache.clear()
+    principal_cache.clear()
+    token = create_access_token(data={"sub": SEED_USER_EMAIL})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def query_log(db_engine):
+    """Statements executed against the seeded database during the test."""
+    with capture_queries(db_engine.sync_engine) as statements:
+        yield statements
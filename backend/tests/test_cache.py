@@ -0,0 +1,35 @@
+from unittest.mock import patch
+
+from digital_twin.utils.cache import TTLCache
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(maxsize=10, ttl=30)
+
+    with patch("digital_twin.utils.cache.time.monotonic", return_value=100.0):
+        cache.set("token", "user@test.io")
+        cache.set("short", "user@test.io", ttl=5)
+    with patch("digital_twin.utils.cache.time.monotonic", return_value=110.0):
+        assert cache.get("token") == "user@test.io"
+        assert cache.get("short") is None
+    with patch("digital_twin.utils.cache.time.monotonic", return_value=131.0):
+        assert cache.get("token") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_zero_ttl_disables_cache():
+    cache = TTLCache(maxsize=10, ttl=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
@@ -0,0 +1,139 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from digital_twin.config import settings
+from digital_twin.models import Chat, ChatArchive, ChatMessage
+from digital_twin.services.chat_archive import ChatArchiveService, database_now
+
+CHAT_URL = "/api/v1/users/1/chats/1"
+
+
+def archive(db_engine, older_than=None, batch_size=4, deactivate=False):
+    session_factory = async_sessionmaker(bind=db_engine, expire_on_commit=False)
+
+    async def run():
+        async with session_factory() as db:
+            # Messages 1..6 become cold, 7..10 stay hot
+            await db.execute(
+                update(ChatMessage)
+                .where(ChatMessage.id <= 6)
+                .values(created_at=datetime(2020, 1, 1))
+            )
+            if deactivate:
+                await db.execute(update(Chat).values(is_active=False))
+            await db.commit()
+            result = await ChatArchiveService.archive_messages(
+                db, older_than or datetime.now() - timedelta(days=1), batch_size
+            )
+            hot = await db.scalar(select(func.count()).select_from(ChatMessage))
+            pointers = list(await db.scalars(select(ChatArchive).order_by(ChatArchive.id)))
+            chat = await db.get(Chat, 1)
+        return result, hot, pointers, chat
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def archive_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_ARCHIVE_PATH", str(tmp_path / "archive"))
+    return tmp_path / "archive"
+
+
+def test_archive_moves_cold_messages(db_engine, archive_path):
+    """Testa que as mensagens antigas passam para Parquet e deixam um ponteiro."""
+    result, hot, pointers, chat = archive(db_engine)
+
+    assert (result.chats, result.messages, result.files) == (1, 6, 2)
+    assert hot == 4
+    assert [(p.first_message_id, p.last_message_id) for p in pointers] == [(1, 4), (5, 6)]
+    assert all((archive_path / p.path).exists() for p in pointers)
+    assert chat.archived_until_id == 6
+
+
+def test_inactive_chats_are_archived_whole(db_engine, archive_path):
+    """Testa que os chats inativos são arquivados por inteiro."""
+    result, hot, _, _ = archive(db_engine, deactivate=True)
+
+    assert (result.messages, hot) == (10, 0)
+
+
+def test_cutoff_uses_the_database_clock(db_engine):
+    """Testa que o corte usa o mesmo relógio que preenche created_at."""
+    session_factory = async_sessionmaker(bind=db_engine)
+
+    async def run():
+        async with session_factory() as db:
+            return await database_now(db)
+
+    now = asyncio.run(run())
+
+    # SQLite's CURRENT_TIMESTAMP is naive UTC
+    assert now.tzinfo is None
+    assert abs(now - datetime.now(timezone.utc).replace(tzinfo=None)) < timedelta(minutes=1)
+
+
+def test_history_pages_into_the_archive(api_client, auth_headers, db_engine, archive_path):
+    """Testa que o histórico continua no arquivo quando o cursor passa os dados quentes."""
+    archive(db_engine)
+
+    first = api_client.get(CHAT_URL, params={"limit": 5}, headers=auth_headers)
+    second = api_client.get(
+        CHAT_URL, params={"limit": 5, "before": first.headers["X-Next-Cursor"]}, headers=auth_headers
+    )
+
+    assert [m["id"] for m in first.json()] == [10, 9, 8, 7, 6]
+    assert [m["id"] for m in second.json()] == [5, 4, 3, 2, 1]
+    assert second.json()[-1]["content"] == "message 1"
+
+
+def test_polling_after_reads_archive_first(api_client, auth_headers, db_engine, archive_path):
+    """Testa o parâmetro 'after' sobre mensagens arquivadas e quentes."""
+    archive(db_engine)
+
+    archived = api_client.get(CHAT_URL, params={"after": 1, "limit": 3}, headers=auth_headers)
+    mixed = api_client.get(CHAT_URL, params={"after": 4, "limit": 5}, headers=auth_headers)
+
+    assert [m["id"] for m in archived.json()] == [4, 3, 2]
+    assert [m["id"] for m in mixed.json()] == [9, 8, 7, 6, 5]
+
+
+def test_search_signals_archived_messages(api_client, auth_headers, db_engine, archive_path):
+    """Testa que a pesquisa indica quantas mensagens arquivadas não foram pesquisadas."""
+    hot = api_client.get("/api/v1/users/1/chats/search", params={"q": "message"}, headers=auth_headers)
+    archive(db_engine)
+    cold = api_client.get("/api/v1/users/1/chats/search", params={"q": "message"}, headers=auth_headers)
+
+    assert "X-Archived-Not-Searched" not in hot.headers
+    assert cold.headers["X-Archived-Not-Searched"] == "6"
+    assert len(cold.json()) == 4
+
+
+def test_export_includes_archived_messages(api_client, auth_headers, db_engine, archive_path):
+    """Testa que a exportação inclui as mensagens arquivadas em Parquet, pela ordem certa."""
+    archive(db_engine)
+
+    response = api_client.get("/api/v1/users/1/chats/export", headers=auth_headers)
+    csv_rows = list(csv.DictReader(io.StringIO(
+        api_client.get("/api/v1/users/1/chats/export?format=csv", headers=auth_headers).text
+    )))
+
+    messages = [json.loads(line) for line in response.text.splitlines()]
+    assert [m["message_id"] for m in messages] == list(range(1, 11))
+    assert [m["content"] for m in messages] == [f"message {i}" for i in range(1, 11)]
+    assert messages[0] == {
+        "chat_id": 1,
+        "persona_id": 1,
+        "is_active": True,
+        "message_id": 1,
+        "role": "User",
+        "content": "message 1",
+        "created_at": "2020-01-01T00:00:00",
+    }
+    assert [int(r["message_id"]) for r in csv_rows] == list(range(1, 11))
@@ -0,0 +1,33 @@
+# Chat semeado no conftest: 10 mensagens (ids 1..10) entre o utilizador 1 e a persona 1
+CHAT_URL = "/api/v1/users/1/chats/1"
+
+
+def test_history_first_page_is_newest_first(api_client, auth_headers):
+    """Testa a primeira página do histórico, das mais recentes para as mais antigas."""
+    response = api_client.get(f"{CHAT_URL}?limit=4", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [m["id"] for m in response.json()] == [10, 9, 8, 7]
+    assert response.headers["X-Next-Cursor"] == "7"
+
+
+def test_history_before_cursor(api_client, auth_headers):
+    """Testa a paginação para mensagens mais antigas."""
+    response = api_client.get(f"{CHAT_URL}?limit=4&before=3", headers=auth_headers)
+
+    assert [m["id"] for m in response.json()] == [2, 1]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_history_after_returns_only_new_messages(api_client, auth_headers):
+    """Testa o modo 'since id' usado para obter apenas mensagens novas."""
+    response = api_client.get(f"{CHAT_URL}?limit=3&after=5", headers=auth_headers)
+
+    assert [m["id"] for m in response.json()] == [8, 7, 6]
+
+
+def test_history_rejects_both_cursors(api_client, auth_headers):
+    """Testa erro ao usar 'before' e 'after' em simultâneo."""
+    response = api_client.get(f"{CHAT_URL}?before=5&after=2", headers=auth_headers)
+
+    assert response.status_code == 400
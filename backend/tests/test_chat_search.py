@@ -0,0 +1,92 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from digital_twin.services.chat import ChatService
+
+SEARCH_URL = "/api/v1/users/1/chats/search"
+
+
+def test_search_returns_ranked_snippets(api_client, auth_headers):
+    """Testa que a pesquisa devolve as mensagens encontradas com snippet e rank."""
+    response = api_client.get(SEARCH_URL, params={"q": "message"}, headers=auth_headers)
+
+    results = response.json()
+    assert response.status_code == 200
+    assert len(results) == 10
+    assert all("**message**" in r["snippet"] for r in results)
+    assert [r["rank"] for r in results] == sorted((r["rank"] for r in results), reverse=True)
+    assert {(r["chat_id"], r["persona_id"]) for r in results} == {(1, 1)}
+
+
+def test_search_pages_by_offset(api_client, auth_headers):
+    """Testa a paginação da pesquisa com limit/offset e o cabeçalho X-Next-Offset."""
+    first = api_client.get(SEARCH_URL, params={"q": "message", "limit": 6}, headers=auth_headers)
+    second = api_client.get(
+        SEARCH_URL,
+        params={"q": "message", "limit": 6, "offset": first.headers["X-Next-Offset"]},
+        headers=auth_headers,
+    )
+
+    ids = [r["id"] for r in first.json() + second.json()]
+    assert sorted(ids) == list(range(1, 11))
+    assert "X-Next-Offset" not in second.headers
+
+
+def test_search_filters_by_persona(api_client, auth_headers):
+    """Testa que o filtro por persona exclui os chats com outras personas."""
+    response = api_client.get(
+        SEARCH_URL, params={"q": "message", "persona_id": 2}, headers=auth_headers
+    )
+
+    assert response.json() == []
+
+
+def test_new_messages_are_indexed(api_client, auth_headers):
+    """Testa que as mensagens de um novo turno ficam pesquisáveis (triggers)."""
+    with patch(
+        "digital_twin.services.chat.ChatService.generate_chat_response",
+        AsyncMock(return_value={"output": "Os gatos dormem muito."}),
+    ):
+        api_client.post(
+            "/api/v1/users/1/chats/2", json={"role": "User", "content": "Fala-me de gatos"}, headers=auth_headers
+        )
+
+    response = api_client.get(SEARCH_URL, params={"q": "gatos"}, headers=auth_headers)
+
+    assert [r["persona_id"] for r in response.json()] == [2, 2]
+
+
+def test_query_syntax_is_not_interpreted(api_client, auth_headers):
+    """Testa que operadores e aspas na pesquisa não causam erros."""
+    response = api_client.get(
+        SEARCH_URL, params={"q": 'message" OR NEAR(* -'}, headers=auth_headers
+    )
+
+    assert response.status_code == 200
+
+
+def test_blank_query_is_rejected(api_client, auth_headers):
+    """Testa que uma pesquisa só com espaços é rejeitada em vez de falhar no FTS5."""
+    response = api_client.get(SEARCH_URL, params={"q": "   "}, headers=auth_headers)
+
+    assert response.status_code == 422
+
+
+def test_query_without_terms_finds_nothing(db_engine):
+    """Testa que o serviço devolve [] quando a pesquisa não tem termos."""
+    async def search():
+        async with async_sessionmaker(bind=db_engine)() as db:
+            return await ChatService.search_user_messages(1, " \t ", db)
+
+    assert asyncio.run(search()) == []
+
+
+def test_cannot_search_other_users_chats(api_client, auth_headers):
+    """Testa que um utilizador não pode pesquisar os chats de outro."""
+    response = api_client.get(
+        "/api/v1/users/2/chats/search", params={"q": "message"}, headers=auth_headers
+    )
+
+    assert response.status_code == 403
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from digital_twin.models import Chat, ChatMessage
+from digital_twin.schemas.chat_message import ChatMessageCreate
+from digital_twin.services.chat import ChatService
+
+
+@pytest.fixture
+def persona_answer():
+    with patch(
+        "digital_twin.services.chat.ChatService.generate_chat_response",
+        AsyncMock(return_value={"output": "Olá!"}),
+    ) as mock:
+        yield mock
+
+
+def test_turn_appends_to_active_chat(api_client, auth_headers, persona_answer, query_log):
+    """Testa que a pergunta e a resposta são guardadas no chat ativo numa só transação."""
+    response = api_client.post(
+        "/api/v1/users/1/chats/1", json={"role": "User", "content": "Olá?"}, headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert response.json()["content"] == "Olá!"
+    assert response.json()["chat_id"] == 1
+    history = api_client.get("/api/v1/users/1/chats/1?limit=2", headers=auth_headers).json()
+    assert [(m["id"], m["role"]) for m in history] == [(12, "Assistant"), (11, "User")]
+    # The active chat is only read, the message insert is the only write
+    writes = [s for s in query_log if s.startswith(("INSERT", "UPDATE"))]
+    assert len(writes) <= 2
+    assert not any("chats" in s.split("(")[0] for s in writes)
+
+
+def test_first_turn_creates_a_single_active_chat(api_client, auth_headers, persona_answer):
+    """Testa que turnos repetidos com uma nova persona reutilizam o mesmo chat."""
+    chat_ids = set()
+    for _ in range(2):
+        response = api_client.post(
+            "/api/v1/users/1/chats/2", json={"role": "User", "content": "Olá?"}, headers=auth_headers
+        )
+        assert response.status_code == 200
+        chat_ids.add(response.json()["chat_id"])
+
+    history = api_client.get("/api/v1/users/1/chats/2", headers=auth_headers).json()
+    assert len(history) == 4
+    assert len(chat_ids) == 1
+
+
+def test_separate_sessions_upsert_the_same_chat(db_engine):
+    session_factory = async_sessionmaker(bind=db_engine, expire_on_commit=False)
+    message = ChatMessageCreate(role="User", content="Olá?")
+
+    async def turns():
+        answers = []
+        for _ in range(2):
+            async with session_factory() as db:
+                answers.append(await ChatService.record_chat_turn(1, 3, message, "Olá!", db))
+        async with session_factory() as db:
+            chats = await db.scalar(select(func.count()).select_from(Chat).where(Chat.persona_id == 3))
+            messages = await db.scalar(select(func.count()).select_from(ChatMessage).where(ChatMessage.chat_id == answers[0].chat_id))
+        return answers, chats, messages
+
+    answers, chats, messages = asyncio.run(turns())
+
+    assert answers[0].chat_id == answers[1].chat_id
+    assert (chats, messages) == (1, 4)
+
+
+def test_agent_is_loaded_off_the_event_loop(db_engine):
+    """Testa que o agente (e os imports de langchain) é criado e executado no threadpool."""
+    threads = []
+
+    def get_agent_executor():
+        threads.append(threading.current_thread())
+        return MagicMock(invoke=lambda data: {"output": data["input"]})
+
+    async def ask():
+        async with async_sessionmaker(bind=db_engine)() as db:
+            return await ChatService.generate_chat_response("Olá?", 1, db)
+
+    with patch("digital_twin.services.agent_executor.get_agent_executor", get_agent_executor):
+        result = asyncio.run(ask())
+
+    assert result == {"output": "Olá?"}
+    assert threads and threads[0] is not threading.main_thread()
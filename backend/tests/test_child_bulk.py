@@ -0,0 +1,84 @@
+HOBBIES_URL = "/api/v1/hobbies/"
+
+
+def hobby(name, persona_id=None, id=None, freq="often"):
+    item = {"type": "other", "name": name, "freq": freq}
+    if persona_id is not None:
+        item["persona_id"] = persona_id
+    if id is not None:
+        item["id"] = id
+    return item
+
+
+def test_bulk_create(api_client):
+    """Testa a criação de vários hobbies, de várias personas, numa só transação."""
+    response = api_client.post(
+        HOBBIES_URL + "bulk", json=[hobby("Xadrez", 1), hobby("Surf", 1), hobby("Pintura", 2)]
+    )
+
+    assert response.status_code == 200
+    assert [h["name"] for h in response.json()] == ["Xadrez", "Surf", "Pintura"]
+    assert len(api_client.get(HOBBIES_URL, params={"persona": 1}).json()) == 4
+
+
+def test_bulk_create_missing_persona(api_client):
+    """Testa que uma persona inexistente devolve 404 sem criar nenhum hobby."""
+    response = api_client.post(HOBBIES_URL + "bulk", json=[hobby("Xadrez", 1), hobby("Surf", 99)])
+
+    assert response.status_code == 404
+    assert len(api_client.get(HOBBIES_URL, params={"persona": 1}).json()) == 2
+
+
+def test_sync_applies_the_diff(api_client, query_log):
+    """Testa que o sync só atualiza o hobby alterado e cria o novo, em 3 queries."""
+    kept, changed = api_client.get(HOBBIES_URL, params={"persona": 1}).json()
+    query_log.clear()
+
+    response = api_client.put(
+        HOBBIES_URL,
+        params={"persona": 1},
+        json=[
+            hobby(kept["name"], id=kept["id"], freq=kept["freq"]),
+            hobby("Xadrez", id=changed["id"], freq="rarely"),
+            hobby("Surf"),
+        ],
+    )
+    queries = len(query_log)
+    synced = response.json()
+
+    assert response.status_code == 200
+    assert [h["id"] for h in synced[:2]] == [kept["id"], changed["id"]]
+    assert synced[1]["name"] == "Xadrez" and synced[2]["name"] == "Surf"
+    assert queries == 3
+    assert api_client.get(HOBBIES_URL, params={"persona": 1}).json() == synced
+
+
+def test_sync_deletes_missing_rows(api_client):
+    """Testa que um conjunto vazio apaga todos os hobbies da persona."""
+    response = api_client.put(HOBBIES_URL, params={"persona": 1}, json=[])
+
+    assert response.json() == []
+    assert api_client.get(HOBBIES_URL, params={"persona": 1}).json() == []
+    assert len(api_client.get(HOBBIES_URL, params={"persona": 2}).json()) == 2
+
+
+def test_sync_errors(api_client):
+    """Testa o 400 para ids de outra persona e o 404 para personas inexistentes."""
+    other = api_client.get(HOBBIES_URL, params={"persona": 2}).json()[0]
+
+    foreign = api_client.put(HOBBIES_URL, params={"persona": 1}, json=[hobby("Xadrez", id=other["id"])])
+    missing = api_client.put(HOBBIES_URL, params={"persona": 99}, json=[hobby("Xadrez")])
+
+    assert foreign.status_code == 400
+    assert missing.status_code == 404
+    assert api_client.get(HOBBIES_URL, params={"persona": 2}).json()[0] == other
+
+
+def test_educations_and_occupations_sync(api_client):
+    """Testa que as educações e ocupações também aceitam o sync."""
+    for url in ("/api/v1/educations/", "/api/v1/occupations/"):
+        current = api_client.get(url, params={"persona": 1}).json()
+        response = api_client.put(url, params={"persona": 1}, json=current[:1])
+
+        assert response.status_code == 200
+        assert response.json() == current[:1]
@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from digital_twin import app
+from digital_twin.database import get_async_db
+from digital_twin.models import Hobby
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/api/v1/personas/", "/api/v1/personas/1", "/api/v1/hobbies/?persona=1"],
+)
+def test_matching_etag_returns_304(api_client, path):
+    """Testa que um If-None-Match igual ao ETag devolve 304 sem corpo."""
+    first = api_client.get(path)
+    etag = first.headers["ETag"]
+
+    response = api_client.get(path, headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert "must-revalidate" in first.headers["Cache-Control"]
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_revalidation_is_a_single_query(api_client, query_log):
+    """Testa que a revalidação faz uma só query, sem carregar as personas."""
+    etag = api_client.get("/api/v1/personas/").headers["ETag"]
+    query_log.clear()
+
+    api_client.get("/api/v1/personas/", headers={"If-None-Match": etag})
+
+    assert len(query_log) == 1
+
+
+def test_etag_changes_after_update(api_client):
+    """Testa que alterar uma persona muda o ETag."""
+    etag = api_client.get("/api/v1/personas/1").headers["ETag"]
+
+    api_client.put("/api/v1/personas/1", json={"name": "Outro nome"})
+    response = api_client.get("/api/v1/personas/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["name"] == "Outro nome"
+
+
+def test_etag_changes_after_child_update(api_client):
+    """Testa que alterar um hobby muda o ETag da persona e da lista de hobbies."""
+    persona_etag = api_client.get("/api/v1/personas/1").headers["ETag"]
+    hobbies_etag = api_client.get("/api/v1/hobbies/?persona=1").headers["ETag"]
+    hobby_id = api_client.get("/api/v1/hobbies/?persona=1").json()[0]["id"]
+
+    api_client.put(f"/api/v1/hobbies/{hobby_id}", json={"name": "Xadrez"})
+
+    assert api_client.get(
+        "/api/v1/personas/1", headers={"If-None-Match": persona_etag}
+    ).status_code == 200
+    assert api_client.get(
+        "/api/v1/hobbies/?persona=1", headers={"If-None-Match": hobbies_etag}
+    ).status_code == 200
+
+
+def test_etag_changes_after_child_delete(api_client):
+    """Testa que apagar um hobby muda o ETag da lista."""
+    response = api_client.get("/api/v1/hobbies/?persona=1")
+    etag = response.headers["ETag"]
+
+    api_client.delete(f"/api/v1/hobbies/{response.json()[0]['id']}")
+    response = api_client.get("/api/v1/hobbies/?persona=1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+
+def test_etag_changes_when_a_child_is_swapped_for_another(api_client, db_engine):
+    """Testa que trocar um hobby por outro com a mesma contagem, id máximo e versões muda o ETag."""
+    api_client.put("/api/v1/hobbies/3", json={"name": "Xadrez"})
+    etag = api_client.get("/api/v1/hobbies/?persona=2").headers["ETag"]
+
+    async def swap():
+        async with async_sessionmaker(bind=db_engine)() as db:
+            await db.delete(await db.get(Hobby, 3))
+            # Move o hobby 1 para a persona 2: fica com a versão 2 que o 3 tinha
+            (await db.get(Hobby, 1)).persona_id = 2
+            await db.commit()
+
+    asyncio.run(swap())
+    response = api_client.get("/api/v1/hobbies/?persona=2", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert sorted(h["id"] for h in response.json()) == [1, 4]
+
+
+def test_etag_changes_when_the_newest_child_is_replaced(api_client):
+    """Testa que apagar o hobby mais recente e criar outro não reutiliza o id (nem o ETag)."""
+    etag = api_client.get("/api/v1/hobbies/?persona=3").headers["ETag"]
+
+    api_client.delete("/api/v1/hobbies/6")
+    created = api_client.post(
+        "/api/v1/hobbies/", json={"type": "other", "name": "Go", "freq": "often", "persona_id": 3}
+    )
+    response = api_client.get("/api/v1/hobbies/?persona=3", headers={"If-None-Match": etag})
+
+    assert created.json()["id"] == 7
+    assert response.status_code == 200
+
+
+def test_missing_persona_is_never_304(api_client):
+    """Testa que uma persona inexistente continua a devolver 404 com If-None-Match: *."""
+    response = api_client.get("/api/v1/hobbies/?persona=999", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+
+
+def stale_session(db_engine, model, id):
+    """get_async_db whose session read the row before another session changed it."""
+    session_factory = async_sessionmaker(bind=db_engine, expire_on_commit=False)
+
+    async def override():
+        async with session_factory() as db:
+            # Referenced so the identity map keeps the stale copy
+            row = await db.get(model, id)  # noqa: F841
+            async with session_factory() as other:
+                await other.execute(update(model).where(model.id == id).values(version=model.version + 1))
+                await other.commit()
+            yield db
+
+    return override
+
+
+@pytest.mark.parametrize(
+    "method, path, body",
+    [
+        ("put", "/api/v1/hobbies/1", {"name": "Xadrez"}),
+        ("delete", "/api/v1/hobbies/1", None),
+        ("put", "/api/v1/hobbies/?persona=1", [{"type": "other", "name": "Xadrez", "freq": "often", "id": 1}]),
+    ],
+)
+def test_concurrent_write_returns_409(api_client, db_engine, method, path, body):
+    """Testa que uma escrita sobre uma linha alterada entretanto devolve 409 em vez de 500."""
+    app.dependency_overrides[get_async_db] = stale_session(db_engine, Hobby, 1)
+
+    response = api_client.request(method.upper(), path, json=body)
+
+    assert response.status_code == 409
+    assert api_client.get("/api/v1/hobbies/1").json()["name"] == "Chess"
+
+
+def test_etag_is_weak_for_gzip_and_identity_bodies(api_client):
+    """Testa que o ETag é fraco, igual com e sem gzip, e aceite na forma forte."""
+    gzipped = api_client.get("/api/v1/personas/", headers={"Accept-Encoding": "gzip"})
+    identity = api_client.get("/api/v1/personas/", headers={"Accept-Encoding": "identity"})
+    etag = identity.headers["ETag"]
+
+    strong = api_client.get("/api/v1/personas/", headers={"If-None-Match": etag.removeprefix("W/")})
+
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in identity.headers
+    assert etag.startswith('W/"')
+    assert gzipped.headers["ETag"] == etag
+    assert strong.status_code == 304
@@ -0,0 +1,55 @@
+import asyncio
+import csv
+import io
+import json
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from digital_twin.services.export import ExportService
+
+
+def test_export_personas_ndjson(api_client):
+    """Testa a exportação de personas com filhos em NDJSON."""
+    response = api_client.get("/api/v1/personas/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    personas = [json.loads(line) for line in response.text.splitlines()]
+    assert [p["id"] for p in personas] == [1, 2, 3]
+    assert len(personas[0]["educations"]) == 2
+
+
+def test_export_personas_csv(api_client):
+    """Testa a exportação de personas em CSV, com os filhos codificados em JSON."""
+    response = api_client.get("/api/v1/personas/export?format=csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(rows) == 3
+    assert json.loads(rows[0]["hobbies"])[0]["name"] == "Chess"
+
+
+def test_export_own_chats(api_client, auth_headers):
+    """Testa a exportação das mensagens dos chats do próprio utilizador."""
+    response = api_client.get("/api/v1/users/1/chats/export", headers=auth_headers)
+
+    messages = [json.loads(line) for line in response.text.splitlines()]
+    assert [m["message_id"] for m in messages] == list(range(1, 11))
+    assert messages[0]["persona_id"] == 1
+
+
+def test_export_other_users_chats_is_forbidden(api_client, auth_headers):
+    """Testa que um utilizador não pode exportar os chats de outro."""
+    response = api_client.get("/api/v1/users/2/chats/export", headers=auth_headers)
+
+    assert response.status_code == 403
+
+
+def test_export_streams_in_batches(db_engine):
+    async def collect():
+        async with async_sessionmaker(bind=db_engine)() as db:
+            return [chunk async for chunk in ExportService.stream_user_chats(db, 1, batch_size=4)]
+
+    chunks = asyncio.run(collect())
+
+    assert [chunk.count("\n") for chunk in chunks] == [4, 4, 2]
@@ -0,0 +1,95 @@
+import asyncio
+import subprocess
+import sys
+
+from conftest import SEED_USER_EMAIL
+from fastapi import HTTPException
+
+from digital_twin.utils.hashing import PasswordHashPool, PoolBusyError
+from digital_twin.utils.security import hash_password, verify_password
+
+# Cheap Argon2 parameters, the cost is not what is under test
+FAST_PARAMS = {"time_cost": 1, "memory_cost": 1024, "parallelism": 1}
+
+
+def test_process_pool_hashes_and_verifies():
+    pool = PasswordHashPool(workers=1, max_pending=4, **FAST_PARAMS)
+
+    async def roundtrip():
+        await pool.start()
+        hashed = await pool.hash("Password2025")
+        return hashed, await pool.verify("Password2025", hashed), await pool.verify("Wrong2025", hashed)
+
+    try:
+        hashed, valid, invalid = asyncio.run(roundtrip())
+    finally:
+        pool.shutdown()
+
+    assert hashed.startswith("$argon2id$v=19$m=1024,t=1,p=1$")
+    assert valid and not invalid
+    assert pool.stats()["completed"] == 3
+
+
+def test_workers_do_not_import_the_application(tmp_path):
+    """Testa que os processos da pool não importam digital_twin, nem com o script digital-twin."""
+    # Como o script da consola: __main__ é um ficheiro que importa a aplicação
+    script = tmp_path / "digital-twin"
+    script.write_text(
+        "import asyncio\n"
+        "from digital_twin.server import serve\n"
+        "from digital_twin.utils.hashing import PasswordHashPool\n"
+        "if __name__ == '__main__':\n"
+        f"    pool = PasswordHashPool(workers=1, max_pending=4, **{FAST_PARAMS!r})\n"
+        "    asyncio.run(pool.start())\n"
+        "    print(pool._submit(eval, \"'digital_twin' in __import__('sys').modules\").result())\n"
+        "    pool.shutdown()\n"
+    )
+
+    result = subprocess.run([sys.executable, script], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False"
+
+
+def test_pool_rejects_jobs_beyond_max_pending():
+    pool = PasswordHashPool(workers=0, max_pending=2, **FAST_PARAMS)
+
+    async def burst():
+        return await asyncio.gather(*(pool.hash("Password2025") for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+
+    assert sum(isinstance(r, PoolBusyError) for r in results) == 1
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["pending"] == 0
+
+
+def test_login_returns_503_when_pool_is_full(api_client, monkeypatch):
+    """Testa resposta 503 quando a pool de hashing está cheia."""
+    pool = PasswordHashPool(workers=0, max_pending=0, **FAST_PARAMS)
+    monkeypatch.setattr("digital_twin.utils.security.password_pool", pool)
+
+    response = api_client.post(
+        "/api/v1/users/login", json={"email": SEED_USER_EMAIL, "password": "Password2025"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_pool_busy_raises_a_new_exception_each_time(monkeypatch):
+    """Testa que cada pedido rejeitado recebe a sua própria exceção 503."""
+    pool = PasswordHashPool(workers=0, max_pending=0, **FAST_PARAMS)
+    monkeypatch.setattr("digital_twin.utils.security.password_pool", pool)
+
+    async def rejected(call):
+        try:
+            await call
+        except HTTPException as exc:
+            return exc
+
+    first = asyncio.run(rejected(verify_password("Password2025", "hash")))
+    second = asyncio.run(rejected(hash_password("Password2025")))
+
+    assert first is not second
+    assert first.status_code == second.status_code == 503
+    assert first.headers is not second.headers
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+# Loaded on first use only (LLM agents, web search, lakehouse archive)
+LAZY_PACKAGES = {
+    "langchain",
+    "langchain_community",
+    "langchain_google_genai",
+    "langgraph",
+    "duckdb",
+    "pandas",
+    "requests",
+}
+
+# Modules loaded by importing the application, a proxy for import time that
+# does not depend on the machine: about 2300 with the heavy packages loaded
+# eagerly, 920 without them
+IMPORT_MODULE_BUDGET = 1200
+
+
+def import_app() -> set[str]:
+    """Imports digital_twin in a fresh interpreter, returns its modules."""
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, digital_twin; print('\\n'.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_heavy_dependencies_are_lazy():
+    """Testa que importar a aplicação não carrega langchain, duckdb, pandas, etc."""
+    modules = import_app()
+
+    assert {m.split(".")[0] for m in modules} & LAZY_PACKAGES == set()
+
+
+
+def test_import_module_budget():
+    """Testa o orçamento de módulos carregados ao importar a aplicação."""
+    modules = import_app()
+
+    assert len(modules) <= IMPORT_MODULE_BUDGET
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+from datetime import date
+
+import pyarrow.parquet as pq
+
+from digital_twin.utils.lakehouse_export import LakehouseExporter
+from digital_twin.utils.lakehouse_manager import LakehouseManager
+
+
+def exporter(tmp_path, **options):
+    options = {"queue_size": 100, "batch_size": 50, "flush_seconds": 60.0} | options
+    return LakehouseExporter(tmp_path, **options)
+
+
+def lines(tmp_path, table):
+    file = tmp_path / table / f"{date.today().isoformat()}-{os.getpid()}.json"
+    return [json.loads(line) for line in file.read_text().splitlines()]
+
+
+def test_events_are_written_in_batches(tmp_path):
+    """Testa que os eventos são escritos em lote num ficheiro por tabela e processo."""
+    events = exporter(tmp_path, batch_size=3)
+    for i in range(5):
+        events.export("endpoints", {"event": "test", "i": i})
+    events.export("chat", {"event": "chat"})
+    events.flush()
+
+    assert [e["i"] for e in lines(tmp_path, "endpoints")] == [0, 1, 2, 3, 4]
+    assert len(lines(tmp_path, "chat")) == 1
+    assert events.stats()["written"] == 6
+    assert events.stats()["depth"] == 0
+    events.close()
+
+
+def test_full_queue_drops_events(tmp_path, monkeypatch):
+    """Testa que com a fila cheia os eventos são descartados e contabilizados."""
+    events = exporter(tmp_path, queue_size=2, batch_size=1)
+    release = threading.Event()
+    write = events._write
+    monkeypatch.setattr(events, "_write", lambda batch, **kw: release.wait() and write(batch, **kw))
+
+    accepted = [events.export("endpoints", {"i": i}) for i in range(5)]
+    release.set()
+    events.flush()
+
+    assert accepted.count(False) == events.stats()["dropped"] >= 2
+    assert len(lines(tmp_path, "endpoints")) == accepted.count(True)
+    events.close()
+
+
+def test_close_writes_pending_events(tmp_path):
+    """Testa que o close escreve os eventos pendentes sem esperar pelo intervalo."""
+    events = exporter(tmp_path)
+    for i in range(3):
+        events.export("endpoints", {"i": i})
+
+    events.close()
+
+    assert len(lines(tmp_path, "endpoints")) == 3
+    assert events.stats()["depth"] == 0
+
+
+def test_metrics_report_the_exporter(api_client):
+    """Testa que o /metrics inclui o estado da exportação."""
+    stats = api_client.get("/metrics").json()["lakehouse_export"]
+
+    assert stats["policy"] == "drop"
+    assert {"depth", "peak_depth", "written", "dropped"} <= set(stats)
+
+
+def segments(path):
+    return sorted(path.rglob("*.parquet"))
+
+
+def test_parquet_segments_are_partitioned(tmp_path):
+    """Testa que os segmentos Parquet rodam por tamanho e ficam partidos por data e evento."""
+    events = exporter(tmp_path, format="parquet", segment_rows=2)
+    for i in range(3):
+        events.export("endpoints", {"event": "persona_get", "i": i})
+    events.export("endpoints", {"event": "hobby_create", "status": "error", "description": "x"})
+    events.flush()
+
+    partition = tmp_path / "endpoints" / f"date={date.today().isoformat()}"
+    assert [len(pq.read_table(p)) for p in segments(partition / "event_prefix=persona")] == [2, 1]
+    assert len(segments(partition / "event_prefix=hobby")) == 1
+    assert not list(tmp_path.rglob("*.tmp"))
+    assert events.stats()["segments"] == 3
+    events.close()
+
+
+def test_segments_roll_on_time(tmp_path):
+    """Testa que um segmento aberto é escrito depois do intervalo, sem flush."""
+    events = exporter(tmp_path, format="parquet", flush_seconds=0.01, segment_seconds=0.0)
+    events.export("chat", {"event": "chat_message"})
+
+    deadline = time.monotonic() + 5
+    while not segments(tmp_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(segments(tmp_path)) == 1
+    events.close()
+
+
+def test_compaction_merges_segments(tmp_path):
+    """Testa que a compactação junta os segmentos num ficheiro por partição."""
+    events = exporter(tmp_path / "export", format="parquet", segment_rows=1)
+    manager = LakehouseManager(tmp_path / "storage")
+    target = tmp_path / "parquet_data" / "endpoint_logs"
+
+    for i in range(3):
+        events.export("endpoints", {"event": "persona_get", "i": i})
+    events.export("endpoints", {"event": "hobby_create", "description": "x"})
+    events.flush()
+    manager.compact_segments(tmp_path / "export" / "endpoints", tmp_path / "parquet_data", "endpoint_logs")
+    events.export("endpoints", {"event": "persona_update", "status": "success"})
+    events.flush()
+    manager.compact_segments(tmp_path / "export" / "endpoints", tmp_path / "parquet_data", "endpoint_logs")
+
+    persona = segments(target / f"date={date.today().isoformat()}" / "event_prefix=persona")
+    assert len(persona) == 1
+    assert len(pq.read_table(persona[0])) == 4
+    assert len(segments(target)) == 2
+    assert segments(tmp_path / "export") == []
+    events.close()
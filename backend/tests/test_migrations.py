@@ -0,0 +1,32 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from digital_twin.config import settings
+from digital_twin.utils.migrations import migrate_on_startup, upgrade_to_head
+
+
+@pytest.fixture
+def empty_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_upgrade_then_skip_at_head(empty_engine):
+    """Testa que a base de dados é migrada uma vez e depois o arranque não migra."""
+    assert upgrade_to_head(empty_engine) is True
+    assert "chat_archives" in inspect(empty_engine).get_table_names()
+
+    with patch("alembic.command.upgrade") as upgrade:
+        assert upgrade_to_head(empty_engine) is False
+    upgrade.assert_not_called()
+
+
+def test_auto_migrate_can_be_disabled(empty_engine, monkeypatch):
+    """Testa que APP_AUTO_MIGRATE=false desliga as migrações no arranque."""
+    monkeypatch.setattr(settings, "AUTO_MIGRATE", False)
+
+    assert migrate_on_startup(empty_engine) is False
+    assert inspect(empty_engine).get_table_names() == []
@@ -0,0 +1,55 @@
+BUNDLE_URL = "/api/v1/personas/1/bundle"
+
+
+def test_bundle_matches_persona(api_client, query_log):
+    """Testa que o bundle devolve a persona com todas as coleções em 4 queries."""
+    response = api_client.get(BUNDLE_URL)
+
+    assert response.status_code == 200
+    assert len(query_log) == 4
+    assert response.json() == api_client.get("/api/v1/personas/1").json()
+
+
+def test_include_selects_collections(api_client, query_log):
+    """Testa que include= devolve e carrega apenas as coleções pedidas."""
+    response = api_client.get(BUNDLE_URL, params={"include": "hobbies"})
+
+    bundle = response.json()
+    assert "hobbies" in bundle and "educations" not in bundle and "occupations" not in bundle
+    assert len(bundle["hobbies"]) == 2
+    assert len(query_log) == 2
+
+
+def test_bundle_revalidates(api_client, query_log):
+    """Testa o 304 do bundle numa só query e o novo ETag após adicionar um hobby."""
+    etag = api_client.get(BUNDLE_URL).headers["ETag"]
+    query_log.clear()
+
+    not_modified = api_client.get(BUNDLE_URL, headers={"If-None-Match": etag})
+    revalidation_queries = len(query_log)
+    api_client.post(
+        "/api/v1/hobbies/", json={"type": "other", "name": "Xadrez", "freq": "often", "persona_id": 1}
+    )
+    changed = api_client.get(BUNDLE_URL, headers={"If-None-Match": etag})
+
+    assert not_modified.status_code == 304
+    assert revalidation_queries == 1
+    assert changed.status_code == 200
+    assert len(changed.json()["hobbies"]) == 3
+
+
+def test_include_is_part_of_the_etag(api_client):
+    """Testa que bundles com include diferentes têm ETags diferentes."""
+    full = api_client.get(BUNDLE_URL).headers["ETag"]
+    hobbies = api_client.get(BUNDLE_URL, params={"include": "hobbies"}).headers["ETag"]
+
+    assert full != hobbies
+
+
+def test_bundle_errors(api_client):
+    """Testa o 400 para coleções desconhecidas e o 404 para personas inexistentes."""
+    unknown = api_client.get(BUNDLE_URL, params={"include": "hobbies,chats"})
+    missing = api_client.get("/api/v1/personas/999/bundle", headers={"If-None-Match": "*"})
+
+    assert unknown.status_code == 400
+    assert missing.status_code == 404
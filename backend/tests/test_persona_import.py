@@ -0,0 +1,84 @@
+import json
+
+from digital_twin.config import settings
+
+PERSONA = {
+    "name": "Ana",
+    "birthdate": "1990-05-01",
+    "gender": "Female",
+    "nationality": "Portuguese",
+    "educations": [
+        {"level": "Master", "course": "CS", "school": "ISEC", "date_started": "2010-09-01", "is_graduated": False, "grade": 15}
+    ],
+    "occupations": [{"position": "Dev", "workplace": "Co", "date_started": "2015-01-01"}],
+    "hobbies": [{"type": "other", "name": "Chess", "freq": "often"}, {"type": "other", "name": "Go", "freq": "rarely"}],
+}
+
+
+def test_import_json_with_nested_children(api_client, query_log):
+    """Testa a importação em massa de personas com filhos a partir de JSON."""
+    personas = [PERSONA | {"name": f"Ana {i}"} for i in range(5)]
+
+    response = api_client.post("/api/v1/personas/import?chunk_size=2", json=personas)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["personas"], result["educations"], result["occupations"], result["hobbies"]) == (5, 5, 5, 10)
+    assert result["chunks"] == 3
+    # One executemany per child table and chunk (SQLite falls back to a
+    # RETURNING statement per persona, Postgres batches those too)
+    child_inserts = [s for s in query_log if s.startswith("INSERT") and "personas" not in s]
+    assert len(child_inserts) == 3 * 3
+
+    imported = api_client.get("/api/v1/personas/").json()[-1]
+    assert imported["name"] == "Ana 4"
+    assert [h["name"] for h in imported["hobbies"]] == ["Chess", "Go"]
+
+
+def test_import_ndjson_reports_invalid_lines(api_client):
+    """Testa que erros de validação em NDJSON indicam a linha e nada é inserido."""
+    lines = [PERSONA, PERSONA | {"gender": "Unknown"}, PERSONA | {"birthdate": "2999-01-01"}]
+    body = "\n".join(json.dumps(line) for line in lines)
+
+    response = api_client.post(
+        "/api/v1/personas/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 400
+    assert sorted({error["line"] for error in response.json()["detail"]}) == [2, 3]
+    assert len(api_client.get("/api/v1/personas/").json()) == 3
+
+
+def test_import_rejects_invalid_utf8(api_client):
+    """Testa que um payload com bytes que não são UTF-8 dá 400 e não 500."""
+    body = json.dumps(PERSONA).encode() + b"\n\xff\xfe{}"
+
+    for content_type in ("application/x-ndjson", "application/json"):
+        response = api_client.post(
+            "/api/v1/personas/import", content=body, headers={"Content-Type": content_type}
+        )
+
+        assert response.status_code == 400
+    assert len(api_client.get("/api/v1/personas/").json()) == 3
+
+
+def test_import_rejects_bodies_over_the_limit(api_client, monkeypatch):
+    """Testa que um payload maior que PERSONA_IMPORT_MAX_BYTES dá 413, com ou sem Content-Length."""
+    monkeypatch.setattr(settings, "PERSONA_IMPORT_MAX_BYTES", 1024)
+    body = "\n".join(json.dumps(PERSONA | {"name": f"Ana {i}"}) for i in range(10)).encode()
+
+    sized = api_client.post(
+        "/api/v1/personas/import", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    chunked = api_client.post(
+        "/api/v1/personas/import",
+        content=iter([body[:600], body[600:]]),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert sized.status_code == 413
+    assert chunked.status_code == 413
+    assert "content-length" not in chunked.request.headers
+    assert len(api_client.get("/api/v1/personas/").json()) == 3
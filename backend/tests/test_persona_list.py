@@ -0,0 +1,68 @@
+PERSONAS_URL = "/api/v1/personas/"
+
+
+def test_pages_with_cursor_and_total(api_client):
+    """Testa a paginação por cursor e os cabeçalhos X-Total-Count e X-Next-Cursor."""
+    first = api_client.get(PERSONAS_URL, params={"limit": 2})
+    second = api_client.get(PERSONAS_URL, params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+
+    assert [p["id"] for p in first.json()] == [1, 2]
+    assert [p["id"] for p in second.json()] == [3]
+    assert first.headers["X-Total-Count"] == "3"
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_filters_by_nationality_and_gender(api_client):
+    """Testa os filtros por nacionalidade e género, também na contagem total."""
+    payload = {"name": "Ana", "birthdate": "1990-01-01", "gender": "Female", "nationality": "Spanish"}
+    api_client.post(PERSONAS_URL, json=payload)
+
+    spanish = api_client.get(PERSONAS_URL, params={"nationality": "Spanish"})
+    female = api_client.get(PERSONAS_URL, params={"gender": "Female"})
+
+    assert [p["name"] for p in spanish.json()] == ["Ana"]
+    assert spanish.headers["X-Total-Count"] == "1"
+    assert [p["name"] for p in female.json()] == ["Ana"]
+
+
+def test_sparse_fieldset(api_client):
+    """Testa que fields=name devolve apenas o id e o nome."""
+    response = api_client.get(PERSONAS_URL, params={"fields": "name"})
+
+    assert response.json()[0] == {"id": 1, "name": "Persona 0"}
+    assert response.headers["X-Total-Count"] == "3"
+
+
+def test_sparse_fieldset_with_collection(api_client):
+    """Testa que uma coleção pedida em fields é carregada e devolvida."""
+    response = api_client.get(PERSONAS_URL, params={"fields": "name,hobbies", "limit": 1})
+
+    persona = response.json()[0]
+    assert set(persona) == {"id", "name", "hobbies"}
+    assert len(persona["hobbies"]) == 2
+
+
+def test_unknown_field_is_rejected(api_client):
+    """Testa que um campo inexistente em fields devolve 400."""
+    response = api_client.get(PERSONAS_URL, params={"fields": "name,password"})
+
+    assert response.status_code == 400
+
+
+def test_page_size_is_bounded(api_client):
+    """Testa que o tamanho da página tem um máximo."""
+    response = api_client.get(PERSONAS_URL, params={"limit": 10_000})
+
+    assert response.status_code == 422
+
+
+def test_sparse_page_revalidates(api_client):
+    """Testa o ETag de uma página com fields e a sua revalidação com 304."""
+    params = {"fields": "id,name", "limit": 2}
+    etag = api_client.get(PERSONAS_URL, params=params).headers["ETag"]
+    full_etag = api_client.get(PERSONAS_URL, params={"limit": 2}).headers["ETag"]
+
+    response = api_client.get(PERSONAS_URL, params=params, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert etag != full_etag
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from conftest import capture_queries, seed_database
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from digital_twin.services.multi_agent_supervisor_pattern import build_persona_roster
+from digital_twin.services.persona import PersonaService
+
+
+async def load_roster(engine):
+    async with async_sessionmaker(bind=engine)() as db:
+        with capture_queries(engine.sync_engine) as statements:
+            personas = await PersonaService.get_personas(db)
+            roster, persona_map = build_persona_roster(personas)
+    return statements, roster, persona_map
+
+
+async def load_persona(engine, id: int):
+    async with async_sessionmaker(bind=engine)() as db:
+        with capture_queries(engine.sync_engine) as statements:
+            persona = await PersonaService.get_persona(db, id)
+    return statements, persona
+
+
+@pytest.mark.parametrize("personas", [1, 5, 25])
+def test_roster_query_count_is_constant(database_url, db_engine, personas):
+    seed_database(database_url, personas=personas)
+
+    statements, roster, persona_map = asyncio.run(load_roster(db_engine))
+
+    # personas + one batched query per child collection
+    assert len(statements) == 4
+    assert len(roster) == personas
+    assert roster[0]["occupations"] == ["Dev", "Dev"]
+    assert persona_map["Persona 0"] == roster[0]["id"]
+
+
+def test_get_persona_avoids_cartesian_join(db_engine):
+    statements, persona = asyncio.run(load_persona(db_engine, 1))
+
+    assert len(statements) == 4
+    assert all(" JOIN " not in statement for statement in statements)
+    assert len(persona.educations) == len(persona.occupations) == len(persona.hobbies) == 2
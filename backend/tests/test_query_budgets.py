@@ -0,0 +1,104 @@
+"""
+Query and latency budgets for the hot endpoints, measured against the
+seeded database from conftest. A failing budget usually means an N+1 or a
+query that lost its index; raise a budget only together with the change
+that justifies it.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from conftest import SEED_USER_EMAIL
+from sqlalchemy import update
+
+from digital_twin.config import settings
+from digital_twin.models import User
+from digital_twin.utils.security import invalidate_user
+
+LATENCY_RUNS = 5
+
+# (path, max statements, max milliseconds)
+ENDPOINT_BUDGETS = [
+    # Separate count query for X-Total-Count, then the page and its collections
+    ("/api/v1/personas/", 5, 150),
+    ("/api/v1/personas/?fields=id,name", 2, 100),
+    ("/api/v1/personas/?nationality=Portuguese&limit=2", 5, 150),
+    ("/api/v1/personas/1", 4, 150),
+    ("/api/v1/personas/1/bundle", 4, 150),
+    ("/api/v1/educations/?persona=1", 1, 100),
+    ("/api/v1/hobbies/?persona=1", 1, 100),
+    ("/api/v1/occupations/?persona=1", 1, 100),
+    ("/api/v1/educations/1", 1, 100),
+    ("/api/v1/users/profile", 3, 150),
+    ("/api/v1/users/1/chats/1", 2, 100),
+]
+
+
+def timed_get(api_client, path: str, headers: dict[str, str]) -> float:
+    start = time.perf_counter()
+    api_client.get(path, headers=headers)
+    return (time.perf_counter() - start) * 1000
+
+
+@pytest.mark.parametrize(("path", "max_queries", "max_ms"), ENDPOINT_BUDGETS)
+def test_endpoint_budget(api_client, auth_headers, query_log, path, max_queries, max_ms):
+    # Warm-up request so imports and first connections are not measured
+    assert api_client.get(path, headers=auth_headers).status_code == 200
+    query_log.clear()
+
+    response = api_client.get(path, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(query_log) <= max_queries, "\n".join(query_log)
+
+    # Best of a few runs, so a busy CI machine does not fail the budget
+    elapsed_ms = min(timed_get(api_client, path, auth_headers) for _ in range(LATENCY_RUNS))
+    assert elapsed_ms <= max_ms, f"{path} took {elapsed_ms:.1f}ms"
+
+
+@pytest.mark.parametrize("resource", ["educations", "hobbies", "occupations"])
+def test_child_list_tells_missing_persona_from_empty(api_client, query_log, resource):
+    for child in api_client.get(f"/api/v1/{resource}/?persona=1").json():
+        api_client.delete(f"/api/v1/{resource}/{child['id']}")
+    query_log.clear()
+
+    empty = api_client.get(f"/api/v1/{resource}/?persona=1")
+    missing = api_client.get(f"/api/v1/{resource}/?persona=999")
+
+    assert empty.status_code == 200
+    assert empty.json() == []
+    assert missing.status_code == 404
+    assert len(query_log) == 2
+
+
+def test_principal_cache_is_invalidated(api_client, auth_headers, query_log):
+    api_client.get("/api/v1/users/1/chats/1", headers=auth_headers)
+    invalidate_user(SEED_USER_EMAIL)
+    query_log.clear()
+
+    api_client.get("/api/v1/users/1/chats/1", headers=auth_headers)
+
+    assert any("FROM users" in statement for statement in query_log)
+
+
+def test_changed_user_is_stale_for_at_most_the_cache_ttl(
+    api_client, auth_headers, db_engine, monkeypatch
+):
+    """Testa que um utilizador alterado na base de dados deixa de autenticar após o TTL."""
+    clock = [1000.0]
+    monkeypatch.setattr("digital_twin.utils.cache.time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    async def change_email():
+        async with db_engine.begin() as connection:
+            await connection.execute(update(User).where(User.id == 1).values(email="moved@test.io"))
+
+    assert api_client.get("/api/v1/users/1/chats/1", headers=auth_headers).status_code == 200
+    asyncio.run(change_email())
+
+    cached = api_client.get("/api/v1/users/1/chats/1", headers=auth_headers)
+    clock[0] += settings.AUTH_CACHE_TTL_SECONDS + 1
+    expired = api_client.get("/api/v1/users/1/chats/1", headers=auth_headers)
+
+    assert cached.status_code == 200
+    assert expired.status_code == 401
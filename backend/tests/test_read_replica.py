@@ -0,0 +1,93 @@
+import pytest
+from conftest import seed_database
+from fastapi.middleware import Middleware
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from digital_twin import app
+from digital_twin.database import (
+    READ_PRIMARY_COOKIE,
+    ReadYourWritesMiddleware,
+    async_database_url,
+)
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """Réplica com uma só persona, para distinguir as leituras da primária (3 personas)."""
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    seed_database(url, personas=1)
+    engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+    monkeypatch.setattr(
+        "digital_twin.database.ReplicaSessionLocal",
+        async_sessionmaker(bind=engine, expire_on_commit=False),
+    )
+    # The app is built without a replica, install its middleware as it would
+    # be with one: inside CORSMiddleware, the outermost
+    monkeypatch.setattr(
+        app, "user_middleware", [app.user_middleware[0], Middleware(ReadYourWritesMiddleware), *app.user_middleware[1:]]
+    )
+    monkeypatch.setattr(app, "middleware_stack", None)
+
+
+def test_reads_go_to_replica(api_client, replica):
+    """Testa que os GET são servidos pela réplica."""
+    response = api_client.get("/api/v1/personas/")
+
+    assert len(response.json()) == 1
+
+
+def test_read_primary_header_forces_primary(api_client, replica):
+    """Testa o cabeçalho que força a leitura na primária."""
+    response = api_client.get("/api/v1/personas/", headers={"X-Read-Primary": "1"})
+
+    assert len(response.json()) == 3
+
+
+PERSONA = {"name": "Nova", "birthdate": "1990-01-01", "gender": "Female", "nationality": "Portuguese"}
+
+
+def test_reads_stick_to_primary_after_write(api_client, replica):
+    """Testa read-your-writes: após uma escrita, as leituras vão à primária."""
+    # O cookie é Secure, só é enviado por https
+    api_client.base_url = "https://testserver"
+    created = api_client.post("/api/v1/personas/", json=PERSONA)
+    response = api_client.get("/api/v1/personas/")
+
+    assert READ_PRIMARY_COOKIE in created.cookies
+    assert [p["name"] for p in response.json()][-1] == "Nova"
+    assert len(response.json()) == 4
+
+
+def test_failed_write_does_not_stick(api_client, replica):
+    """Testa que uma escrita falhada não fixa as leituras na primária."""
+    response = api_client.delete("/api/v1/personas/999")
+
+    assert response.status_code == 404
+    assert READ_PRIMARY_COOKIE not in response.cookies
+
+
+def test_reads_stick_to_primary_after_cross_site_write(api_client, replica):
+    """Testa read-your-writes com pedidos do frontend, que está noutro site."""
+    api_client.base_url = "https://testserver"
+    origin = {"Origin": "https://digital-twin-frontend.onrender.com"}
+
+    created = api_client.post("/api/v1/personas/", json=PERSONA, headers=origin)
+    response = api_client.get("/api/v1/personas/", headers=origin)
+
+    cookie = created.headers["set-cookie"].lower()
+    assert "samesite=none" in cookie
+    assert "secure" in cookie
+    assert created.headers["access-control-allow-credentials"] == "true"
+    assert len(response.json()) == 4
+
+
+def test_writes_set_no_cookie_without_replica(api_client):
+    """Testa que sem réplica o middleware não é instalado e as escritas não levam cookie."""
+    api_client.base_url = "https://testserver"
+
+    created = api_client.post("/api/v1/personas/", json=PERSONA)
+
+    assert created.status_code == 200
+    assert "set-cookie" not in created.headers
+    assert ReadYourWritesMiddleware not in [m.cls for m in app.user_middleware]
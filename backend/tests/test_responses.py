@@ -0,0 +1,33 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from digital_twin.schemas.chat_message import ChatMessage
+from digital_twin.utils.responses import PydanticJSONResponse
+
+
+def test_pydantic_response_matches_default_encoding():
+    """Testa que a resposta rápida gera o mesmo JSON que o caminho por omissão do FastAPI."""
+    rows = [
+        SimpleNamespace(id=i, role="User", content=f"message {i}", created_at=datetime(2025, 1, 1, 18, 30))
+        for i in range(3)
+    ]
+
+    response = PydanticJSONResponse(rows, list[ChatMessage], headers={"X-Next-Cursor": "0"})
+
+    assert json.loads(response.body) == [
+        ChatMessage.model_validate(r).model_dump(mode="json") for r in rows
+    ]
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["X-Next-Cursor"] == "0"
+
+
+def test_large_responses_are_gzipped(api_client):
+    """Testa que só as respostas acima do limite são comprimidas."""
+    large = api_client.get("/api/v1/personas/", headers={"Accept-Encoding": "gzip"})
+    small = api_client.get("/api/v1/personas/?fields=id", headers={"Accept-Encoding": "gzip"})
+
+    assert large.headers["content-encoding"] == "gzip"
+    assert len(large.json()) == 3
+    assert "content-encoding" not in small.headers
+    assert large.headers["ETag"] and large.headers["X-Total-Count"] == "3"
@@ -0,0 +1,46 @@
+import os
+from unittest.mock import patch
+
+from digital_twin import server
+from digital_twin.config import settings
+
+
+def test_serve_migrates_once_before_the_workers(monkeypatch):
+    """Testa que o servidor migra no processo supervisor e desliga a migração nos workers."""
+    monkeypatch.setattr("sys.argv", ["digital-twin", "--workers", "4", "--limit-concurrency", "200"])
+    monkeypatch.setenv("APP_AUTO_MIGRATE", "true")
+
+    with patch.object(server, "migrate_on_startup") as migrate, patch("uvicorn.run") as run:
+        server.serve()
+
+    migrate.assert_called_once()
+    assert os.environ["APP_AUTO_MIGRATE"] == "false"
+    options = run.call_args.kwargs
+    assert (options["workers"], options["limit_concurrency"]) == (4, 200)
+    assert "reload" not in options
+
+
+def test_defaults_use_few_workers_without_concurrency_limit(monkeypatch):
+    """Testa os valores por omissão: poucos workers explícitos e sem limite de concorrência."""
+    monkeypatch.setattr("sys.argv", ["digital-twin"])
+    monkeypatch.setenv("APP_AUTO_MIGRATE", "true")
+
+    with patch.object(server, "migrate_on_startup"), patch("uvicorn.run") as run:
+        server.serve()
+
+    options = run.call_args.kwargs
+    assert options["workers"] == 2
+    assert options["limit_concurrency"] is None
+    assert options["timeout_graceful_shutdown"] == 60
+
+
+def test_zero_workers_follow_available_cpus_up_to_the_cap(monkeypatch):
+    """Testa que 0 workers usa os CPUs disponíveis ao processo, limitado por SERVER_MAX_WORKERS."""
+    monkeypatch.setattr("sys.argv", ["digital-twin", "--workers", "0"])
+    monkeypatch.setenv("APP_AUTO_MIGRATE", "true")
+    monkeypatch.setattr(server, "available_cpus", lambda: 32)
+
+    with patch.object(server, "migrate_on_startup"), patch("uvicorn.run") as run:
+        server.serve()
+
+    assert run.call_args.kwargs["workers"] == settings.SERVER_MAX_WORKERS
@@ -2,6 +2,8 @@ import axios from "axios";
 
 const api = axios.create({
   baseURL: import.meta.env.VITE_API_URL,
+  // The API is on another site, its read-your-writes cookie needs credentials
+  withCredentials: true,
   headers: {
     "Content-Type": "application/json",
   },
@@ -15,6 +15,8 @@ type Message = {
   role: "user" | "assistant";
   content: string;
   timestamp: Date;
+  // Shown before the server stored it, replaced once the history is refreshed
+  pending?: boolean;
 };
 
 type Persona = {
@@ -22,6 +24,20 @@ type Persona = {
   name: string;
 };
 
+// Explicit so a short page tells there is nothing more to fetch
+const HISTORY_PAGE_SIZE = 50;
+
+// History pages come newest-first, the chat renders oldest-first
+const toMessages = (page: any[]): Message[] =>
+  page
+    .map((msg: any): Message => ({
+      id: msg.id.toString(),
+      role: msg.role.toLowerCase() === "user" ? "user" : "assistant",
+      content: msg.content,
+      timestamp: new Date(msg.created_at),
+    }))
+    .reverse();
+
 const Chat = () => {
   const [messages, setMessages] = useState<Message[]>([]);
   const [input, setInput] = useState("");
@@ -29,12 +45,25 @@ const Chat = () => {
   const [selectedPersona, setSelectedPersona] = useState<string>("");
   const [userId, setUserId] = useState<string | null>(null);
   const [loadingHistory, setLoadingHistory] = useState(false);
+  const [loadingOlder, setLoadingOlder] = useState(false);
+  // X-Next-Cursor of the oldest page loaded, null once the start is reached
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isBotTyping, setIsBotTyping] = useState(false);
   const navigate = useNavigate();
 
   const bottomRef = useRef<HTMLDivElement | null>(null);
+  // Newest stored message loaded, new ones are fetched with after=<id>
+  const lastIdRef = useRef<number | null>(null);
+  // Prepending older messages must not scroll to the bottom
+  const keepScrollRef = useRef(false);
+
+  const historyUrl = `/api/v1/users/${userId}/chats/${selectedPersona}`;
 
   useEffect(() => {
+    if (keepScrollRef.current) {
+      keepScrollRef.current = false;
+      return;
+    }
     bottomRef.current?.scrollIntoView({ behavior: "smooth" });
   }, [messages]);
 
@@ -85,6 +114,9 @@ const Chat = () => {
   useEffect(() => {
     const token = localStorage.getItem("token");
 
+    lastIdRef.current = null;
+    setNextCursor(null);
+
     if (!selectedPersona || !userId || !token) {
       setMessages([]);
       return;
@@ -98,20 +130,15 @@ const Chat = () => {
     setLoadingHistory(true);
 
     api
-      .get(
-        `/api/v1/users/${userId}/chats/${selectedPersona}`,
-        {
-          headers: { Authorization: `Bearer ${token}` },
-        }
-      )
+      .get(historyUrl, {
+        headers: { Authorization: `Bearer ${token}` },
+        params: { limit: HISTORY_PAGE_SIZE },
+      })
       .then((response) => {
-        const loadedMessages: Message[] = response.data.map((msg: any) => ({
-          id: msg.id.toString(),
-          role: msg.role.toLowerCase() === "user" ? "user" : "assistant",
-          content: msg.content,
-          timestamp: new Date(msg.created_at),
-        }));
-        setMessages(loadedMessages);
+        const page = response.data ?? [];
+        lastIdRef.current = page.length ? page[0].id : null;
+        setNextCursor(response.headers["x-next-cursor"] ?? null);
+        setMessages(toMessages(page));
       })
       .catch((error) => {
         console.error("Failed to load chat history:", error);
@@ -122,6 +149,70 @@ const Chat = () => {
       });
   }, [selectedPersona, userId]);
 
+  // Pages back from the oldest message loaded
+  const loadOlderMessages = async () => {
+    const token = localStorage.getItem("token");
+    if (!nextCursor || !token) return;
+
+    setLoadingOlder(true);
+    try {
+      const response = await api.get(historyUrl, {
+        headers: { Authorization: `Bearer ${token}` },
+        params: { before: nextCursor, limit: HISTORY_PAGE_SIZE },
+      });
+      keepScrollRef.current = true;
+      setMessages((prev) => [...toMessages(response.data ?? []), ...prev]);
+      setNextCursor(response.headers["x-next-cursor"] ?? null);
+    } catch (error) {
+      console.error("Failed to load older messages:", error);
+    } finally {
+      setLoadingOlder(false);
+    }
+  };
+
+  // Messages stored since the newest one loaded, oldest first
+  const fetchNewMessages = async (): Promise<Message[]> => {
+    const token = localStorage.getItem("token");
+    const newMessages: Message[] = [];
+
+    for (;;) {
+      const response = await api.get(historyUrl, {
+        headers: { Authorization: `Bearer ${token}` },
+        params: { after: lastIdRef.current ?? 0, limit: HISTORY_PAGE_SIZE },
+      });
+      const page = response.data ?? [];
+      if (page.length === 0) break;
+      lastIdRef.current = page[0].id;
+      newMessages.push(...toMessages(page));
+      if (page.length < HISTORY_PAGE_SIZE) break;
+    }
+    return newMessages;
+  };
+
+  const appendNewMessages = (newMessages: Message[]) => {
+    setMessages((prev) => {
+      const stored = prev.filter((m) => !m.pending);
+      const known = new Set(stored.map((m) => m.id));
+      return [...stored, ...newMessages.filter((m) => !known.has(m.id))];
+    });
+  };
+
+  // Catch up with messages sent from elsewhere when the tab regains focus
+  useEffect(() => {
+    if (!selectedPersona || !userId || selectedPersona === "supervisor") return;
+
+    const refresh = () => {
+      fetchNewMessages()
+        .then((newMessages) => {
+          if (newMessages.length) appendNewMessages(newMessages);
+        })
+        .catch((error) => console.error("Failed to refresh chat:", error));
+    };
+
+    window.addEventListener("focus", refresh);
+    return () => window.removeEventListener("focus", refresh);
+  }, [selectedPersona, userId]);
+
 const handleSend = async () => {
   if (!input.trim() || !userId || !selectedPersona) return;
 
@@ -130,6 +221,7 @@ const handleSend = async () => {
     role: "user",
     content: input,
     timestamp: new Date(),
+    pending: selectedPersona !== "supervisor",
   };
 
   setMessages((prev) => [...prev, userMessage]);
@@ -158,6 +250,16 @@ const handleSend = async () => {
       }
     );
 
+    if (selectedPersona !== "supervisor") {
+      // The stored question and answer, with their ids
+      try {
+        appendNewMessages(await fetchNewMessages());
+        return;
+      } catch (error) {
+        console.error("Failed to refresh chat:", error);
+      }
+    }
+
     const data = response.data;
 
     const assistantMessage: Message = {
@@ -265,6 +367,19 @@ const handleSend = async () => {
                 </div>
               ) : (
                 <>
+                  {nextCursor && (
+                    <div className="flex justify-center">
+                      <Button
+                        variant="ghost"
+                        size="sm"
+                        onClick={loadOlderMessages}
+                        disabled={loadingOlder}
+                      >
+                        {loadingOlder ? "Loading..." : "Load older messages"}
+                      </Button>
+                    </div>
+                  )}
+
                   {messages.map((message) => (
                     <div
                       key={message.id}